@@ -0,0 +1,263 @@
+# arenas.py
+# Runs several arenas from one host: one process per arena (its own UDP port
+# pair, scoring, Tk display and GIL, so a burst in one arena can't stall another
+# arena's scoreboard), all sharing one database pool + codename cache and one
+# decoded asset cache served by a multiprocessing manager. A supervisor restarts
+# any arena process that crashes.
+#
+#   python3 arenas.py arenas.json
+#   python3 arenas.py --count 3 --base-port 7500 --displays :0.0,:0.1,:0.2
+#
+# arenas.json is a list of arenas; "name", "display" and "cpu" are launcher
+# settings, every other key overrides that arena's AppConfig field:
+#   [{"name": "north", "display": ":0.0", "udp_send_port": 7500, "udp_receive_port": 7501},
+#    {"name": "south", "display": ":0.1", "udp_send_port": 7510, "udp_receive_port": 7511,
+#     "udp_target_ip": "10.0.2.255", "cpu": 2,
+#     "teams": [{"name": "Red", "color": "#e83030", "base_code": 53, "max_players": 40},
+#               {"name": "Blue", "color": "#3080ff", "base_code": 63, "max_players": 40}]}]
+
+import argparse
+import dataclasses
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from multiprocessing.managers import BaseManager
+
+from config import AppConfig
+
+LAUNCHER_KEYS = {"name", "display", "cpu"}
+
+# Methods an arena may call on the shared db (close() stays with the launcher)
+DB_METHODS = (
+    "get_codename", "get_codenames", "get_all_players", "get_player_profile",
+    "get_leaderboard", "add_player", "queue_player", "flush_pending",
+    "save_game_results", "invalidate", "preload", "stats",
+)
+ASSET_METHODS = ("image", "load")
+
+RESTART_BACKOFF_MAX = 30.0
+# An arena that stayed up this long gets its restart backoff reset
+STABLE_SECONDS = 60.0
+
+
+# --- shared services (these run inside the manager process) ----------------
+
+_shared = {}
+
+
+def _init_shared(cfg):
+    # Manager process: one pooled db + cache and one asset store for everyone
+    import ui_app
+    from assets import AssetStore
+    _shared["db"] = ui_app.connect_db(cfg)
+    _shared["assets"] = AssetStore(ui_app.ASSETS_DIR)
+    _shared["assets"].load(ui_app.LOGO_NAME, ui_app.BASE_ICON)
+
+
+def _shared_db():
+    return _shared["db"]
+
+
+def _shared_assets():
+    return _shared["assets"]
+
+
+def _close_shared():
+    # Flushes queued players and closes the pool before the manager exits
+    db = _shared.pop("db", None)
+    if db is not None:
+        db.close()
+
+
+class SharedServices(BaseManager):
+    pass
+
+
+# Module-level callables: the registry is pickled into the spawned manager
+SharedServices.register("db", callable=_shared_db, exposed=DB_METHODS)
+SharedServices.register("assets", callable=_shared_assets, exposed=ASSET_METHODS)
+SharedServices.register("close_shared", callable=_close_shared)
+
+
+# --- arena processes ----------------------------------------------------------
+
+@dataclasses.dataclass
+class Arena:
+    name: str
+    cfg: AppConfig
+    display: str = None
+    cpu: int = None
+    process: mp.Process = None
+    started_at: float = 0.0
+    restarts: int = 0
+    restart_at: float = 0.0
+    finished: bool = False
+
+
+def run_arena(name, cfg, display, cpu, address, authkey):
+    # Arena process entry point
+    if display:
+        os.environ["DISPLAY"] = display
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+    services = SharedServices(address=address, authkey=authkey)
+    services.connect()
+
+    import ui_app
+    from assets import AssetStore
+    shared_assets = services.assets()
+    assets = AssetStore(ui_app.ASSETS_DIR, loader=lambda name: shared_assets.image(name))
+    ui_app.main(cfg, db=services.db(), assets=assets, title=f"Photon - {name}")
+
+
+def arena_from_spec(spec: dict, base: AppConfig, index: int) -> Arena:
+    fields = {f.name for f in dataclasses.fields(AppConfig)}
+    unknown = set(spec) - fields - LAUNCHER_KEYS
+    if unknown:
+        raise SystemExit(f"arena {index + 1}: unknown settings {sorted(unknown)}")
+
+    name = spec.get("name") or f"arena{index + 1}"
+    overrides = {k: v for k, v in spec.items() if k in fields}
+    # Each arena keeps its own journals, metrics and profiles
+    for key in ("journal_dir", "metrics_dir", "profile_dir"):
+        overrides.setdefault(key, os.path.join(getattr(base, key), name))
+    cfg = dataclasses.replace(base, **overrides)
+    return Arena(name, cfg, spec.get("display"), spec.get("cpu"))
+
+
+def load_arenas(args, base: AppConfig) -> list:
+    if args.config:
+        with open(args.config) as f:
+            specs = json.load(f)
+    else:
+        displays = args.displays.split(",") if args.displays else []
+        specs = []
+        for i in range(args.count):
+            spec = {"udp_send_port": args.base_port + i * args.port_step,
+                    "udp_receive_port": args.base_port + i * args.port_step + 1}
+            if displays:
+                spec["display"] = displays[i % len(displays)]
+            specs.append(spec)
+
+    arenas = [arena_from_spec(spec, base, i) for i, spec in enumerate(specs)]
+
+    seen = {}
+    for arena in arenas:
+        port = arena.cfg.udp_receive_port
+        if port in seen:
+            raise SystemExit(f"{arena.name} and {seen[port]} both receive on port {port}")
+        seen[port] = arena.name
+    if len({a.name for a in arenas}) != len(arenas):
+        raise SystemExit("arena names must be unique")
+    return arenas
+
+
+class Supervisor:
+    # Starts every arena and restarts crashed ones with exponential backoff
+    # A clean exit (window closed) ends that arena unless restart_always is set
+
+    def __init__(self, arenas, address, authkey, restart_always=False, poll_s=1.0):
+        self.arenas = arenas
+        self.address = address
+        self.authkey = authkey
+        self.restart_always = restart_always
+        self.poll_s = poll_s
+        self.ctx = mp.get_context("spawn")   # fresh interpreter: no Tk state inherited
+
+    def start(self, arena: Arena) -> None:
+        arena.process = self.ctx.Process(
+            target=run_arena, name=f"arena-{arena.name}",
+            args=(arena.name, arena.cfg, arena.display, arena.cpu, self.address, self.authkey))
+        arena.process.start()
+        arena.started_at = time.monotonic()
+        print(f"[INFO] {arena.name}: started pid {arena.process.pid} "
+              f"(udp {arena.cfg.udp_receive_port}/{arena.cfg.udp_send_port}, display {arena.display or 'default'})")
+
+    def check(self, arena: Arena) -> None:
+        if arena.finished:
+            return
+        now = time.monotonic()
+        if arena.process is None:
+            if now >= arena.restart_at:
+                self.start(arena)
+            return
+        if arena.process.is_alive():
+            return
+
+        code = arena.process.exitcode
+        arena.process = None
+        if code == 0 and not self.restart_always:
+            print(f"[INFO] {arena.name}: closed.")
+            arena.finished = True
+            return
+
+        if now - arena.started_at >= STABLE_SECONDS:
+            arena.restarts = 0
+        delay = min(RESTART_BACKOFF_MAX, 2 ** arena.restarts)
+        arena.restarts += 1
+        arena.restart_at = now + delay
+        print(f"[WARNING] {arena.name}: exited with code {code}, restarting in {delay:.0f}s.")
+
+    def run(self) -> None:
+        for arena in self.arenas:
+            self.start(arena)
+        try:
+            while not all(a.finished for a in self.arenas):
+                time.sleep(self.poll_s)
+                for arena in self.arenas:
+                    self.check(arena)
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        for arena in self.arenas:
+            if arena.process is not None and arena.process.is_alive():
+                arena.process.terminate()
+        for arena in self.arenas:
+            if arena.process is not None:
+                arena.process.join(5)
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Run several Photon arenas from one host")
+    p.add_argument("config", nargs="?", help="arenas JSON file")
+    p.add_argument("--count", type=int, default=2, help="arenas to run when no config file is given")
+    p.add_argument("--base-port", type=int, default=7500, help="first arena's send port (receive = +1)")
+    p.add_argument("--port-step", type=int, default=10, help="port gap between arenas")
+    p.add_argument("--displays", help="comma-separated X displays, assigned round-robin")
+    p.add_argument("--restart-always", action="store_true", help="restart arenas even after a clean exit")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base = AppConfig()
+    arenas = load_arenas(args, base)
+
+    # One pool for every arena: one connection per DB worker thread in each
+    # arena (db_pool_max - 1 of them), plus one spare
+    workers = max(1, base.db_pool_max - 1)
+    shared_cfg = dataclasses.replace(base, db_pool_max=workers * len(arenas) + 1)
+    authkey = os.urandom(16)
+    manager = SharedServices(address=("127.0.0.1", 0), authkey=authkey, ctx=mp.get_context("spawn"))
+    manager.start(_init_shared, (shared_cfg,))
+    print(f"[INFO] Shared services on {manager.address} for {len(arenas)} arenas.")
+
+    try:
+        Supervisor(arenas, manager.address, authkey, args.restart_always).run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            manager.close_shared()
+        except Exception:
+            pass
+        manager.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# assets.py
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+MUSIC_EXTENSIONS = (".mp3",)
+
+
+def decode_image(path: str, size: Optional[Tuple[int, int]] = None):
+    # Decoded RGBA PIL image, shrunk to fit `size` if given; works off the Tk thread
+    from PIL import Image   # PIL is only imported once something needs an image
+    img = Image.open(path)
+    img.load()
+    img = img.convert("RGBA")
+    if size is not None:
+        img.thumbnail(size)
+    return img
+
+
+class AssetStore:
+    # Images and the music catalog, read from disk once and kept in memory
+    # load() decodes images on a startup thread; resized copies are cached by
+    # size, and PhotoImages (which must be made on the Tk thread) are created on
+    # first use and reused by every later screen. The music catalog is only
+    # re-listed when the folder's mtime changes.
+
+    def __init__(self, assets_dir: str = ASSETS_DIR, loader=None):
+        self.assets_dir = assets_dir
+        # loader(name) -> PIL image; defaults to decoding the file here
+        # (arenas.py passes one that fetches from the shared cache instead)
+        self.loader = loader
+        self.music_dir = os.path.join(assets_dir, "music")
+        self._images: Dict[str, object] = {}    # name -> full size PIL image (None if unreadable)
+        self._sized: Dict[tuple, object] = {}   # (name, size) -> resized PIL image
+        self._photos: Dict[tuple, object] = {}  # (name, size) -> ImageTk.PhotoImage
+        self._lock = threading.Lock()
+
+        self.tracks: List[str] = []             # sorted track paths
+        self.track_index: Dict[str, str] = {}   # file name -> path
+        self.music_version = 0                  # bumped whenever the catalog changes
+        self._music_mtime = None
+
+    def load(self, *names: str) -> int:
+        # Decode the named images (file names in assets_dir) and list the music
+        # folder; returns how many images decoded
+        for name in names:
+            self._decode(name)
+        self.refresh_music()
+        return sum(1 for name in names if self._images.get(name) is not None)
+
+    def _decode(self, name: str):
+        with self._lock:
+            if name in self._images:
+                return self._images[name]
+        try:
+            if self.loader is not None:
+                img = self.loader(name)
+            else:
+                img = decode_image(os.path.join(self.assets_dir, name))
+        except Exception:
+            img = None
+        with self._lock:
+            self._images[name] = img
+        return img
+
+    def image(self, name: str, size: Optional[Tuple[int, int]] = None):
+        # PIL image, or None if the file is missing/unreadable
+        # Decoded on demand if load() didn't include it
+        img = self._decode(name)
+        if img is None or size is None:
+            return img
+        key = (name, tuple(size))
+        with self._lock:
+            sized = self._sized.get(key)
+            if sized is None:
+                sized = img.copy()
+                sized.thumbnail(size)
+                self._sized[key] = sized
+            return sized
+
+    def photo(self, name: str, size: Optional[Tuple[int, int]] = None):
+        # Tk thread only: cached ImageTk.PhotoImage (handles JPEG, unlike tk.PhotoImage)
+        key = (name, tuple(size) if size else None)
+        photo = self._photos.get(key)
+        if photo is None:
+            img = self.image(name, size)
+            if img is None:
+                return None
+            from PIL import ImageTk
+            photo = self._photos[key] = ImageTk.PhotoImage(img)
+        return photo
+
+    def refresh_music(self) -> bool:
+        # Re-lists the music folder only if it changed; True if the catalog changed
+        try:
+            mtime = os.stat(self.music_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._music_mtime and self.music_version:
+            return False
+
+        tracks = []
+        if mtime is not None:
+            for entry in os.scandir(self.music_dir):
+                if entry.is_file() and entry.name.lower().endswith(MUSIC_EXTENSIONS):
+                    tracks.append(entry.path)
+        tracks.sort()
+
+        self._music_mtime = mtime
+        changed = tracks != self.tracks or not self.music_version
+        if changed:
+            self.tracks = tracks
+            self.track_index = {os.path.basename(p): p for p in tracks}
+            self.music_version += 1
+        return changed
+
+    @property
+    def has_music_dir(self) -> bool:
+        return self._music_mtime is not None
@@ -0,0 +1,151 @@
+# async_udp_comm.py
+import asyncio
+import socket
+from collections import deque
+from config import AppConfig
+from metrics import DISABLED
+
+
+class _ReceiveProtocol(asyncio.DatagramProtocol):
+    # Runs on the Tk thread while the loop is being stepped, so it can
+    # append straight to the inbox with no locks or thread hand-off
+
+    def __init__(self, inbox: deque):
+        self.inbox = inbox
+        self.errors = 0
+
+    def datagram_received(self, data, addr):
+        self.inbox.append((data, addr))
+
+    def error_received(self, exc):
+        self.errors += 1
+
+
+async def _drain_cancelled(tasks):
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+
+
+class AsyncUDPComm:
+    # asyncio version of UDPComm with the same interface
+    # The event loop never gets its own thread: attach() steps it from Tk's
+    # after() timer, so network I/O, timers and Tk callbacks share one thread
+
+    def __init__(self, cfg: AppConfig, metrics=DISABLED):
+        self.cfg = cfg
+        self.metrics = metrics
+        self.loop = asyncio.new_event_loop()
+        self.inbox = deque()
+
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+        rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        rx.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        rx.bind(("0.0.0.0", cfg.udp_receive_port))
+
+        self.tx, _ = self.loop.run_until_complete(
+            self.loop.create_datagram_endpoint(asyncio.DatagramProtocol, sock=tx))
+        self.rx = None
+        self._rx_sock = rx
+
+        self._root = None
+        self._after_id = None
+        self._closed = False
+
+        self.sent = 0
+        self.failed = 0
+
+    @property
+    def target_ip(self) -> str:
+        # Returns target IP
+        return self.cfg.udp_target_ip
+
+    def set_target_ip(self, ip: str) -> None:
+        # Change network address used for UDP sends
+        self.cfg.udp_target_ip = ip
+
+    def send_equipment_id(self, equipment_id: int) -> None:
+        # Transport buffers the datagram if the socket would block, so this never waits
+        payload = str(equipment_id).encode("utf-8")
+        addr = (self.cfg.udp_target_ip, self.cfg.udp_send_port)
+        for _ in range(self.cfg.udp_code_repeats.get(equipment_id, 1)):
+            try:
+                self.tx.sendto(payload, addr)
+                self.sent += 1
+            except OSError:
+                self.failed += 1
+
+    def send_stats(self) -> dict:
+        return {
+            "queued": self.sent + self.failed,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": 0,
+            "backlog": self.tx.get_write_buffer_size(),
+        }
+
+    def start_receiver(self) -> None:
+        if self.rx is not None:
+            return
+        self.rx, self.protocol = self.loop.run_until_complete(
+            self.loop.create_datagram_endpoint(lambda: _ReceiveProtocol(self.inbox), sock=self._rx_sock))
+
+    def attach(self, root) -> None:
+        # Start driving the event loop from the Tk main loop
+        self._root = root
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._closed:
+            self._after_id = self._root.after(self.cfg.udp_async_step_ms, self._step)
+
+    def _step(self) -> None:
+        self._after_id = None
+        self.poll()
+        self._schedule()
+
+    def poll(self) -> None:
+        # Run ready callbacks and non-blocking socket reads; keep going while
+        # datagrams are still arriving so a burst is drained in one Tk callback
+        for _ in range(self.cfg.udp_max_batch):
+            before = len(self.inbox)
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+            if len(self.inbox) == before:
+                break
+
+    def drain_messages(self, limit: int = 0) -> list:
+        # Returns queued (data, addr) pairs, at most `limit` when limit > 0
+        inbox = self.inbox
+        count = len(inbox) if not limit else min(limit, len(inbox))
+        messages = [inbox.popleft() for _ in range(count)]
+        if self.metrics.enabled:
+            self.metrics.gauge("udp_inbox", len(inbox))
+        return messages
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._after_id is not None and self._root is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+
+        # Cancel anything still scheduled on the loop, let it unwind, then close
+        tasks = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if self.rx is not None:
+            self.rx.close()
+        else:
+            self._rx_sock.close()
+        self.tx.close()
+        try:
+            # Also gives the transports one loop pass to finish closing their sockets
+            self.loop.run_until_complete(_drain_cancelled(tasks))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
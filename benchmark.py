@@ -0,0 +1,412 @@
+# benchmark.py
+# Micro-benchmarks for the hot paths, saved as JSON so runs can be compared
+#
+#   python3 benchmark.py                          # everything that can run here
+#   xvfb-run python3 benchmark.py                 # include the Tk cases on a headless box
+#   python3 benchmark.py --filter score --compare benchmarks/bench-20261018-190000.json
+#
+# Cases that need a display (screen rendering, play-by-play) are skipped when
+# Tk can't open one. --compare exits 1 if any case got slower than --threshold.
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import wire
+from config import AppConfig
+from score_engine import ScoreEngine
+from entry_screen import PlayerRow
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SIZES = (2, 15, 50, 100)
+RED_BASE = 53
+GREEN_BASE = 43
+
+# name -> (needs_tk, fn(ctx) -> (ops, elapsed_ns))
+CASES = {}
+
+
+def case(name, tk=False):
+    def register(fn):
+        CASES[name] = (tk, fn)
+        return fn
+    return register
+
+
+def timed(fn, ops):
+    # Runs fn() once and returns (ops, elapsed_ns)
+    start = time.perf_counter_ns()
+    fn()
+    return ops, time.perf_counter_ns() - start
+
+
+def make_roster(n):
+    # n players a side; red equipment ids 1..n, green 101..100+n
+    return {
+        "Red": [PlayerRow(i, f"red{i}", i) for i in range(1, n + 1)],
+        "Green": [PlayerRow(1000 + i, f"green{i}", 100 + i) for i in range(1, n + 1)],
+    }
+
+
+def make_hits(n, count, rng, base_every=0):
+    # Mostly cross-team tags, some friendly fire, optionally base hits
+    red = list(range(1, n + 1))
+    green = list(range(101, 101 + n))
+    hits = []
+    for i in range(count):
+        attacker_team, other = (red, green) if rng.random() < 0.5 else (green, red)
+        attacker = rng.choice(attacker_team)
+        if base_every and i % base_every == 0:
+            hits.append((attacker, GREEN_BASE if attacker_team is red else RED_BASE))
+        elif rng.random() < 0.1:
+            hits.append((attacker, rng.choice(attacker_team)))
+        else:
+            hits.append((attacker, rng.choice(other)))
+    return hits
+
+
+# --- parsing -------------------------------------------------------------
+
+@case("parse_text")
+def bench_parse_text(ctx):
+    decoder = wire.WireDecoder()
+    payloads = [wire.encode_text(a, t) for a, t in make_hits(15, 20000, ctx["rng"])]
+    addr = ("127.0.0.1", 7500)
+
+    def run():
+        for data in payloads:
+            decoder.decode(data, addr)
+    return timed(run, len(payloads))
+
+
+@case("parse_binary")
+def bench_parse_binary(ctx):
+    # ops = events; datagrams carry up to 64 each
+    decoder = wire.WireDecoder(accept_binary=True)
+    hits = make_hits(15, 64 * 400, ctx["rng"])
+    payloads = [wire.encode_events(hits[i:i + 64], seq) for seq, i in enumerate(range(0, len(hits), 64))]
+    addr = ("127.0.0.1", 7500)
+
+    def run():
+        for data in payloads:
+            decoder.decode(data, addr)
+    return timed(run, len(hits))
+
+
+# --- scoring -------------------------------------------------------------
+
+def bench_score(ctx, n, base_every):
+    engine = ScoreEngine(make_roster(n))
+    hits = make_hits(n, 20000, ctx["rng"], base_every)
+    engine.start_game()
+
+    def run():
+        for first, second in hits:
+            engine.apply(first, second)
+    return timed(run, len(hits))
+
+
+for _n in SIZES:
+    case(f"record_hit_{_n}v{_n}")(lambda ctx, n=_n: bench_score(ctx, n, 0))
+    case(f"record_base_hit_mix_{_n}v{_n}")(lambda ctx, n=_n: bench_score(ctx, n, 10))
+
+
+# --- Tk: scoreboard + play-by-play ---------------------------------------
+
+def make_screen(ctx, n):
+    from play_action_screen import PlayActionScreen
+    screen = PlayActionScreen(ctx["root"], make_roster(n))
+    screen.game_running = True
+    screen.engine.start_game()
+    return screen
+
+
+def bench_refresh_lists(ctx, n):
+    # One hit + one frame per op: the dirty rank span is redrawn each time
+    screen = make_screen(ctx, n)
+    hits = make_hits(n, 1000, ctx["rng"])
+    root = ctx["root"]
+
+    def run():
+        for first, second in hits:
+            screen.show_result(screen.engine.apply(first, second))
+            screen.refresh_lists()
+            screen.update_team_totals()
+        root.update_idletasks()
+    try:
+        return timed(run, len(hits))
+    finally:
+        screen.destroy()
+
+
+for _n in (15, 100):
+    case(f"refresh_lists_{_n}v{_n}", tk=True)(lambda ctx, n=_n: bench_refresh_lists(ctx, n))
+
+
+@case("play_log_insert", tk=True)
+def bench_play_log(ctx):
+    # Lines added in bursts of 20 with a flush after each burst (a busy frame)
+    screen = make_screen(ctx, 15)
+    lines = [f"red{i % 15} hit green{i % 7}" for i in range(5000)]
+    root = ctx["root"]
+
+    def run():
+        for i in range(0, len(lines), 20):
+            for line in lines[i:i + 20]:
+                screen.play_log.add(line)
+            screen.play_log.flush()
+        root.update_idletasks()
+    try:
+        return timed(run, len(lines))
+    finally:
+        screen.destroy()
+
+
+@case("apply_events_frame_15v15", tk=True)
+def bench_apply_events(ctx):
+    # Pump-sized batches through apply_events, then a render frame
+    screen = make_screen(ctx, 15)
+    addr = ("127.0.0.1", 7500)
+    hits = [(a, t, addr) for a, t in make_hits(15, 20 * 200, ctx["rng"], 25)]
+
+    def run():
+        for i in range(0, len(hits), 20):
+            screen.apply_events(hits[i:i + 20])
+            screen.render_frame()
+        ctx["root"].update_idletasks()
+    try:
+        return timed(run, len(hits))
+    finally:
+        screen.destroy()
+
+
+# --- UDP + DB ------------------------------------------------------------
+
+@case("udp_loopback")
+def bench_udp_loopback(ctx):
+    # Datagrams received and drained through UDPComm; losses are reported
+    from udp_comm import UDPComm
+    cfg = AppConfig(udp_receive_port=ctx["udp_port"])
+    udp = UDPComm(cfg)
+    udp.start_receiver()
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payloads = [wire.encode_text(a, t) for a, t in make_hits(15, 20000, ctx["rng"])]
+    dest = ("127.0.0.1", cfg.udp_receive_port)
+    received = 0
+    start = last = time.perf_counter_ns()
+    try:
+        for i, data in enumerate(payloads):
+            tx.sendto(data, dest)
+            if i % 64 == 63:
+                received += len(udp.drain_messages())
+        # Drain until the receiver has been quiet for 50ms (the rest were dropped)
+        last = time.perf_counter_ns()
+        while received < len(payloads) and time.perf_counter_ns() - last < 50_000_000:
+            got = udp.drain_messages()
+            if got:
+                received += len(got)
+                last = time.perf_counter_ns()
+            else:
+                time.sleep(0.001)
+    finally:
+        tx.close()
+        udp.close()
+    ctx["extra"]["udp_loopback"] = {"sent": len(payloads), "received": received}
+    return received, last - start
+
+
+@case("roster_add_8x50")
+def bench_roster_add(ctx):
+    # Entry screen duplicate/full checks + add for a 400-player tournament
+    from config import TeamConfig
+    from roster import Roster
+    teams = [TeamConfig(f"team{t}", base_code=60 + t, max_players=50) for t in range(8)]
+    adds = [(f"team{i % 8}", 5000 + i, f"player{i}", 1000 + i) for i in range(400)]
+    ctx["rng"].shuffle(adds)
+    roster = Roster(teams)
+
+    def run():
+        for _ in range(20):
+            roster.clear()
+            for team, pid, codename, eid in adds:
+                if roster.check(team, pid, eid) is None:
+                    roster.add(team, pid, codename, eid)
+    return timed(run, 20 * len(adds))
+
+
+@case("mockdb_codename_cache")
+def bench_mockdb(ctx):
+    # CachedPlayerDB in front of MockDB: the lookups the entry screen makes
+    from ui_app import MockDB
+    from codename_cache import CachedPlayerDB
+    db = CachedPlayerDB(MockDB(), max_entries=1024)
+    rng = ctx["rng"]
+    ids = list(range(1, 2001))
+    for pid in ids[:1000]:
+        db.db.data[pid] = f"player{pid}"
+    lookups = [rng.choice(ids) for _ in range(20000)]
+
+    def run():
+        for pid in lookups:
+            db.get_codename(pid)
+        for i in range(0, 2000, 50):
+            db.get_codenames(ids[i:i + 50])
+    return timed(run, len(lookups) + 40)
+
+
+@case("mockdb_profile")
+def bench_mockdb_profile(ctx):
+    from ui_app import MockDB
+    from score_engine import GameResult
+    db = MockDB()
+    roster = make_roster(15)
+    for team in roster.values():
+        for p in team:
+            db.data[p.player_id] = p.codename
+    for _ in range(20):
+        engine = ScoreEngine(roster)
+        engine.start_game()
+        for first, second in make_hits(15, 200, ctx["rng"], 20):
+            engine.apply(first, second)
+        db.games.append(engine.result())
+    pids = [p.player_id for team in roster.values() for p in team] * 20
+
+    def run():
+        for pid in pids:
+            db.get_player_profile(pid)
+    return timed(run, len(pids))
+
+
+# --- runner --------------------------------------------------------------
+
+def open_display():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def run_cases(names, repeat, seed, udp_port):
+    root = None
+    if any(CASES[n][0] for n in names):
+        root = open_display()
+        if root is None:
+            print("[INFO] No display, skipping Tk cases (try xvfb-run).", file=sys.stderr)
+
+    results = {}
+    extra = {}
+    for name in names:
+        needs_tk, fn = CASES[name]
+        if needs_tk and root is None:
+            results[name] = {"skipped": "no display"}
+            continue
+        per_op = []
+        ops = 0
+        for i in range(repeat):
+            ctx = {"rng": random.Random(seed), "root": root, "udp_port": udp_port, "extra": extra}
+            ops, elapsed = fn(ctx)
+            per_op.append(elapsed / max(1, ops))
+        best = min(per_op)
+        results[name] = {
+            "ops": ops,
+            "ns_per_op": round(best, 1),
+            "ns_per_op_median": round(statistics.median(per_op), 1),
+            "ops_per_s": round(1e9 / best, 1) if best else None,
+        }
+        results[name].update(extra.pop(name, {}))
+        print(f"{name:<32}{best:>12.0f} ns/op{1e9 / best if best else 0:>14.0f} ops/s", file=sys.stderr)
+
+    if root is not None:
+        root.destroy()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(old, new, threshold):
+    # -> list of regressed case names; prints a table
+    regressions = []
+    print(f"\n{'case':<32}{'before':>12}{'after':>12}{'change':>10}")
+    for name, r in new["results"].items():
+        o = old.get("results", {}).get(name)
+        if not o or "ns_per_op" not in o or "ns_per_op" not in r:
+            continue
+        change = (r["ns_per_op"] - o["ns_per_op"]) / o["ns_per_op"]
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32}{o['ns_per_op']:>12.0f}{r['ns_per_op']:>12.0f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Photon hot-path benchmarks")
+    p.add_argument("--filter", default="", help="only run cases whose name contains this")
+    p.add_argument("--repeat", type=int, default=5, help="runs per case; the best is reported")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--udp-port", type=int, default=17599, help="receive port for udp_loopback")
+    p.add_argument("--out", help="JSON results path (default benchmarks/bench-<timestamp>.json)")
+    p.add_argument("--compare", help="earlier results JSON to compare against")
+    p.add_argument("--threshold", type=float, default=0.20, help="slowdown counted as a regression")
+    p.add_argument("--list", action="store_true", help="list cases and exit")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for name, (needs_tk, _) in CASES.items():
+            print(f"{name}{'  (tk)' if needs_tk else ''}")
+        return 0
+
+    # Never open a real audio device from a benchmark
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    names = [n for n in CASES if args.filter in n]
+    results = run_cases(names, max(1, args.repeat), args.seed, args.udp_port)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    out = args.out or os.path.join(APP_DIR, "benchmarks", time.strftime("bench-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Results written to {out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
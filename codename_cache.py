@@ -0,0 +1,172 @@
+# codename_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+_MISSING = object()
+
+
+class CachedPlayerDB:
+    # Read-through cache in front of PlayerDB (or MockDB)
+    # get_codename answers from a bounded LRU with a TTL; add_player writes
+    # through and refreshes the entry (queue_player too, before the batch is
+    # flushed). Profiles (codename + career stats) get their own LRU, dropped
+    # for every player in a game once save_game_results stores it.
+    # Anything else is passed to the real db.
+    # Queries run outside the lock, so every write bumps a per-player
+    # generation; a query result is only cached if no write for that player
+    # (or invalidate()) landed while it ran, otherwise a stale miss could hide
+    # a new player, or pre-game stats outlive a save, for the whole TTL.
+
+    def __init__(self, db, max_entries: int = 1024, ttl: float = 600.0):
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # player_id -> (codename or None, expires_at)
+        self._profiles = OrderedDict()  # player_id -> (profile dict or None, expires_at)
+        self._generations = {}          # player_id -> writes seen (only ids ever written)
+        self._epoch = 0                 # bumped by invalidate() of everything
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Only called for attributes this class doesn't define
+        return getattr(self.db, name)
+
+    def _get(self, player_id, entries=None):
+        entries = self._entries if entries is None else entries
+        entry = entries.get(player_id)
+        if entry is None:
+            return _MISSING
+        if entry[1] < time.monotonic():
+            del entries[player_id]
+            return _MISSING
+        entries.move_to_end(player_id)
+        return entry[0]
+
+    def _stamp(self, player_id) -> tuple:
+        # Call under the lock, before querying
+        return self._epoch, self._generations.get(player_id, 0)
+
+    def _bump(self, player_id) -> None:
+        # Call under the lock, for every write that touches player_id
+        self._generations[player_id] = self._generations.get(player_id, 0) + 1
+
+    def _put(self, player_id, value, entries=None) -> None:
+        entries = self._entries if entries is None else entries
+        entries[player_id] = (value, time.monotonic() + self.ttl)
+        entries.move_to_end(player_id)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def get_codename(self, player_id: int) -> Optional[str]:
+        with self._lock:
+            cached = self._get(player_id)
+            if cached is not _MISSING:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            stamp = self._stamp(player_id)
+
+        # Query outside the lock so a slow db doesn't block other cached lookups
+        # Misses are cached too (as None) until add_player or the TTL clears them
+        codename = self.db.get_codename(player_id)
+        with self._lock:
+            if self._stamp(player_id) == stamp:
+                self._put(player_id, codename)
+        return codename
+
+    def get_codenames(self, player_ids) -> dict:
+        # Cached ids answered locally, the rest in one bulk query
+        ids = list(player_ids)
+        found = {}
+        missing = []
+        with self._lock:
+            for pid in ids:
+                cached = self._get(pid)
+                if cached is _MISSING:
+                    missing.append(pid)
+                elif cached is not None:
+                    found[pid] = cached
+            self.hits += len(ids) - len(missing)
+            self.misses += len(missing)
+            stamps = {pid: self._stamp(pid) for pid in missing}
+
+        if missing:
+            fetched = self.db.get_codenames(missing)
+            with self._lock:
+                for pid in missing:
+                    if self._stamp(pid) == stamps[pid]:
+                        self._put(pid, fetched.get(pid))
+            found.update(fetched)
+        return found
+
+    def get_player_profile(self, player_id: int):
+        # Callers get a copy, so nobody can edit a cached profile
+        with self._lock:
+            cached = self._get(player_id, self._profiles)
+            if cached is not _MISSING:
+                self.hits += 1
+                return dict(cached) if cached else None
+            self.misses += 1
+            stamp = self._stamp(player_id)
+
+        profile = self.db.get_player_profile(player_id)
+        with self._lock:
+            if self._stamp(player_id) == stamp:
+                self._put(player_id, profile, self._profiles)
+                self._put(player_id, profile["codename"] if profile else None)
+        return dict(profile) if profile else None
+
+    def save_game_results(self, result):
+        # Career stats just changed for everyone in this game
+        game_id = self.db.save_game_results(result)
+        with self._lock:
+            for p in result.players:
+                self._bump(p.player_id)
+                self._profiles.pop(p.player_id, None)
+        return game_id
+
+    def queue_player(self, player_id: int, codename: str) -> None:
+        # Batched write (PlayerDB.flush_pending); the cache sees it immediately
+        self.db.queue_player(player_id, codename)
+        with self._lock:
+            self._bump(player_id)
+            self._put(player_id, codename)
+            self._profiles.pop(player_id, None)
+
+    def add_player(self, player_id: int, codename: str) -> None:
+        self.db.add_player(player_id, codename)
+        with self._lock:
+            self._bump(player_id)
+            self._put(player_id, codename)
+            self._profiles.pop(player_id, None)
+
+    def invalidate(self, player_id: int = None) -> None:
+        with self._lock:
+            if player_id is None:
+                self._epoch += 1
+                self._entries.clear()
+                self._profiles.clear()
+            else:
+                self._bump(player_id)
+                self._entries.pop(player_id, None)
+                self._profiles.pop(player_id, None)
+
+    def preload(self) -> int:
+        # Warm the cache with the whole players table in one query
+        rows = self.db.get_all_players()
+        with self._lock:
+            for player_id, codename in rows[-self.max_entries:]:
+                self._put(player_id, codename)
+        return min(len(rows), self.max_entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "profiles": len(self._profiles),
+                    "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.db.close()
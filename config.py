@@ -1,8 +1,32 @@
 # config.py
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+
+# UDP control codes; no team base or hardware ID may use them
+CONTROL_CODES = (202, 221)
+
+
+@dataclass
+class TeamConfig:
+    name: str                   # also stored with saved games (max 20 chars)
+    color: str = "#e8e8e8"
+    # Hitting this code scores for every other team; None = no base
+    base_code: int = None
+    max_players: int = 15
+
+
+def default_teams():
+    # Green scores on the red base (53), red on the green base (43)
+    return [TeamConfig("Red", "#e83030", base_code=53),
+            TeamConfig("Green", "#1fdd60", base_code=43)]
+
 
 @dataclass
 class AppConfig:
+    # Startup: the splash stays up at least this long, then closes as soon as
+    # the db, UDP, mixer and assets are ready
+    splash_min_ms: int = 1000
+
     # Database config 
     db_host : str = "127.0.0.1"
     db_port: int = 5432
@@ -10,6 +34,26 @@ class AppConfig:
     db_user: str = "student"
     db_password: str = "student"
     
+    # Connection pool; the DB worker runs db_pool_max - 1 threads so one
+    # connection is always left for the Tk thread (shutdown flush, close).
+    # Timeouts in seconds / ms
+    db_pool_min: int = 1
+    db_pool_max: int = 3
+    db_connect_timeout: int = 3
+    db_statement_timeout_ms: int = 2000
+    
+    # Retries after a dropped connection, doubling the wait each time (s)
+    db_retry_attempts: int = 3
+    db_retry_backoff: float = 0.25
+    
+    # Codename cache in front of the players table (entries, seconds)
+    codename_cache_size: int = 1024
+    codename_cache_ttl: float = 600.0
+    codename_preload: bool = True
+    
+    # New players are upserted in batches: on F5 and at least this often (ms)
+    db_flush_ms: int = 10000
+    
     # UDP config
     
     # Can change this in UI for Sprint 2
@@ -19,4 +63,75 @@ class AppConfig:
     udp_send_port: int = 7500
     
     # Bind + Receive here
-    udp_receive_port: int = 7501
\ No newline at end of file
+    udp_receive_port: int = 7501
+    
+    # "thread" = UDPComm (receiver thread), "asyncio" = AsyncUDPComm (loop stepped by Tk)
+    udp_backend: str = "thread"
+    
+    # How often Tk steps the asyncio loop (ms), asyncio backend only
+    udp_async_step_ms: int = 5
+    
+    # "text" = only "attacker:target" datagrams, "binary" = also accept the
+    # packed multi-event frames from wire.py (with sequence numbers for loss stats)
+    wire_format: str = "text"
+    
+    # Control codes and how many times each is sent (221 = game over, sent 3x)
+    # Duplicates queued together are coalesced into one burst
+    udp_code_repeats: dict = field(default_factory=lambda: {202: 1, 221: 3})
+    
+    # Outbound queue: codes sent per wakeup, max backlog, per-send timeout (s)
+    udp_send_batch: int = 32
+    udp_send_backlog: int = 1024
+    udp_send_timeout: float = 0.5
+    
+    # Most datagrams the receiver drains in one wakeup
+    udp_max_batch: int = 256
+    
+    # How often the UI pulls received hits off the queue (ms)
+    udp_pump_ms: int = 20
+
+    # Print every received datagram (debugging only: stdout on the hot path)
+    udp_debug: bool = False
+    
+    # Max scoreboard redraws per second during a game
+    render_hz: int = 20
+    
+    # Play-by-play: lines kept on screen / events kept in memory per game
+    play_log_lines: int = 200
+    play_log_capacity: int = 1000
+    
+    # Append-only binary journal of every hit received during a game
+    journal_enabled: bool = True
+    journal_dir: str = "journals"
+    journal_fsync_interval: float = 1.0
+
+    # Hot-path latency histograms (F3 overlay on the play screen); a JSON
+    # snapshot is written to metrics_dir at the end of every game
+    metrics_enabled: bool = False
+    metrics_dir: str = "metrics"
+
+    # Profile whole games (cProfile of the Tk + UDP receiver threads, tracemalloc
+    # snapshots) into profile_dir: every game with PHOTON_PROFILE=1, or press F4
+    # to profile just the next one
+    profile_games: bool = field(
+        default_factory=lambda: os.environ.get("PHOTON_PROFILE", "").lower() not in ("", "0", "false", "no"))
+    profile_dir: str = "profiles"
+    profile_snapshot_interval: float = 30.0
+
+    # Teams in roster order; any number, any size. arenas.json may give these
+    # as plain dicts ({"name": "Blue", "color": "#3080ff", "base_code": 63})
+    teams: list = field(default_factory=default_teams)
+
+    def __post_init__(self):
+        try:
+            self.teams = [t if isinstance(t, TeamConfig) else TeamConfig(**t) for t in self.teams]
+        except TypeError as e:
+            raise ValueError(f"bad team setting: {e}") from None
+        if not self.teams:
+            raise ValueError("at least one team is required")
+        names = [t.name for t in self.teams]
+        if len(set(names)) != len(names) or not all(0 < len(n) <= 20 for n in names):
+            raise ValueError(f"team names must be unique and 1-20 characters: {names}")
+        codes = [t.base_code for t in self.teams if t.base_code is not None]
+        if len(set(codes)) != len(codes) or set(codes) & set(CONTROL_CODES):
+            raise ValueError(f"team base codes must be unique and not {CONTROL_CODES}: {codes}")
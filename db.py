@@ -1,48 +1,425 @@
 # db.py
-from typing import Optional
-import psycopg2
+import csv
+import io
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from config import AppConfig
 
+# psycopg2 is imported by the first PlayerDB rather than at module load, so
+# importing this module (ui_app, player_profile) stays cheap at startup
+psycopg2 = None
+execute_values = None
+QueryCanceledError = None
+
+# Errors that mean the connection itself is gone (server restart, network drop)
+CONNECTION_ERRORS = ()
+
+
+def _load_driver():
+    global psycopg2, execute_values, QueryCanceledError, CONNECTION_ERRORS
+    if psycopg2 is None:
+        import psycopg2.extras
+        import psycopg2.pool
+        execute_values = psycopg2.extras.execute_values
+        QueryCanceledError = psycopg2.extensions.QueryCanceledError
+        CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+    return psycopg2
+
+
+# Folds game_players rows into player_stats; {where} picks which games
+STATS_UPSERT = """
+    INSERT INTO player_stats AS s
+        (player_id, games, wins, points, tags, times_tagged, base_hits, friendly_fire)
+    SELECT gp.player_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE gp.team = g.winner),
+           SUM(gp.score),
+           SUM(gp.tags),
+           SUM(gp.times_tagged),
+           SUM(gp.base_hits),
+           SUM(gp.friendly_fire)
+    FROM game_players gp
+    JOIN games g ON g.id = gp.game_id
+    {where}
+    GROUP BY gp.player_id
+    ON CONFLICT (player_id) DO UPDATE SET
+        games = s.games + EXCLUDED.games,
+        wins = s.wins + EXCLUDED.wins,
+        points = s.points + EXCLUDED.points,
+        tags = s.tags + EXCLUDED.tags,
+        times_tagged = s.times_tagged + EXCLUDED.times_tagged,
+        base_hits = s.base_hits + EXCLUDED.base_hits,
+        friendly_fire = s.friendly_fire + EXCLUDED.friendly_fire
+"""
+
+# game_events keeps raw IDs from the wire (BIGINT); anything wider is clamped
+BIGINT_MIN = -(1 << 63)
+BIGINT_MAX = (1 << 63) - 1
+
+
+def _bigint(value: int) -> int:
+    return min(max(value, BIGINT_MIN), BIGINT_MAX)
+
+
+# Leaderboard metric -> ORDER BY expression (each one backed by an index)
+LEADERBOARD_ORDER = {
+    "tags": "s.tags DESC",
+    "base_hits": "s.base_hits DESC",
+    "friendly_fire": "s.friendly_fire DESC",
+    "win_rate": "(s.wins::real / GREATEST(s.games, 1)) DESC",
+}
+
+
+def _csv_rows(rows) -> io.StringIO:
+    # In-memory CSV file for cursor.copy_expert
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    return buf
+
+
+def player_profile(player_id, codename, games=0, wins=0, points=0, tags=0,
+                   times_tagged=0, base_hits=0, friendly_fire=0) -> dict:
+    games = games or 0
+    wins = wins or 0
+    return {
+        "player_id": player_id,
+        "codename": codename,
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "points": points or 0,
+        "tags": tags or 0,
+        "times_tagged": times_tagged or 0,
+        "base_hits": base_hits or 0,
+        "friendly_fire": friendly_fire or 0,
+    }
+
+
 class PlayerDB:
+    # Thread-safe: every query borrows a connection from a small pool, so the
+    # DBWorker threads can run lookups side by side
+
     def __init__(self, cfg: AppConfig):
         self.cfg = cfg
-        self.conn = psycopg2.connect(
+        self.pool = _load_driver().pool.ThreadedConnectionPool(
+            cfg.db_pool_min,
+            cfg.db_pool_max,
             host=cfg.db_host,
             port=cfg.db_port,
             dbname=cfg.db_name,
             user=cfg.db_user,
             password=cfg.db_password,
+            connect_timeout=cfg.db_connect_timeout,
+            options=f"-c statement_timeout={cfg.db_statement_timeout_ms}",
         )
-        self.conn.autocommit = True
+        # getconn() raises PoolError when the pool is empty; this makes callers
+        # wait for a connection instead
+        self._slots = threading.BoundedSemaphore(cfg.db_pool_max)
+        # player_id -> codename waiting for flush_pending()
+        self.pending: Dict[int, str] = {}
+        self._pending_lock = threading.Lock()
         self._create_table_if_needed()
 
+    def _run(self, work: Callable):
+        # Runs work(cursor) on a pooled autocommit connection
+        # A dropped connection is discarded and the work retried on a fresh one
+        # with exponential backoff; a statement timeout is raised straight away
+        delay = self.cfg.db_retry_backoff
+        attempts = max(1, self.cfg.db_retry_attempts)
+        for attempt in range(attempts):
+            conn = None
+            try:
+                with self._slots:
+                    try:
+                        conn = self.pool.getconn()
+                        conn.autocommit = True
+                        with conn.cursor() as cur:
+                            result = work(cur)
+                        self.pool.putconn(conn)
+                        return result
+                    except QueryCanceledError:
+                        self.pool.putconn(conn)
+                        raise
+                    except CONNECTION_ERRORS:
+                        if conn is not None:
+                            self.pool.putconn(conn, close=True)
+                        raise
+                    except Exception:
+                        if conn is not None:
+                            self.pool.putconn(conn)
+                        raise
+            except QueryCanceledError:
+                raise
+            except CONNECTION_ERRORS:
+                # Back off without holding a pool slot
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
     def _create_table_if_needed(self) -> None:
-        with self.conn.cursor() as cur:
+        self._run(lambda cur: cur.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                id INTEGER PRIMARY KEY,
+                codename VARCHAR(50) NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS games (
+                id BIGSERIAL PRIMARY KEY,
+                started_at TIMESTAMPTZ NOT NULL,
+                ended_at TIMESTAMPTZ NOT NULL,
+                winner VARCHAR(20),
+                game_key VARCHAR(32) UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS game_teams (
+                game_id BIGINT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+                team VARCHAR(20) NOT NULL,
+                total INTEGER NOT NULL,
+                PRIMARY KEY (game_id, team)
+            );
+
+            CREATE TABLE IF NOT EXISTS game_players (
+                game_id BIGINT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+                player_id INTEGER NOT NULL,
+                equipment_id INTEGER NOT NULL,
+                team VARCHAR(20) NOT NULL,
+                codename VARCHAR(50) NOT NULL,
+                score INTEGER NOT NULL,
+                tags INTEGER NOT NULL,
+                times_tagged INTEGER NOT NULL,
+                base_hits INTEGER NOT NULL,
+                friendly_fire INTEGER NOT NULL,
+                PRIMARY KEY (game_id, player_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS game_events (
+                game_id BIGINT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+                seq INTEGER NOT NULL,
+                offset_ms INTEGER NOT NULL,
+                kind VARCHAR(16) NOT NULL,
+                attacker BIGINT NOT NULL,
+                target BIGINT NOT NULL,
+                points INTEGER NOT NULL,
+                PRIMARY KEY (game_id, seq)
+            );
+
+            -- upgrades for tables created by earlier versions (no-ops afterwards)
+            ALTER TABLE games ADD COLUMN IF NOT EXISTS game_key VARCHAR(32) UNIQUE;
+            DO $$
+            BEGIN
+                IF (SELECT data_type FROM information_schema.columns
+                    WHERE table_name = 'game_events' AND column_name = 'attacker') = 'integer' THEN
+                    ALTER TABLE game_events ALTER COLUMN attacker TYPE BIGINT,
+                                            ALTER COLUMN target TYPE BIGINT;
+                END IF;
+            END $$;
+
+            -- career totals, updated by save_game_results in the same transaction
+            CREATE TABLE IF NOT EXISTS player_stats (
+                player_id INTEGER PRIMARY KEY,
+                games INTEGER NOT NULL DEFAULT 0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                points BIGINT NOT NULL DEFAULT 0,
+                tags INTEGER NOT NULL DEFAULT 0,
+                times_tagged INTEGER NOT NULL DEFAULT 0,
+                base_hits INTEGER NOT NULL DEFAULT 0,
+                friendly_fire INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE INDEX IF NOT EXISTS game_players_player_idx ON game_players (player_id);
+            CREATE INDEX IF NOT EXISTS player_stats_tags_idx ON player_stats (tags DESC);
+            CREATE INDEX IF NOT EXISTS player_stats_base_hits_idx ON player_stats (base_hits DESC);
+            CREATE INDEX IF NOT EXISTS player_stats_friendly_fire_idx ON player_stats (friendly_fire DESC);
+            CREATE INDEX IF NOT EXISTS player_stats_win_rate_idx
+                ON player_stats ((wins::real / GREATEST(games, 1)) DESC);
+        """))
+        self._backfill_stats_if_needed()
+
+    def _backfill_stats_if_needed(self) -> None:
+        # One-off: build player_stats from games saved before it existed
+        def work(cur):
             cur.execute("""
-                CREATE TABLE IF NOT EXISTS players (
-                    id INTEGER PRIMARY KEY,
-                    codename VARCHAR(50) NOT NULL
-                )
+                SELECT NOT EXISTS (SELECT 1 FROM player_stats)
+                   AND EXISTS (SELECT 1 FROM game_players)
             """)
+            if cur.fetchone()[0]:
+                cur.execute(STATS_UPSERT.format(where=""))
+
+        self._run(work)
 
     def get_codename(self, player_id: int) -> Optional[str]:
-        with self.conn.cursor() as cur:
+        with self._pending_lock:
+            if player_id in self.pending:
+                return self.pending[player_id]
+
+        def work(cur):
             cur.execute(
                 "SELECT codename FROM players WHERE id = %s",
                 (player_id,)
             )
-            row = cur.fetchone()
-            return row[0] if row else None
+            return cur.fetchone()
+
+        row = self._run(work)
+        return row[0] if row else None
+
+    def get_all_players(self) -> List[Tuple[int, str]]:
+        # Whole table in one round trip (cache warm-up)
+        def work(cur):
+            cur.execute("SELECT id, codename FROM players")
+            return cur.fetchall()
+
+        return self._run(work)
 
     def add_player(self, player_id: int, codename: str) -> None:
-        with self.conn.cursor() as cur:
+        self._run(lambda cur: cur.execute("""
+            INSERT INTO players (id, codename)
+            VALUES (%s, %s)
+            ON CONFLICT (id)
+            DO UPDATE SET codename = EXCLUDED.codename
+        """, (player_id, codename)))
+
+    def get_codenames(self, player_ids: Iterable[int]) -> Dict[int, str]:
+        # Bulk lookup in one round trip; ids not in the table are left out
+        ids = list(player_ids)
+        with self._pending_lock:
+            found = {pid: self.pending[pid] for pid in ids if pid in self.pending}
+        rest = [pid for pid in ids if pid not in found]
+        if rest:
+            def work(cur):
+                cur.execute(
+                    "SELECT id, codename FROM players WHERE id = ANY(%s)",
+                    (rest,)
+                )
+                return cur.fetchall()
+
+            found.update(self._run(work))
+        return found
+
+    def queue_player(self, player_id: int, codename: str) -> None:
+        # Batched version of add_player: written by the next flush_pending()
+        with self._pending_lock:
+            self.pending[player_id] = codename
+
+    def flush_pending(self) -> int:
+        # All queued upserts as one multi-row statement (one round trip, one transaction)
+        with self._pending_lock:
+            rows = list(self.pending.items())
+        if not rows:
+            return 0
+
+        self._run(lambda cur: execute_values(cur, """
+            INSERT INTO players (id, codename)
+            VALUES %s
+            ON CONFLICT (id)
+            DO UPDATE SET codename = EXCLUDED.codename
+        """, rows, page_size=len(rows)))
+
+        with self._pending_lock:
+            for player_id, codename in rows:
+                if self.pending.get(player_id) == codename:
+                    del self.pending[player_id]
+        return len(rows)
+
+    def get_player_profile(self, player_id: int) -> Optional[dict]:
+        # Codename + career stats in one primary-key lookup (None if unknown)
+        with self._pending_lock:
+            if player_id in self.pending:
+                return player_profile(player_id, self.pending[player_id])
+
+        def work(cur):
             cur.execute("""
-                INSERT INTO players (id, codename)
-                VALUES (%s, %s)
-                ON CONFLICT (id)
-                DO UPDATE SET codename = EXCLUDED.codename
-            """, (player_id, codename))
+                SELECT p.codename, s.games, s.wins, s.points, s.tags,
+                       s.times_tagged, s.base_hits, s.friendly_fire
+                FROM players p
+                LEFT JOIN player_stats s ON s.player_id = p.id
+                WHERE p.id = %s
+            """, (player_id,))
+            return cur.fetchone()
+
+        row = self._run(work)
+        if not row:
+            return None
+        return player_profile(player_id, *row)
+
+    def get_leaderboard(self, metric: str = "tags", limit: int = 10) -> List[dict]:
+        # Career top N by tags, base_hits, friendly_fire or win_rate
+        order = LEADERBOARD_ORDER[metric]
+
+        def work(cur):
+            cur.execute(f"""
+                SELECT s.player_id, p.codename, s.games, s.wins, s.points, s.tags,
+                       s.times_tagged, s.base_hits, s.friendly_fire
+                FROM player_stats s
+                JOIN players p ON p.id = s.player_id
+                ORDER BY {order}
+                LIMIT %s
+            """, (limit,))
+            return cur.fetchall()
+
+        return [player_profile(*row) for row in self._run(work)]
+
+    def save_game_results(self, result) -> int:
+        # Stores a score_engine.GameResult in one transaction and returns the game id
+        # Players and events go in with COPY, so a busy game is still a few round trips
+        # Idempotent on result.game_key: if a COMMIT went through but its reply was
+        # lost, _run's retry finds the saved game instead of storing it again
+        def work(cur):
+            cur.execute("BEGIN")
+            try:
+                cur.execute("""
+                    INSERT INTO games (started_at, ended_at, winner, game_key)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (game_key) DO NOTHING
+                    RETURNING id
+                """, (datetime.fromtimestamp(result.started_at, timezone.utc),
+                      datetime.fromtimestamp(result.ended_at, timezone.utc),
+                      result.winner, result.game_key))
+                row = cur.fetchone()
+                if row is None:
+                    cur.execute("SELECT id FROM games WHERE game_key = %s", (result.game_key,))
+                    game_id = cur.fetchone()[0]
+                    cur.execute("COMMIT")
+                    return game_id
+                game_id = row[0]
+
+                execute_values(cur, "INSERT INTO game_teams (game_id, team, total) VALUES %s",
+                               [(game_id, team, total) for team, total in result.totals.items()])
+
+                cur.copy_expert("""
+                    COPY game_players (game_id, player_id, equipment_id, team, codename, score,
+                                       tags, times_tagged, base_hits, friendly_fire)
+                    FROM STDIN WITH (FORMAT csv)
+                """, _csv_rows(
+                    (game_id, p.player_id, p.equipment_id, p.team, p.codename, p.score,
+                     p.tags, p.times_tagged, p.base_hits, p.friendly_fire)
+                    for p in result.players))
+
+                cur.copy_expert("""
+                    COPY game_events (game_id, seq, offset_ms, kind, attacker, target, points)
+                    FROM STDIN WITH (FORMAT csv)
+                """, _csv_rows(
+                    (game_id, seq, offset_ms, kind, _bigint(attacker), _bigint(target), points)
+                    for seq, (offset_ms, kind, attacker, target, points) in enumerate(result.events)))
+
+                cur.execute(STATS_UPSERT.format(where="WHERE gp.game_id = %s"), (game_id,))
+                cur.execute("COMMIT")
+            except Exception:
+                try:
+                    cur.execute("ROLLBACK")
+                except CONNECTION_ERRORS:
+                    pass  # connection is gone, so is the transaction
+                raise
+            return game_id
+
+        return self._run(work)
 
     def close(self) -> None:
-        if self.conn:
-            self.conn.close()
\ No newline at end of file
+        if self.pool:
+            try:
+                self.flush_pending()
+            finally:
+                self.pool.closeall()
@@ -0,0 +1,64 @@
+# db_worker.py
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class DBWorker:
+    # Runs database calls on background threads and delivers results back on
+    # the Tk thread (callbacks are queued and drained by an after() poll, since
+    # Tk widgets must only be touched from the main thread)
+
+    def __init__(self, root, workers: int = 2, poll_ms: int = 30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+        self.in_flight = 0
+        self._done = queue.SimpleQueue()
+        self._after_id = None
+        self._closed = False
+        self._poll()
+
+    def submit(self, fn: Callable, *args,
+               on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None) -> Future:
+        # on_done(result) / on_error(exc) run on the Tk thread
+        self.in_flight += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(lambda f: self._done.put((f, on_done, on_error)))
+        return future
+
+    @property
+    def busy(self) -> bool:
+        return self.in_flight > 0
+
+    def _poll(self):
+        while True:
+            try:
+                future, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self.in_flight -= 1
+            exc = future.exception()
+            try:
+                if exc is not None:
+                    if on_error:
+                        on_error(exc)
+                    else:
+                        print(f"[WARNING] Database call failed.\n{exc}")
+                elif on_done:
+                    on_done(future.result())
+            except Exception as e:
+                print(f"[WARNING] Database callback failed.\n{e}")
+
+        if not self._closed:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -1,7 +1,8 @@
 # entry_screen.py
 import tkinter as tk
 from tkinter import messagebox
-from dataclasses import dataclass
+
+from roster import Roster, PlayerRow
 
 # COLOR THEMES:
 BG = "#0a0a0a"
@@ -14,13 +15,8 @@ DIM = "#aaaaaa"
 FG = "#e8e8e8"
 FONT = "Courier"
 
-MAX_PER_TEAM = 15
-
-@dataclass
-class PlayerRow:
-    player_id: int
-    codename: str
-    equipment_id: int
+# Roster panels per row before wrapping
+ROSTER_COLUMNS = 4
 
 # helper to make a styled button
 def make_button(parent, text, cmd, color=GOLD, width=16):
@@ -42,13 +38,19 @@ def make_entry(parent, var, width=18):
                     highlightbackground=DIM, highlightcolor=GOLD)
 
 class PlayerEntryScreen(tk.Frame):
-    def __init__(self, master, db, udp, on_start_game):
+    def __init__(self, master, db, udp, on_start_game, db_worker=None, teams=None):
         super().__init__(master, bg=BG)
         self.db = db
         self.udp = udp
+        # Runs db calls off the Tk thread; None = call the db directly
+        self.db_worker = db_worker
+        self.pending_db = 0
+        # Called with {team: [PlayerRow, ...]} in roster order
         self.on_start_game = on_start_game
-        self.red_team = []
-        self.green_team = []
+        # teams: config.TeamConfig list (AppConfig.teams); None = red vs green
+        self.roster = Roster(teams)
+        self.team_lists = {}
+        self.team_labels = {}
 
         self.build_ui()
         self.bind_keys()
@@ -124,8 +126,8 @@ class PlayerEntryScreen(tk.Frame):
         row = tk.Frame(form, bg=BG_PANEL)
         row.pack(fill="x", pady=4)
         tk.Label(row, text="TEAM", font=(FONT, 10), fg=DIM, bg=BG_PANEL).pack(side="left", padx=(0, 8))
-        self.team_var = tk.StringVar(value="Red")
-        m = tk.OptionMenu(row, self.team_var, "Red", "Green")
+        self.team_var = tk.StringVar(value=self.roster.names[0])
+        m = tk.OptionMenu(row, self.team_var, *self.roster.names)
         m.config(font=(FONT, 10), bg=BG_INPUT, fg=GOLD,
                  activebackground=GOLD, activeforeground=BG,
                  highlightthickness=0, relief="flat", width=8)
@@ -162,49 +164,49 @@ class PlayerEntryScreen(tk.Frame):
         tk.Label(form, text="auto-fills codename from DB if found",
                  font=(FONT, 8), fg=DIM, bg=BG_PANEL).pack(pady=(6, 0))
 
+        # career stats for the last looked-up player
+        self.stats_label = tk.Label(form, text="", font=(FONT, 8),
+                                    fg=FG, bg=BG_PANEL, justify="left")
+        self.stats_label.pack(pady=(6, 0))
+
+        # shows pending database work
+        self.status_label = tk.Label(form, text="", font=(FONT, 8, "bold"),
+                                     fg=GOLD, bg=BG_PANEL)
+        self.status_label.pack(pady=(4, 0))
+
     def build_rosters(self, parent):
         roster = tk.Frame(parent, bg=BG)
         roster.grid(row=0, column=1, sticky="nsew")
-        roster.grid_columnconfigure(0, weight=1)
-        roster.grid_columnconfigure(1, weight=1)
-        roster.grid_rowconfigure(1, weight=1)
+        columns = min(ROSTER_COLUMNS, len(self.roster.names))
+        for col in range(columns):
+            roster.grid_columnconfigure(col, weight=1)
 
         # rosters header
         hdr = tk.Frame(roster, bg=BG)
-        hdr.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 8))
-        tk.Label(hdr, text=f"[ ROSTERS  (max {MAX_PER_TEAM} per team) ]",
+        hdr.grid(row=0, column=0, columnspan=columns, sticky="ew", pady=(0, 8))
+        tk.Label(hdr, text="[ ROSTERS ]",
                  font=(FONT, 9, "bold"), fg=GOLD, bg=BG).pack(side="left")
         tk.Frame(hdr, bg=GOLD, height=1).pack(side="left", fill="x", expand=True, padx=(6, 0))
 
-        # red panel
-        red_wrap = tk.Frame(roster, bg=BG_PANEL,
-                            highlightthickness=1, highlightbackground=RED_NEON)
-        red_wrap.grid(row=1, column=0, sticky="nsew", padx=(0, 8))
-        red_wrap.grid_rowconfigure(1, weight=1)
-        red_wrap.grid_columnconfigure(0, weight=1)
-
-        tk.Label(red_wrap, text="< RED TEAM >", font=(FONT, 10, "bold"),
-                 fg=RED_NEON, bg=BG_PANEL).grid(row=0, column=0, pady=(8, 4))
-        self.red_list = tk.Listbox(red_wrap, font=(FONT, 9),
-                                   bg=BG_PANEL, fg=RED_NEON,
-                                   selectbackground=RED_NEON, selectforeground=BG,
-                                   relief="flat", borderwidth=0, highlightthickness=0)
-        self.red_list.grid(row=1, column=0, sticky="nsew", padx=8, pady=(0, 8))
-
-        # green panel
-        green_wrap = tk.Frame(roster, bg=BG_PANEL,
-                              highlightthickness=1, highlightbackground=GREEN_NEON)
-        green_wrap.grid(row=1, column=1, sticky="nsew", padx=(8, 0))
-        green_wrap.grid_rowconfigure(1, weight=1)
-        green_wrap.grid_columnconfigure(0, weight=1)
-
-        tk.Label(green_wrap, text="< GREEN TEAM >", font=(FONT, 10, "bold"),
-                 fg=GREEN_NEON, bg=BG_PANEL).grid(row=0, column=0, pady=(8, 4))
-        self.green_list = tk.Listbox(green_wrap, font=(FONT, 9),
-                                     bg=BG_PANEL, fg=GREEN_NEON,
-                                     selectbackground=GREEN_NEON, selectforeground=BG,
-                                     relief="flat", borderwidth=0, highlightthickness=0)
-        self.green_list.grid(row=1, column=0, sticky="nsew", padx=8, pady=(0, 8))
+        # one panel per team, wrapping after ROSTER_COLUMNS
+        for i, team in enumerate(self.roster.configs.values()):
+            row, col = divmod(i, columns)
+            roster.grid_rowconfigure(row + 1, weight=1)
+            wrap = tk.Frame(roster, bg=BG_PANEL,
+                            highlightthickness=1, highlightbackground=team.color)
+            wrap.grid(row=row + 1, column=col, sticky="nsew",
+                      padx=(0 if col == 0 else 4, 0 if col == columns - 1 else 4), pady=(0, 8))
+            wrap.grid_rowconfigure(1, weight=1)
+            wrap.grid_columnconfigure(0, weight=1)
+
+            self.team_labels[team.name] = tk.Label(wrap, font=(FONT, 10, "bold"),
+                                                   fg=team.color, bg=BG_PANEL)
+            self.team_labels[team.name].grid(row=0, column=0, pady=(8, 4))
+            self.team_lists[team.name] = tk.Listbox(wrap, font=(FONT, 9),
+                                                    bg=BG_PANEL, fg=team.color,
+                                                    selectbackground=team.color, selectforeground=BG,
+                                                    relief="flat", borderwidth=0, highlightthickness=0)
+            self.team_lists[team.name].grid(row=1, column=0, sticky="nsew", padx=8, pady=(0, 8))
 
     def bind_keys(self):
         top = self.winfo_toplevel()
@@ -221,17 +223,69 @@ class PlayerEntryScreen(tk.Frame):
             self.udp.set_target_ip(ip)
         messagebox.showinfo("Network", f"UDP target set to {ip}")
 
+    def run_db(self, fn, *args, on_done, busy_text="DB: WORKING..."):
+        # Run a db call in the background and hand the result to on_done on the Tk thread
+        if self.db_worker is None:
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self.db_failed(e)
+                return
+            on_done(result)
+            return
+
+        self.pending_db += 1
+        self.status_label.config(text=busy_text, fg=GOLD)
+
+        def done(result):
+            if self.finish_db():
+                on_done(result)
+
+        def failed(exc):
+            if self.finish_db():
+                self.db_failed(exc)
+
+        self.db_worker.submit(fn, *args, on_done=done, on_error=failed)
+
+    def finish_db(self):
+        # False if this screen was closed while the query was running
+        self.pending_db -= 1
+        if not self.winfo_exists():
+            return False
+        if self.pending_db == 0:
+            self.status_label.config(text="")
+        return True
+
+    def db_failed(self, exc):
+        self.status_label.config(text="DB: UNAVAILABLE", fg=RED_NEON)
+        messagebox.showerror("Database", f"Database request failed, try again.\n{exc}")
+
     def lookup(self):
         pid = self.parse_int(self.player_id_var.get(), "Player ID")
         if pid is None:
             return
-        codename = self.db.get_codename(pid)
-        if codename:
-            self.codename_var.set(codename)
+        self.run_db(self.db.get_player_profile, pid,
+                    on_done=lambda profile: self.show_lookup(pid, profile),
+                    busy_text=f"DB: LOOKING UP {pid}...")
+
+    def show_lookup(self, pid, profile):
+        if self.player_id_var.get().strip() != str(pid):
+            return  # operator already moved on to another id
+        if profile:
+            self.codename_var.set(profile["codename"])
+            self.stats_label.config(text=self.format_stats(profile))
         else:
             self.codename_var.set("")
+            self.stats_label.config(text="")
             messagebox.showinfo("Not Found", "Player not found. Enter a codename manually.")
 
+    @staticmethod
+    def format_stats(profile):
+        if not profile["games"]:
+            return "no games played yet"
+        return (f'GAMES {profile["games"]}  WIN {profile["win_rate"]:.0%}\n'
+                f'TAGS {profile["tags"]}  BASE {profile["base_hits"]}  FF {profile["friendly_fire"]}')
+
     def add_player(self):
         team = self.team_var.get().strip()
         pid = self.parse_int(self.player_id_var.get(), "Player ID")
@@ -244,68 +298,100 @@ class PlayerEntryScreen(tk.Frame):
         eid = self.parse_int(self.equipment_id_var.get(), "Hardware ID")
         if eid is None:
             return
-        
-        if self.player_id_exists(pid):
-            messagebox.showerror("Duplicate Player", f"Player ID {pid} is already asigned")
-            return
-        
-        if self.equipment_id_exists(eid):
-            messagebox.showerror("Duplicate Hardware", f"Hardware ID {eid} is already assigned")
+
+        if not self.can_add(team, pid, eid):
             return
-        
-        target = self.red_team if team == "Red" else self.green_team
-        if len(target) >= MAX_PER_TEAM:
-            messagebox.showerror("Team Full", f"{team} team is full.")
+
+        self.run_db(self.db.get_codename, pid,
+                    on_done=lambda existing: self.finish_add(team, pid, codename, eid, existing),
+                    busy_text=f"DB: CHECKING {pid}...")
+
+    def can_add(self, team, pid, eid):
+        problem = self.roster.check(team, pid, eid)
+        if problem:
+            messagebox.showerror(*problem)
+            return False
+        return True
+
+    def finish_add(self, team, pid, codename, eid, existing):
+        # Checked again: another add may have landed while the lookup ran
+        if not self.can_add(team, pid, eid):
             return
 
-        existing = self.db.get_codename(pid)
         if existing:
             codename = existing
-            self.codename_var.set(existing)
         else:
-            self.db.add_player(pid, codename)
+            # Written to the DB in one batch when the game starts (or on the flush timer)
+            self.db.queue_player(pid, codename)
 
-        target.append(PlayerRow(player_id=pid, codename=codename, equipment_id=eid))
-        self.refresh_lists()
+        # Only the new row is drawn, not the whole roster
+        player = self.roster.add(team, pid, codename, eid)
+        self.team_lists[team].insert("end", self.player_row_text(player))
+        self.update_team_label(team)
         self.udp.send_equipment_id(eid)
 
-        self.player_id_var.set("")
-        self.codename_var.set("")
-        self.equipment_id_var.set("")
+        # only clear the form if it still shows the player we just added
+        if self.player_id_var.get().strip() == str(pid):
+            self.player_id_var.set("")
+            self.codename_var.set("")
+            self.equipment_id_var.set("")
 
     def player_id_exists(self, player_id):
-        all_players = self.red_team + self.green_team
-        return any(p.player_id == player_id for p in all_players)
+        return player_id in self.roster.player_ids
     
     def equipment_id_exists(self, equipment_id):
-        all_players = self.red_team + self.green_team
-        return any(p.equipment_id == equipment_id for p in all_players)
+        return equipment_id in self.roster.equipment_ids
     
     def clear_all(self):
-        self.red_team.clear()
-        self.green_team.clear()
+        self.roster.clear()
         
         self.player_id_var.set("")
         self.codename_var.set("")
         self.equipment_id_var.set("")
-        self.team_var.set("Red")
+        self.team_var.set(self.roster.names[0])
         
         self.refresh_lists()
 
     def start(self):
-        if not self.red_team and not self.green_team:
+        if not len(self.roster):
             messagebox.showerror("No Players", "Add at least one player before starting the game.")
             return
         
-        self.on_start_game(self.red_team, self.green_team)
+        if self.pending_db:
+            messagebox.showinfo("Please Wait", "Still waiting on the database, try again in a moment.")
+            return
+        
+        self.flush_roster()
+        self.on_start_game({team: list(players) for team, players in self.roster.teams.items()})
+
+    def flush_roster(self):
+        # Commit any new codenames in one round trip, in the background if we can
+        if self.db_worker is not None:
+            self.db_worker.submit(self.db.flush_pending,
+                                  on_error=lambda e: print(f"[WARNING] Could not save new players, will retry.\n{e}"))
+            return
+        try:
+            self.db.flush_pending()
+        except Exception as e:
+            print(f"[WARNING] Could not save new players, will retry.\n{e}")
+
+    @staticmethod
+    def player_row_text(p):
+        return f" {p.player_id} | {p.codename} | hw:{p.equipment_id}"
+
+    def update_team_label(self, team):
+        count = len(self.roster.teams[team])
+        limit = self.roster.configs[team].max_players
+        self.team_labels[team].config(text=f"< {team.upper()} TEAM  {count}/{limit} >")
 
     def refresh_lists(self):
-        self.red_list.delete(0, "end")
-        self.green_list.delete(0, "end")
-        for p in self.red_team:
-            self.red_list.insert("end", f" {p.player_id} | {p.codename} | hw:{p.equipment_id}")
-        for p in self.green_team:
-            self.green_list.insert("end", f" {p.player_id} | {p.codename} | hw:{p.equipment_id}")
+        # Full redraw (startup, clear); adds only insert their own row
+        for team, players in self.roster.teams.items():
+            listbox = self.team_lists[team]
+            listbox.delete(0, "end")
+            if players:
+                listbox.insert("end", *(self.player_row_text(p) for p in players))
+            self.update_team_label(team)
 
     @staticmethod
     def parse_int(value, field):
@@ -0,0 +1,87 @@
+# game_clock.py
+import math
+import time
+from typing import Callable, Optional
+
+# A tick within this much of a second boundary counts as on it
+EPSILON = 0.001
+
+
+class GameClock:
+    # Counts down to an absolute time.monotonic() deadline
+    # Every tick recomputes what's left from the deadline and aims the next
+    # after() at the next whole-second boundary, so a late tick (busy Tk thread)
+    # is shown late but never pushes back the ticks after it or the end time.
+
+    def __init__(self, widget, seconds: float,
+                 on_tick: Callable[[int], None], on_done: Callable[[], None],
+                 clock: Callable[[], float] = time.monotonic):
+        self.widget = widget
+        self.seconds = seconds
+        self.on_tick = on_tick      # on_tick(whole seconds left), once per second
+        self.on_done = on_done      # at the deadline
+        self.clock = clock
+        self.started_at = None
+        self.deadline = None
+        self.ticks = 0
+        self.jitter_total = 0.0     # seconds ticks ran after their boundary
+        self.jitter_max = 0.0
+        self.done_late = None       # how late on_done ran
+        self._due = None
+        self._after_id = None
+
+    def start(self, at: Optional[float] = None) -> None:
+        # `at` lets a clock continue exactly where another ended (the game
+        # timer starts at the countdown's deadline, not when its callback ran)
+        self.started_at = self.clock() if at is None else at
+        self.deadline = self.started_at + self.seconds
+        self._tick()
+
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None and self.done_late is None
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return self.seconds
+        return max(0.0, self.deadline - self.clock())
+
+    def _tick(self):
+        self._after_id = None
+        now = self.clock()
+        if self._due is not None:
+            late = max(0.0, now - self._due)
+            self.ticks += 1
+            self.jitter_total += late
+            self.jitter_max = max(self.jitter_max, late)
+
+        left = self.deadline - now
+        if left <= EPSILON:
+            self.done_late = -left
+            self.on_done()
+            return
+
+        whole = math.ceil(left - EPSILON)
+        self.on_tick(whole)
+
+        # Next time the display changes: when `whole - 1` seconds are left
+        self._due = self.deadline - (whole - 1)
+        delay = max(1, math.ceil((self._due - self.clock()) * 1000))
+        self._after_id = self.widget.after(delay, self._tick)
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self.deadline = None
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "jitter_mean_ms": round(self.jitter_total / self.ticks * 1000, 3) if self.ticks else 0.0,
+            "jitter_max_ms": round(self.jitter_max * 1000, 3),
+            "done_late_ms": round(self.done_late * 1000, 3) if self.done_late is not None else None,
+        }
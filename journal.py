@@ -0,0 +1,188 @@
+# journal.py
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import score_engine
+
+# File layout: 8 byte header (magic + record size), then fixed-size records
+#   monotonic_ns i64 | source ip 4s | source port u16 | attacker i64 | target i64 | outcome u8 | pad
+# IDs are i64 so any u32 binary-wire ID fits; text IDs beyond that are clamped.
+# PJL1 journals (i32 IDs) can still be read.
+MAGIC = b"PJL2"
+FILE_HEADER = struct.Struct("<4sI")
+RECORD = struct.Struct("<q4sHqqBx")
+READ_FORMATS = {MAGIC: RECORD, b"PJL1": struct.Struct("<q4sHiiBx")}
+
+ID_MIN = -(1 << 63)
+ID_MAX = (1 << 63) - 1
+
+# Outcome byte stored with every record
+IGNORED = 0         # received while no game was running
+OUTCOMES = {
+    score_engine.TAG: 1,
+    score_engine.FRIENDLY_FIRE: 2,
+    score_engine.BASE: 3,
+    score_engine.BASE_NO_SCORE: 4,
+    score_engine.UNKNOWN: 5,
+}
+OUTCOME_NAMES = {code: kind for kind, code in OUTCOMES.items()}
+OUTCOME_NAMES[IGNORED] = "ignored"
+
+# Roster, base codes and final scores go in a JSON file next to the journal
+META_SUFFIX = ".json"
+
+Record = namedtuple("Record", "monotonic_ns ip port attacker target outcome")
+
+_STOP = object()
+
+
+def _pack_addr(addr):
+    # ("1.2.3.4", port) -> (b"\x01\x02\x03\x04", port); anything else -> zeros
+    try:
+        return socket.inet_aton(addr[0]), addr[1] & 0xFFFF
+    except (OSError, TypeError, IndexError):
+        return b"\0\0\0\0", 0
+
+
+def clamp_id(value: int) -> int:
+    # Keeps a parsed ID inside the journal's (and the database's) i64 range
+    return min(max(value, ID_MIN), ID_MAX)
+
+
+class Journal:
+    # Append-only record of every hit a game receives
+    # record() only puts a tuple on a queue; a writer thread packs, writes and
+    # fsyncs every `fsync_interval` seconds so the Tk thread never touches the disk
+
+    def __init__(self, path: str, fsync_interval: float = 1.0, buffer_size: int = 64 * 1024):
+        self.path = path
+        self.meta_path = path + META_SUFFIX
+        self.fsync_interval = fsync_interval
+        self.records = 0
+        self.dropped = 0        # records that could not be packed (writer thread)
+        self.meta = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, RECORD.size))
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def record(self, addr, attacker: int, target: int, outcome: int, monotonic_ns: int = None) -> None:
+        if monotonic_ns is None:
+            monotonic_ns = time.monotonic_ns()
+        self.records += 1
+        self._queue.put((monotonic_ns, addr, clamp_id(attacker), clamp_id(target), outcome))
+
+    def write_meta(self, **fields) -> None:
+        # Merge fields into the sidecar JSON (written on the writer thread)
+        self.meta.update(fields)
+        self._queue.put(("meta", dict(self.meta)))
+
+    def _write_meta(self, meta) -> None:
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, self.meta_path)
+
+    def _loop(self):
+        try:
+            self._write_loop()
+        finally:
+            # The writer owns the file: closed here even if close() stopped waiting
+            try:
+                self._file.close()
+            except OSError as e:
+                print(f"[WARNING] Could not close journal {self.path}.\n{e}")
+
+    def _write_loop(self):
+        last_sync = time.monotonic()
+        stop = False
+        while not stop:
+            try:
+                items = [self._queue.get(timeout=self.fsync_interval)]
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            chunk = bytearray()
+            meta = None
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                    continue
+                if item[0] == "meta":
+                    meta = item[1]
+                    continue
+                # One bad record is dropped; it never stops the journal
+                try:
+                    ts, addr, attacker, target, outcome = item
+                    ip, port = _pack_addr(addr)
+                    chunk += RECORD.pack(ts, ip, port, attacker, target, outcome)
+                except (struct.error, TypeError, ValueError) as e:
+                    self.dropped += 1
+                    if self.dropped == 1:
+                        print(f"[WARNING] Journal dropped a record it could not pack.\n{e}")
+            if chunk:
+                self._file.write(chunk)
+            if meta is not None:
+                self._write_meta(meta)
+
+            now = time.monotonic()
+            if stop or now - last_sync >= self.fsync_interval:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                last_sync = now
+
+    def close(self, timeout: float = 2.0) -> None:
+        # Flushes and fsyncs everything recorded so far; called on the Tk thread,
+        # so it waits at most `timeout` s for the writer (which then finishes alone)
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"[WARNING] Journal writer still busy, {self.path} will finish in the background.")
+
+
+def new_journal_path(journal_dir: str, prefix: str = "game") -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(journal_dir, f"{prefix}-{stamp}.pjl")
+
+
+def read_meta(path: str) -> dict:
+    # Sidecar for a journal path ({} if the game never wrote one)
+    try:
+        with open(path + META_SUFFIX) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def read_journal(path: str):
+    # Yields Record tuples; a torn last record (crash mid-write) is skipped
+    with open(path, "rb") as f:
+        header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            raise ValueError(f"{path} is empty or truncated (no journal header)")
+        magic, size = FILE_HEADER.unpack(header)
+        record = READ_FORMATS.get(magic)
+        if record is None or size != record.size:
+            raise ValueError(f"{path} is not a {'/'.join(m.decode() for m in READ_FORMATS)} journal")
+        data = f.read()
+
+    usable = len(data) - len(data) % size
+    for ts, ip, port, attacker, target, outcome in record.iter_unpack(memoryview(data)[:usable]):
+        yield Record(ts, socket.inet_ntoa(ip), port, attacker, target, outcome)
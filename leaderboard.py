@@ -0,0 +1,69 @@
+# leaderboard.py
+from bisect import bisect_left
+from dataclasses import dataclass
+
+
+@dataclass
+class RankChange:
+    # One player's score moved them from old_rank to new_rank (0 = top)
+    record: object
+    old_rank: int
+    new_rank: int
+
+    @property
+    def moved(self) -> bool:
+        return self.old_rank != self.new_rank
+
+
+class Leaderboard:
+    # Players kept in score order (highest first, ties by join order)
+    # A score change repositions one player with bisect instead of re-sorting
+
+    def __init__(self, records=()):
+        self._keys = []       # sorted (-score, seq) keys
+        self._records = []    # records in the same order as _keys
+        self._key_of = {}     # id(record) -> current key
+        self._seq = 0
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def ordered(self) -> list:
+        return list(self._records)
+
+    def span(self, lo, hi) -> list:
+        # Records ranked lo..hi inclusive
+        return self._records[lo:hi + 1]
+
+    def rank_of(self, record) -> int:
+        return bisect_left(self._keys, self._key_of[id(record)])
+
+    def add(self, record) -> int:
+        key = (-record.score, self._seq)
+        self._seq += 1
+        self._key_of[id(record)] = key
+        rank = bisect_left(self._keys, key)
+        self._keys.insert(rank, key)
+        self._records.insert(rank, record)
+        return rank
+
+    def update(self, record) -> RankChange:
+        # Call after record.score changed
+        old_key = self._key_of[id(record)]
+        old_rank = bisect_left(self._keys, old_key)
+        new_key = (-record.score, old_key[1])
+        if new_key == old_key:
+            return RankChange(record, old_rank, old_rank)
+
+        del self._keys[old_rank]
+        del self._records[old_rank]
+        new_rank = bisect_left(self._keys, new_key)
+        self._keys.insert(new_rank, new_key)
+        self._records.insert(new_rank, record)
+        self._key_of[id(record)] = new_key
+        return RankChange(record, old_rank, new_rank)
@@ -0,0 +1,292 @@
+# load_generator.py
+# Open-loop load tool for the play action screen
+#
+# Unlike python_trafficgenerator_v2.py it never waits for a reply before the
+# next send: events go out on a fixed schedule (optionally bursty) and the
+# game's replies are matched up on a separate thread to measure latency.
+#
+# Register the generated equipment ids in the entry screen first:
+#   red team   = --red-start .. --red-start + --red - 1
+#   green team = --green-start .. --green-start + --green - 1
+#
+# Example: 15v15 at 200 events/s for 60s, waiting for the game's 202
+#   python3 load_generator.py --red 15 --green 15 --rate 200 --duration 60 --wait-start
+
+import argparse
+import json
+import math
+import random
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+
+import wire
+
+# Codes the game sends that are not replies to a hit
+CONTROL_CODES = {202, 221}
+RED_BASE = 53
+GREEN_BASE = 43
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    if lo == hi:
+        return sorted_values[lo]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def rate_at(args, elapsed):
+    # Target events/s at `elapsed` seconds into the run
+    if args.pattern == "burst":
+        # burst_factor x rate for burst_length seconds out of every burst_period
+        in_burst = (elapsed % args.burst_period) < args.burst_length
+        return args.rate * args.burst_factor if in_burst else args.rate
+    if args.pattern == "ramp":
+        return args.rate * min(1.0, max(0.05, elapsed / args.duration))
+    return args.rate
+
+
+class EventMaker:
+    # Random hits with the requested friendly-fire / base-hit mix
+
+    def __init__(self, args, rng):
+        self.rng = rng
+        self.red = list(range(args.red_start, args.red_start + args.red))
+        self.green = list(range(args.green_start, args.green_start + args.green))
+        self.friendly_fire = args.friendly_fire
+        self.base_hits = args.base_hits
+
+    def next(self):
+        # Returns (attacker, target, expected reply codes)
+        rng = self.rng
+        red_attacks = not self.green or (self.red and rng.random() < 0.5)
+        own, other = (self.red, self.green) if red_attacks else (self.green, self.red)
+        attacker = rng.choice(own)
+
+        roll = rng.random()
+        if roll < self.base_hits:
+            return attacker, GREEN_BASE if red_attacks else RED_BASE, ()
+        if roll < self.base_hits + self.friendly_fire and len(own) > 1:
+            target = rng.choice(own)
+            while target == attacker:
+                target = rng.choice(own)
+            return attacker, target, (attacker, target)
+        if not other:
+            return attacker, GREEN_BASE if red_attacks else RED_BASE, ()
+        target = rng.choice(other)
+        return attacker, target, (target,)
+
+
+class ReplyTracker:
+    # Matches reply codes from the game to the oldest send still waiting on that code
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(deque)
+        self.latencies = []
+        self.unexpected = 0
+        self.game_over = False
+
+    def expect(self, codes, sent_at):
+        with self.lock:
+            for code in codes:
+                self.pending[code].append(sent_at)
+
+    def reply(self, code, received_at):
+        with self.lock:
+            waiting = self.pending.get(code)
+            if waiting:
+                self.latencies.append(received_at - waiting.popleft())
+            elif code == 221:
+                self.game_over = True
+            elif code not in CONTROL_CODES:
+                self.unexpected += 1
+
+    def missing(self):
+        with self.lock:
+            return sum(len(q) for q in self.pending.values())
+
+
+def receive_replies(sock, tracker, stop):
+    while not stop.is_set():
+        try:
+            data, _ = sock.recvfrom(2048)
+        except socket.timeout:
+            continue
+        except OSError:
+            break
+        now = time.perf_counter()
+        try:
+            code = int(data.decode("utf-8", errors="replace").strip())
+        except ValueError:
+            continue
+        tracker.reply(code, now)
+
+
+def wait_for_start(sock):
+    print("waiting for start (202) from game software...")
+    while True:
+        try:
+            data, _ = sock.recvfrom(2048)
+        except socket.timeout:
+            continue
+        if data.decode("utf-8", errors="replace").strip() == "202":
+            return
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    maker = EventMaker(args, rng)
+    tracker = ReplyTracker()
+
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    rx.bind(("0.0.0.0", args.reply_port))
+    rx.settimeout(0.2)
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    game = (args.target_ip, args.game_port)
+
+    if args.wait_start:
+        wait_for_start(rx)
+
+    stop = threading.Event()
+    receiver = threading.Thread(target=receive_replies, args=(rx, tracker, stop), daemon=True)
+    receiver.start()
+
+    per_datagram = max(1, min(args.events_per_datagram, wire.MAX_EVENTS_PER_DATAGRAM)) if args.binary else 1
+    sent_events = 0
+    datagrams = 0
+    send_errors = 0
+    sequence = 0
+    due = 0.0   # fractional events owed by the schedule
+
+    start = time.perf_counter()
+    last = start
+    while True:
+        now = time.perf_counter()
+        elapsed = now - start
+        if elapsed >= args.duration or tracker.game_over:
+            break
+
+        due += rate_at(args, elapsed) * (now - last)
+        last = now
+        while due >= 1:
+            count = min(per_datagram, int(due))
+            events = [maker.next() for _ in range(count)]
+            if args.binary:
+                payloads = [wire.encode_events([(a, t) for a, t, _ in events], sequence)]
+                sequence += 1
+            else:
+                payloads = [wire.encode_text(a, t) for a, t, _ in events]
+
+            sent_at = time.perf_counter()
+            for _, _, codes in events:
+                tracker.expect(codes, sent_at)
+            for payload in payloads:
+                try:
+                    tx.sendto(payload, game)
+                    datagrams += 1
+                except OSError:
+                    send_errors += 1
+            sent_events += count
+            due -= count
+
+        time.sleep(args.tick)
+
+    send_time = time.perf_counter() - start
+
+    # Give late replies a chance before counting them as missing
+    time.sleep(args.grace)
+    stop.set()
+    receiver.join(1.0)
+    rx.close()
+    tx.close()
+
+    latencies = sorted(tracker.latencies)
+    expected = len(latencies) + tracker.missing()
+    report = {
+        "red": args.red,
+        "green": args.green,
+        "pattern": args.pattern,
+        "target_rate": args.rate,
+        "binary": args.binary,
+        "duration_s": round(send_time, 3),
+        "events_sent": sent_events,
+        "datagrams_sent": datagrams,
+        "send_errors": send_errors,
+        "achieved_rate": round(sent_events / send_time, 1) if send_time else 0.0,
+        "replies_expected": expected,
+        "replies_received": len(latencies),
+        "replies_missing": tracker.missing(),
+        "replies_unexpected": tracker.unexpected,
+        "game_over_received": tracker.game_over,
+        "latency_ms": {
+            name: (round(percentile(latencies, pct) * 1000, 3) if latencies else None)
+            for name, pct in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+    }
+    return report
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Open-loop UDP load generator for Photon")
+    p.add_argument("--target-ip", default="127.0.0.1", help="host running ui_app.py")
+    p.add_argument("--game-port", type=int, default=7501, help="port the game receives hits on")
+    p.add_argument("--reply-port", type=int, default=7500, help="port the game broadcasts replies to")
+    p.add_argument("--red", type=int, default=2, help="red players")
+    p.add_argument("--green", type=int, default=2, help="green players")
+    p.add_argument("--red-start", type=int, default=1, help="first red equipment id")
+    p.add_argument("--green-start", type=int, default=101, help="first green equipment id")
+    p.add_argument("--rate", type=float, default=50.0, help="target events per second")
+    p.add_argument("--duration", type=float, default=30.0, help="seconds to send for")
+    p.add_argument("--pattern", choices=("steady", "burst", "ramp"), default="steady")
+    p.add_argument("--burst-factor", type=float, default=5.0, help="rate multiplier during a burst")
+    p.add_argument("--burst-length", type=float, default=1.0, help="seconds per burst")
+    p.add_argument("--burst-period", type=float, default=5.0, help="seconds between burst starts")
+    p.add_argument("--friendly-fire", type=float, default=0.05, help="fraction of friendly-fire hits")
+    p.add_argument("--base-hits", type=float, default=0.02, help="fraction of base hits")
+    p.add_argument("--binary", action="store_true", help="send wire.py binary frames (game needs wire_format='binary')")
+    p.add_argument("--events-per-datagram", type=int, default=16, help="events packed per binary frame")
+    p.add_argument("--wait-start", action="store_true", help="wait for the game's 202 before sending")
+    p.add_argument("--grace", type=float, default=1.0, help="seconds to wait for late replies")
+    p.add_argument("--tick", type=float, default=0.001, help="scheduler sleep between send rounds")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--json", dest="json_path", default=None, help="also write the report here")
+    return p.parse_args(argv)
+
+
+def check_teams(args):
+    # Both teams need players, and an ID may only mean one thing
+    ranges = {}
+    for team in ("red", "green"):
+        size = getattr(args, team)
+        if size < 1:
+            raise SystemExit(f"--{team} must be at least 1 (got {size})")
+        start = getattr(args, f"{team}_start")
+        ranges[team] = set(range(start, start + size))
+        if ranges[team] & (CONTROL_CODES | {RED_BASE, GREEN_BASE}):
+            raise SystemExit(f"--{team}-start range overlaps a base or control code")
+    overlap = ranges["red"] & ranges["green"]
+    if overlap:
+        raise SystemExit(f"red and green equipment IDs overlap ({min(overlap)}..{max(overlap)}); "
+                         f"move --red-start or --green-start")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    check_teams(args)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# metrics.py
+import json
+import os
+import time
+from typing import Callable, Dict
+
+# Histogram layout: values in microseconds, 8 buckets per power of two
+# (about 9% resolution) from 1us up to ~2^40us
+SUB_BUCKETS = 8
+BUCKETS = SUB_BUCKETS * 40
+
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+def _bucket(us: int) -> int:
+    if us < SUB_BUCKETS:
+        return us
+    n = us.bit_length()
+    return min(BUCKETS - 1, (n - 3) * SUB_BUCKETS + (us >> (n - 4)) - SUB_BUCKETS)
+
+
+def _bucket_upper(index: int) -> int:
+    # Largest value (us) that lands in `index`
+    if index < SUB_BUCKETS:
+        return index
+    n = index // SUB_BUCKETS + 3
+    m = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((m + 1) << (n - 4)) - 1
+
+
+class Histogram:
+    # Fixed log-scale buckets: record() is O(1) with no allocation, percentiles
+    # are only worked out when someone looks
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        self.counts[_bucket(ns // 1000)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, p: float) -> float:
+        # -> milliseconds (bucket upper bound, capped at the true max)
+        if not self.count:
+            return 0.0
+        target = max(1, int(p * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(_bucket_upper(index) * 1000, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        out = {"count": self.count,
+               "mean": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0}
+        for name, p in PERCENTILES:
+            out[name] = round(self.percentile(p), 3)
+        out["max"] = round(self.max_ns / 1e6, 3)
+        return out
+
+
+class Metrics:
+    # Per-stage latency histograms, counters and queue-depth gauges for the hot path
+    # Everything is recorded on the Tk thread. Call sites check `enabled` before
+    # reading the clock, so a disabled Metrics costs one attribute test per batch.
+    # Stage times are in nanoseconds (time.perf_counter_ns()); summaries in ms.
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, list] = {}           # name -> [last, max]
+        self.sources: Dict[str, Callable[[], dict]] = {}
+        self.started = time.time()
+
+    def observe(self, stage: str, ns: int) -> None:
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = Histogram()
+        hist.record(ns)
+
+    def since(self, stage: str, start_ns: int) -> int:
+        # Records the time since start_ns and returns "now" for chaining stages
+        now = time.perf_counter_ns()
+        self.observe(stage, now - start_ns)
+        return now
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value) -> None:
+        g = self.gauges.get(name)
+        if g is None:
+            self.gauges[name] = [value, value]
+        else:
+            g[0] = value
+            if value > g[1]:
+                g[1] = value
+
+    def add_source(self, name: str, stats: Callable[[], dict]) -> None:
+        # Stats owned elsewhere (decoder, UDP sender, ...) included in snapshots
+        self.sources[name] = stats
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.counters.clear()
+        self.gauges.clear()
+        self.started = time.time()
+
+    def snapshot(self) -> dict:
+        sources = {}
+        for name, stats in self.sources.items():
+            try:
+                sources[name] = stats()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        return {
+            "started": self.started,
+            "seconds": round(time.time() - self.started, 3),
+            "stages_ms": {name: h.summary() for name, h in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": {name: {"last": g[0], "max": g[1]} for name, g in sorted(self.gauges.items())},
+            "sources": sources,
+        }
+
+    def format(self) -> str:
+        # Compact text for the play screen overlay
+        snap = self.snapshot()
+        lines = [f"{'stage (ms)':<14}{'n':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}"]
+        for name, s in snap["stages_ms"].items():
+            lines.append(f"{name:<14}{s['count']:>7}{s['p50']:>8.2f}{s['p95']:>8.2f}"
+                         f"{s['p99']:>8.2f}{s['max']:>8.2f}")
+        if snap["gauges"]:
+            lines.append("")
+            for name, g in snap["gauges"].items():
+                lines.append(f"{name:<20} {g['last']:>6} (max {g['max']})")
+        if snap["counters"]:
+            lines.append("")
+            lines.append("  ".join(f"{k}={v}" for k, v in snap["counters"].items()))
+        for name, stats in snap["sources"].items():
+            lines.append(f"{name}: " + " ".join(f"{k}={v}" for k, v in stats.items()))
+        return "\n".join(lines)
+
+    def dump(self, metrics_dir: str, prefix: str = "metrics") -> str:
+        # Writes the snapshot as JSON and returns the path
+        os.makedirs(metrics_dir, exist_ok=True)
+        path = os.path.join(metrics_dir, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+# Shared disabled instance for components created without one
+DISABLED = Metrics(enabled=False)
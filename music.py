@@ -0,0 +1,176 @@
+# music.py
+import io
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+# pygame is slow to import, so it's loaded on first use (ui_app warms it up on
+# a startup thread while the splash is showing)
+pygame = None
+
+
+def load_pygame():
+    # -> the pygame module, or None if it isn't installed
+    global pygame
+    if pygame is None:
+        try:
+            import pygame
+        except Exception:
+            return None
+    return pygame
+
+
+class ShuffleBag:
+    # Random order without repeats: every track plays once before any repeats,
+    # and a new round never starts with the track that just played
+
+    def __init__(self, items=(), rng=None):
+        self.rng = rng or random.Random()
+        self.items = list(items)
+        self.last = None
+        self._bag = []
+        self._played = set()
+
+    def reset(self, items) -> None:
+        # Catalog changed: tracks already played this round stay played
+        self.items = list(items)
+        self._bag = [i for i in self.items if i not in self._played]
+        self.rng.shuffle(self._bag)
+
+    def next(self):
+        if not self.items:
+            return None
+        if not self._bag:
+            self._played.clear()
+            self._bag = list(self.items)
+            self.rng.shuffle(self._bag)
+            if len(self._bag) > 1 and self._bag[-1] == self.last:
+                self._bag[0], self._bag[-1] = self._bag[-1], self._bag[0]
+        item = self._bag.pop()
+        self._played.add(item)
+        self.last = item
+        return item
+
+
+class MusicPlayer:
+    # Playlist over the AssetStore's music catalog
+    # The next track is picked and read into memory on a background thread ahead
+    # of time (prefetch() runs during the countdown), so starting it on the Tk
+    # thread is only a load from RAM + play(). A poll every `poll_ms` moves on to
+    # the next track when one finishes, and prefetches the one after that.
+
+    def __init__(self, widget, assets, poll_ms: int = 500, rng=None):
+        self.widget = widget
+        self.assets = assets
+        self.poll_ms = poll_ms
+        self.bag = ShuffleBag(rng=rng)
+        self.current = None         # path of the track playing now
+        self.playing = False        # a track is (or should be) playing
+        self.on_track = None        # on_track(path) when a track starts
+        self.on_error = None        # on_error(path) when a track can't be played
+        self._catalog_version = None
+        self._next = None           # Future -> (path, bytes) or None for an empty catalog
+        self._data = None           # keeps the playing track's buffer alive
+        self._failures = 0
+        self._after_id = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+
+    def init(self) -> bool:
+        # Starts the mixer if ui_app's startup thread hasn't already
+        if load_pygame() is None:
+            return False
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            return True
+        except Exception as e:
+            print(f"[WARNING] Could not initialize audio, music disabled.\n{e}")
+            return False
+
+    def prefetch(self) -> None:
+        # Pick and read the next track in the background (no-op if one is pending)
+        if self._next is None:
+            self._next = self._executor.submit(self._fetch)
+
+    def _fetch(self):
+        # Music thread only: the bag is never touched anywhere else
+        self.assets.refresh_music()
+        if self.assets.music_version != self._catalog_version:
+            self._catalog_version = self.assets.music_version
+            self.bag.reset(self.assets.tracks)
+        path = self.bag.next()
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return path, f.read()
+
+    def start(self, on_track=None, on_error=None) -> None:
+        # Never blocks: plays the prefetched track now, or as soon as it's read
+        self.on_track = on_track
+        self.on_error = on_error
+        self.playing = True
+        self._failures = 0
+        self.prefetch()
+        self._poll()
+
+    def _poll(self):
+        self._after_id = None
+        if not self.playing:
+            return
+        if self.current is None or not pygame.mixer.music.get_busy():
+            if self._next is not None and self._next.done():
+                self._play_next()
+        if self.playing:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _play_next(self):
+        future, self._next = self._next, None
+        try:
+            item = future.result()
+        except Exception:
+            item = None
+            self._failures += 1
+        if item is None and self._failures == 0:
+            self.playing = False        # empty catalog
+            return
+        self.prefetch()
+
+        if item is not None:
+            path, data = item
+            try:
+                self._data = io.BytesIO(data)
+                pygame.mixer.music.load(self._data, os.path.splitext(path)[1][1:].lower())
+                pygame.mixer.music.play()
+                self.current = path
+                self._failures = 0
+                if self.on_track:
+                    self.on_track(path)
+                return
+            except Exception:
+                self._failures += 1
+                if self.on_error:
+                    self.on_error(path)
+
+        # Every track failed in a row: give up instead of retrying forever
+        if self._failures > max(1, len(self.bag.items)):
+            self.playing = False
+
+    def stop(self) -> None:
+        # The prefetched track is kept for the next start()
+        self.playing = False
+        self.current = None
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if pygame is not None and pygame.mixer.get_init():
+            try:
+                pygame.mixer.music.stop()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
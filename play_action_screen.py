@@ -1,12 +1,18 @@
 import os
-import random
+import time
 import tkinter as tk
 from tkinter import messagebox
 
-try:
-    import pygame
-except Exception:
-    pygame = None
+from score_engine import ScoreEngine
+from scoreboard_render import RenderScheduler, ListboxRows, LabelText
+from play_log import PlayLog
+from journal import OUTCOMES, IGNORED
+from assets import AssetStore
+from music import MusicPlayer
+from game_clock import GameClock
+from metrics import DISABLED
+from config import default_teams
+from roster import team_base_codes
 
 # Sprint 4 Play Action Screen
 # Handles countdown, 6-minute timer, scoring logic,
@@ -23,6 +29,15 @@ FONT = "Courier"
 
 # Sprint 4 requirement: total gameplay duration is 6 minutes
 GAME_SECONDS = 6 * 60  # 6 minutes
+COUNTDOWN_SECONDS = 30
+
+# F3 stats overlay refresh rate
+STATS_REFRESH_MS = 500
+
+BASE_ICON = "baseicon.jpg"
+
+# Team panels per row before wrapping
+TEAM_COLUMNS = 4
 
 
 def make_button(parent, text, cmd, color=GOLD, width=16):
@@ -38,37 +53,64 @@ def make_button(parent, text, cmd, color=GOLD, width=16):
 
 
 class PlayActionScreen(tk.Frame):
-    def __init__(self, master, red_players, green_players, udp=None, on_back=None):
+    def __init__(self, master, teams, udp=None, on_back=None, render_hz=20,
+                 play_log_lines=200, play_log_capacity=1000, journal=None, on_game_end=None, assets=None, music=None,
+                 metrics=DISABLED, team_configs=None):
         super().__init__(master, bg=BG)
+        # teams: {team: [PlayerRow, ...]} from the entry screen
+        # team_configs: config.TeamConfig list for colors and base codes (None = red vs green)
+        configs = {t.name: t for t in (team_configs if team_configs is not None else default_teams())}
+        self.team_colors = {team: configs[team].color if team in configs else FG for team in teams}
         self.on_back = on_back
+        # Shared, already decoded images + music catalog (ui_app loads it at startup)
+        self.assets = assets if assets is not None else AssetStore()
+        # Shared playlist, so tracks don't repeat from one game to the next
+        self.music = music if music is not None else MusicPlayer(self, self.assets)
+        # Called with a score_engine.GameResult when the game ends
+        self.on_game_end = on_game_end
         self.udp = udp
-
-        self.countdown_value = 30
+        self.journal = journal
+        self.metrics = metrics
+        # perf_counter_ns of the first hit applied since the last frame (metrics only)
+        self._applied_ns = None
+        self.stats_label = None
+        self._stats_after = None
+
+        self.countdown_value = COUNTDOWN_SECONDS
         self.game_seconds_left = GAME_SECONDS
         self.countdown_running = False
+        # Both run off absolute monotonic deadlines, so Tk delays never add up
+        self.countdown_clock = GameClock(self, COUNTDOWN_SECONDS, self.tick_countdown, self.countdown_done)
+        self.game_clock = GameClock(self, GAME_SECONDS, self.tick_game_timer, self.end_game)
         self.game_running = False
         self.receiver_started = False
 
-        self.red_players = [self.make_player_dict(p) for p in red_players]
-        self.green_players = [self.make_player_dict(p) for p in green_players]
+        # All scoring state lives in the engine, this screen just draws it
+        self.engine = ScoreEngine(teams, base_codes=team_base_codes(configs.values()))
+        if self.journal:
+            # Lets replay.py rebuild this game from the journal
+            self.journal.write_meta(roster=self.engine.roster(),
+                                    base_codes={str(k): v for k, v in self.engine.base_codes.items()})
+
+        # team -> [lowest, highest] leaderboard rank touched since the last frame
+        self.dirty_ranks = {}
 
         self.base_icon = None
         self.music_ready = False
 
         self.build_ui()
+        self.play_log = PlayLog(self.play_text, visible=play_log_lines, capacity=play_log_capacity)
         self.load_base_icon()
         self.setup_music()
-        self.refresh_lists()
-        self.update_team_totals()
 
-    def make_player_dict(self, player):
-        return {
-            "player_id": player.player_id,
-            "codename": player.codename,
-            "equipment_id": player.equipment_id,
-            "score": 0,
-            "base_hits": 0
-        }
+        # Score changes only mark the board dirty; it redraws at most render_hz times a second
+        self.team_rows = {team: ListboxRows(listbox) for team, listbox in self.team_lists.items()}
+        self.team_total_texts = {team: LabelText(label) for team, label in self.team_total_labels.items()}
+        self.renderer = RenderScheduler(self, self.render_frame, hz=render_hz)
+        self.add_play_event("waiting for game start...")
+        self.render_frame()
+
+        self._f3_binding = self.winfo_toplevel().bind("<F3>", self.toggle_stats, add="+")
 
     def build_ui(self):
         self.pack(fill="both", expand=True)
@@ -106,54 +148,42 @@ class PlayActionScreen(tk.Frame):
 
         content = tk.Frame(self, bg=BG)
         content.grid(row=2, column=0, sticky="nsew", padx=16, pady=10)
-        content.grid_columnconfigure(0, weight=1)
-        content.grid_columnconfigure(1, weight=1)
-        content.grid_columnconfigure(2, weight=2)
-        content.grid_rowconfigure(0, weight=1)
-
-        red_wrap = tk.Frame(content, bg=BG_PANEL,
-                            highlightthickness=1, highlightbackground=RED_NEON)
-        red_wrap.grid(row=0, column=0, sticky="nsew", padx=(0, 8))
-        red_wrap.grid_rowconfigure(2, weight=1)
-        red_wrap.grid_columnconfigure(0, weight=1)
-
-        tk.Label(red_wrap, text="< RED TEAM >", font=(FONT, 11, "bold"),
-                 fg=RED_NEON, bg=BG_PANEL).grid(row=0, column=0, pady=(10, 4))
-
-        self.red_total_label = tk.Label(red_wrap, text="TOTAL: 0",
-                                        font=(FONT, 10, "bold"),
-                                        fg=FG, bg=BG_PANEL)
-        self.red_total_label.grid(row=1, column=0, pady=(0, 4))
-
-        self.red_list = tk.Listbox(red_wrap, font=(FONT, 9),
-                                   bg=BG_PANEL, fg=RED_NEON,
-                                   selectbackground=RED_NEON, selectforeground=BG,
-                                   relief="flat", borderwidth=0, highlightthickness=0)
-        self.red_list.grid(row=2, column=0, sticky="nsew", padx=8, pady=(0, 10))
-
-        green_wrap = tk.Frame(content, bg=BG_PANEL,
-                              highlightthickness=1, highlightbackground=GREEN_NEON)
-        green_wrap.grid(row=0, column=1, sticky="nsew", padx=8)
-        green_wrap.grid_rowconfigure(2, weight=1)
-        green_wrap.grid_columnconfigure(0, weight=1)
-
-        tk.Label(green_wrap, text="< GREEN TEAM >", font=(FONT, 11, "bold"),
-                 fg=GREEN_NEON, bg=BG_PANEL).grid(row=0, column=0, pady=(10, 4))
-
-        self.green_total_label = tk.Label(green_wrap, text="TOTAL: 0",
-                                          font=(FONT, 10, "bold"),
-                                          fg=FG, bg=BG_PANEL)
-        self.green_total_label.grid(row=1, column=0, pady=(0, 4))
-
-        self.green_list = tk.Listbox(green_wrap, font=(FONT, 9),
-                                     bg=BG_PANEL, fg=GREEN_NEON,
-                                     selectbackground=GREEN_NEON, selectforeground=BG,
-                                     relief="flat", borderwidth=0, highlightthickness=0)
-        self.green_list.grid(row=2, column=0, sticky="nsew", padx=8, pady=(0, 10))
+        columns = max(1, min(TEAM_COLUMNS, len(self.team_colors)))
+        panel_rows = (len(self.team_colors) - 1) // columns + 1
+        for col in range(columns):
+            content.grid_columnconfigure(col, weight=1)
+        content.grid_columnconfigure(columns, weight=2)
+
+        # one panel per team (wrapping after TEAM_COLUMNS), play-by-play on the right
+        self.team_lists = {}
+        self.team_total_labels = {}
+        for i, (team, color) in enumerate(self.team_colors.items()):
+            row, col = divmod(i, columns)
+            content.grid_rowconfigure(row, weight=1)
+            wrap = tk.Frame(content, bg=BG_PANEL,
+                            highlightthickness=1, highlightbackground=color)
+            wrap.grid(row=row, column=col, sticky="nsew",
+                      padx=(0 if col == 0 else 8, 8), pady=(0 if row == 0 else 8, 0))
+            wrap.grid_rowconfigure(2, weight=1)
+            wrap.grid_columnconfigure(0, weight=1)
+
+            tk.Label(wrap, text=f"< {team.upper()} TEAM >", font=(FONT, 11, "bold"),
+                     fg=color, bg=BG_PANEL).grid(row=0, column=0, pady=(10, 4))
+
+            self.team_total_labels[team] = tk.Label(wrap, text="TOTAL: 0",
+                                                    font=(FONT, 10, "bold"),
+                                                    fg=FG, bg=BG_PANEL)
+            self.team_total_labels[team].grid(row=1, column=0, pady=(0, 4))
+
+            self.team_lists[team] = tk.Listbox(wrap, font=(FONT, 9),
+                                               bg=BG_PANEL, fg=color,
+                                               selectbackground=color, selectforeground=BG,
+                                               relief="flat", borderwidth=0, highlightthickness=0)
+            self.team_lists[team].grid(row=2, column=0, sticky="nsew", padx=8, pady=(0, 10))
 
         play_wrap = tk.Frame(content, bg=BG_PANEL,
                              highlightthickness=1, highlightbackground=DIM)
-        play_wrap.grid(row=0, column=2, sticky="nsew", padx=(8, 0))
+        play_wrap.grid(row=0, column=columns, rowspan=panel_rows, sticky="nsew", padx=(8, 0))
         play_wrap.grid_rowconfigure(1, weight=1)
         play_wrap.grid_columnconfigure(0, weight=1)
 
@@ -165,96 +195,137 @@ class PlayActionScreen(tk.Frame):
                                  insertbackground=GOLD,
                                  relief="flat", borderwidth=0)
         self.play_text.grid(row=1, column=0, sticky="nsew", padx=12, pady=(0, 10))
-        self.play_text.insert("end", "> waiting for game start...\n")
         self.play_text.config(state="disabled")
 
     def load_base_icon(self):
-        icon_path = os.path.join(os.path.dirname(__file__), "assets", "baseicon.jpg")
-        if os.path.exists(icon_path):
-            try:
-                self.base_icon = tk.PhotoImage(file=icon_path)
-            except Exception:
-                self.base_icon = None
-
-    def setup_music(self):
-        if pygame is None:
-            return
+        # Same PhotoImage for every game screen; no disk access after startup
         try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-            self.music_ready = True
+            self.base_icon = self.assets.photo(BASE_ICON)
         except Exception:
-            self.music_ready = False
+            self.base_icon = None
+
+    def setup_music(self):
+        self.music_ready = self.music.init()
 
     def play_random_music(self):
         if not self.music_ready:
             self.add_play_event("music unavailable")
             return
 
-        music_dir = os.path.join(os.path.dirname(__file__), "assets", "music")
-        if not os.path.isdir(music_dir):
+        # Catalog was refreshed by the prefetch during the countdown
+        if not self.assets.has_music_dir:
             self.add_play_event("music folder not found")
             return
-
-        tracks = []
-        for name in os.listdir(music_dir):
-            if name.lower().endswith(".mp3"):
-                tracks.append(os.path.join(music_dir, name))
-
-        if not tracks:
+        if not self.assets.tracks:
             self.add_play_event("no mp3 tracks found")
             return
 
-        track = random.choice(tracks)
-        try:
-            pygame.mixer.music.load(track)
-            pygame.mixer.music.play()
-            self.add_play_event(f'playing track: {os.path.basename(track)}')
-        except Exception:
-            self.add_play_event("could not play music track")
+        # Plays the prefetched track (or the moment it's read) and keeps going
+        self.music.start(
+            on_track=lambda track: self.add_play_event(f'playing track: {os.path.basename(track)}'),
+            on_error=lambda track: self.add_play_event("could not play music track"))
 
     def stop_music(self):
         if self.music_ready:
-            try:
-                pygame.mixer.music.stop()
-            except Exception:
-                pass
-
-    def refresh_lists(self):
-        self.red_list.delete(0, "end")
-        self.green_list.delete(0, "end")
+            self.music.stop()
+
+    def render_frame(self):
+        # One frame: rewrite only the rows and totals that changed, then
+        # draw any new play-by-play lines in one insert
+        m = self.metrics
+        if not m.enabled:
+            self.refresh_lists()
+            self.update_team_totals()
+            self.play_log.flush()
+            return
 
-        self.red_players.sort(key=lambda p: p["score"], reverse=True)
-        self.green_players.sort(key=lambda p: p["score"], reverse=True)
+        t = time.perf_counter_ns()
+        self.refresh_lists()
+        t = m.since("refresh_lists", t)
+        self.update_team_totals()
+        t = m.since("team_totals", t)
+        m.gauge("play_log_pending", len(self.play_log.pending))
+        self.play_log.flush()
+        t = m.since("play_log", t)
+        if self._applied_ns is not None:
+            # Hit applied -> visible on the board
+            m.observe("hit_to_frame", t - self._applied_ns)
+            self._applied_ns = None
+
+    def toggle_stats(self, event=None):
+        # F3: latency/queue overlay in the corner of the screen
+        if self.stats_label is not None:
+            self.stats_label.destroy()
+            self.stats_label = None
+            if self._stats_after is not None:
+                self.after_cancel(self._stats_after)
+                self._stats_after = None
+            return
+        self.stats_label = tk.Label(self, font=(FONT, 9), fg=GOLD, bg=BG_PANEL,
+                                    justify="left", anchor="nw", padx=8, pady=6,
+                                    highlightthickness=1, highlightbackground=GOLD)
+        self.stats_label.place(relx=1.0, x=-20, y=60, anchor="ne")
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        self._stats_after = None
+        if self.stats_label is None:
+            return
+        if self.metrics.enabled:
+            text = self.metrics.format()
+        else:
+            text = "metrics disabled (AppConfig.metrics_enabled)"
+        self.stats_label.config(text=text)
+        self._stats_after = self.after(STATS_REFRESH_MS, self.refresh_stats)
 
-        for p in self.red_players:
-            base_mark = " [BASE]" if p["base_hits"] > 0 else ""
-            self.red_list.insert("end", f'{p["codename"]} | {p["score"]} pts{base_mark}')
+    @staticmethod
+    def player_row_text(p):
+        base_mark = " [BASE]" if p.base_hits > 0 else ""
+        return f"{p.codename} | {p.score} pts{base_mark}"
 
-        for p in self.green_players:
-            base_mark = " [BASE]" if p["base_hits"] > 0 else ""
-            self.green_list.insert("end", f'{p["codename"]} | {p["score"]} pts{base_mark}')
+    def refresh_lists(self):
+        # Leaderboards are already in rank order; only redraw the rank span
+        # that moved since the last frame (or everything on the first draw)
+        for team, rows in self.team_rows.items():
+            board = self.engine.leaderboards[team]
+            span = self.dirty_ranks.pop(team, None)
+            if span is None:
+                if not rows.rows:
+                    rows.update([self.player_row_text(p) for p in board])
+                continue
+            lo, hi = span
+            rows.update_range(lo, [self.player_row_text(p) for p in board.span(lo, hi)])
+
+    def mark_ranks_dirty(self, rank_changes):
+        for change in rank_changes:
+            team = change.record.team
+            lo = min(change.old_rank, change.new_rank)
+            hi = max(change.old_rank, change.new_rank)
+            span = self.dirty_ranks.get(team)
+            if span is None:
+                self.dirty_ranks[team] = [lo, hi]
+            else:
+                span[0] = min(span[0], lo)
+                span[1] = max(span[1], hi)
 
     def update_team_totals(self):
-        red_total = sum(p["score"] for p in self.red_players)
-        green_total = sum(p["score"] for p in self.green_players)
-
-        self.red_total_label.config(text=f"TOTAL: {red_total}")
-        self.green_total_label.config(text=f"TOTAL: {green_total}")
+        for team, text in self.team_total_texts.items():
+            text.set(f"TOTAL: {self.engine.team_total(team)}")
 
     def add_play_event(self, text):
-        self.play_text.config(state="normal")
-        self.play_text.insert("end", f"> {text}\n")
-        self.play_text.see("end")
-        self.play_text.config(state="disabled")
+        self.play_log.add(text)
+        self.renderer.mark_dirty()
 
     def start_countdown(self):
         if not self.countdown_running:
             self.countdown_running = True
-            self.tick_countdown()
+            if self.music_ready:
+                # Pick and read the first track while the countdown runs
+                self.music.prefetch()
+            self.countdown_clock.start()
 
-    def tick_countdown(self):
-        val = self.countdown_value
+    def tick_countdown(self, val):
+        self.countdown_value = val
 
         if val > 10:
             color = GOLD
@@ -263,118 +334,118 @@ class PlayActionScreen(tk.Frame):
         else:
             color = GREEN_NEON
 
-        if val > 0:
-            self.timer_label.config(text=f"GAME STARTS IN: {val}", fg=color)
-            self.countdown_value -= 1
-            self.after(1000, self.tick_countdown)
-        else:
-            self.timer_label.config(text="GAME IN PROGRESS: 06:00", fg=GREEN_NEON)
-            self.add_play_event("game started")
-            self.broadcast_code(202)
-            self.play_random_music()
-            self.start_game_timer()
+        self.timer_label.config(text=f"GAME STARTS IN: {val}", fg=color)
+
+    def countdown_done(self):
+        # Start code goes out before anything else this tick
+        self.broadcast_code(202)
+        self.countdown_value = 0
+        self.start_game_timer()
+        self.add_play_event("game started")
+        self.play_random_music()
 
     def start_game_timer(self):
         self.game_running = True
-        self.tick_game_timer()
-
-    def tick_game_timer(self):
-        if not self.game_running:
-            return
-
-        minutes = self.game_seconds_left // 60
-        seconds = self.game_seconds_left % 60
+        self.engine.start_game()
+        # Six minutes from the countdown's deadline, not from when this ran
+        self.game_clock.start(at=self.countdown_clock.deadline)
+
+    def tick_game_timer(self, seconds_left):
+        self.game_seconds_left = seconds_left
+        minutes = seconds_left // 60
+        seconds = seconds_left % 60
         self.timer_label.config(text=f"GAME IN PROGRESS: {minutes:02d}:{seconds:02d}", fg=GREEN_NEON)
 
-        if self.game_seconds_left > 0:
-            self.game_seconds_left -= 1
-            self.after(1000, self.tick_game_timer)
-        else:
-            self.end_game()
-
     def end_game(self):
+        # UDP layer repeats 221 (AppConfig.udp_code_repeats); sent first so the
+        # journal, redraw and music below can't delay it
+        self.broadcast_code(221)
         self.game_running = False
+        self.game_seconds_left = 0
+        clock = self.game_clock.stats()
+        print(f"[INFO] Game clock: {clock}")
+        if self.journal:
+            self.journal.write_meta(final_scores=self.engine.scores(), totals=self.engine.totals,
+                                    clock=clock)
         self.timer_label.config(text="GAME OVER", fg=RED_NEON)
         self.add_play_event("game ended")
+        self.renderer.flush()
         self.stop_music()
-        self.broadcast_code(221)
-        self.broadcast_code(221)
-        self.broadcast_code(221)
+
+        # Results are saved in the background, after 221 is already queued
+        if self.on_game_end:
+            self.on_game_end(self.engine.result())
 
     def broadcast_code(self, code):
         if self.udp and hasattr(self.udp, "send_equipment_id"):
+            m = self.metrics
+            t = time.perf_counter_ns() if m.enabled else 0
             try:
                 self.udp.send_equipment_id(code)
             except Exception:
                 pass
+            if m.enabled:
+                m.since("broadcast", t)
 
-    def find_player_by_equipment(self, equipment_id):
-        for p in self.red_players + self.green_players:
-            if p["equipment_id"] == equipment_id:
-                return p
-        return None
-
-    def get_team_name(self, equipment_id):
-        for p in self.red_players:
-            if p["equipment_id"] == equipment_id:
-                return "Red"
-        for p in self.green_players:
-            if p["equipment_id"] == equipment_id:
-                return "Green"
-        return None
-
-    def record_hit(self, attacker_equipment_id, target_equipment_id):
+    def apply_events(self, events):
+        # Apply a whole batch of (attacker, target, addr) hits; the board redraws on the next frame
+        journal = self.journal
         if not self.game_running:
+            if journal:
+                for first, second, addr in events:
+                    journal.record(addr, first, second, IGNORED)
+            if self.metrics.enabled:
+                self.metrics.count("hits_ignored", len(events))
             return
 
-        attacker = self.find_player_by_equipment(attacker_equipment_id)
-        target = self.find_player_by_equipment(target_equipment_id)
+        m = self.metrics
+        t = time.perf_counter_ns() if m.enabled else 0
+        for first, second, addr in events:
+            result = self.engine.apply(first, second)
+            if journal:
+                journal.record(addr, first, second, OUTCOMES[result.kind])
+            self.show_result(result)
+        if m.enabled:
+            # Scoring, journal and broadcasts for the whole batch
+            m.since("apply_batch", t)
+            m.count("hits", len(events))
+            if self._applied_ns is None:
+                self._applied_ns = t
 
-        if not attacker or not target:
-            self.add_play_event(f"unknown hit event: {attacker_equipment_id} -> {target_equipment_id}")
+    def record_hit(self, attacker_equipment_id, target_equipment_id):
+        if not self.game_running:
             return
 
-        attacker_team = self.get_team_name(attacker_equipment_id)
-        target_team = self.get_team_name(target_equipment_id)
-
-        if attacker_team == target_team:
-            attacker["score"] -= 10
-            target["score"] -= 10
-            self.add_play_event(f'{attacker["codename"]} hit teammate {target["codename"]} (friendly fire)')
-            self.broadcast_code(attacker_equipment_id)
-            self.broadcast_code(target_equipment_id)
-        else:
-            attacker["score"] += 10
-            self.add_play_event(f'{attacker["codename"]} tagged {target["codename"]} (+10)')
-            self.broadcast_code(target_equipment_id)
-
-        self.refresh_lists()
-        self.update_team_totals()
+        self.show_result(self.engine.apply_hit(attacker_equipment_id, target_equipment_id))
 
     def record_base_hit(self, attacker_equipment_id, base_code):
         if not self.game_running:
             return
 
-        attacker = self.find_player_by_equipment(attacker_equipment_id)
-        if not attacker:
-            self.add_play_event(f"unknown base hit by hw:{attacker_equipment_id}")
-            return
+        self.show_result(self.engine.apply_base_hit(attacker_equipment_id, base_code))
 
-        attacker_team = self.get_team_name(attacker_equipment_id)
+    def show_result(self, result):
+        # Draw one engine change set: log line, UDP replies, scoreboard
+        self.add_play_event(result.message)
+        for code in result.broadcast:
+            self.broadcast_code(code)
 
-        if base_code == 53 and attacker_team == "Green":
-            attacker["score"] += 100
-            attacker["base_hits"] += 1
-            self.add_play_event(f'{attacker["codename"]} scored on red base (+100)')
-        elif base_code == 43 and attacker_team == "Red":
-            attacker["score"] += 100
-            attacker["base_hits"] += 1
-            self.add_play_event(f'{attacker["codename"]} scored on green base (+100)')
-        else:
-            self.add_play_event(f'{attacker["codename"]} triggered base code {base_code}, but no score awarded')
+        if result.scored:
+            self.mark_ranks_dirty(result.rank_changes)
 
-        self.refresh_lists()
-        self.update_team_totals()
+    def destroy(self):
+        try:
+            self.winfo_toplevel().unbind("<F3>", self._f3_binding)
+        except Exception:
+            pass
+        if self._stats_after is not None:
+            self.after_cancel(self._stats_after)
+        self.countdown_clock.cancel()
+        self.game_clock.cancel()
+        self.renderer.cancel()
+        if self.journal:
+            self.journal.close()
+        super().destroy()
 
     def go_back(self):
         if self.game_running:
@@ -0,0 +1,49 @@
+# play_log.py
+from collections import deque
+
+
+class PlayLog:
+    # Play-by-play backed by a fixed-size ring buffer
+    # add() is just a deque append; flush() writes everything pending to the
+    # Text widget in one insert and trims it to the last `visible` lines
+
+    def __init__(self, text_widget, visible: int = 200, capacity: int = 1000):
+        self.text = text_widget
+        self.visible = visible
+        self.history = deque(maxlen=capacity)   # last `capacity` events of the game
+        self.pending = deque(maxlen=visible)    # lines not drawn yet
+        self.shown = 0                          # lines currently in the widget
+        self.dropped = 0                        # lines that never made it on screen
+
+    def __len__(self):
+        return len(self.history)
+
+    def add(self, text) -> None:
+        line = f"> {text}\n"
+        self.history.append(line)
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(line)
+
+    def lines(self) -> list:
+        return [line[2:-1] for line in self.history]
+
+    def flush(self) -> int:
+        # Returns how many lines were drawn
+        if not self.pending:
+            return 0
+
+        count = len(self.pending)
+        chunk = "".join(self.pending)
+        self.pending.clear()
+
+        self.text.config(state="normal")
+        self.text.insert("end", chunk)
+        self.shown += count
+        extra = self.shown - self.visible
+        if extra > 0:
+            self.text.delete("1.0", f"{extra + 1}.0")
+            self.shown = self.visible
+        self.text.see("end")
+        self.text.config(state="disabled")
+        return count
@@ -0,0 +1,147 @@
+# profiling.py
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+# ui_app only imports this module when a game is actually profiled
+TRACE_FRAMES = 10
+TOP_LINES = 40
+# From 3.12 cProfile sits on the process-wide sys.monitoring: only one profile
+# can be enabled at a time, and it sees every thread. So 3.12+ runs a single
+# profile (the -tk files then include the receiver thread too).
+SEPARATE_THREAD_PROFILES = sys.version_info < (3, 12)
+# How long stop() waits for the receiver thread to let go of its profile (s)
+RECEIVER_STOP_TIMEOUT = 2.0
+
+
+class GameProfiler:
+    # Profiles one game, countdown through end_game:
+    #   <prefix>-tk.prof / -udp.prof   cProfile of the Tk thread and UDP receiver thread
+    #                                  (one -tk.prof for every thread on 3.12+)
+    #   <prefix>-*.txt                 top functions by cumulative time
+    #   <prefix>-mem-NN.tracemalloc    tracemalloc snapshot every `snapshot_interval` s
+    #   <prefix>-mem.txt               biggest allocation growth, first -> last snapshot
+    # .prof files open with pstats/snakeviz, snapshots with tracemalloc.Snapshot.load.
+    # Nothing runs unless a game is being profiled.
+
+    def __init__(self, profile_dir: str, snapshot_interval: float = 30.0):
+        self.profile_dir = profile_dir
+        self.snapshot_interval = snapshot_interval
+        self.prefix = os.path.join(profile_dir, time.strftime("game-%Y%m%d-%H%M%S"))
+        self.tk_profile = cProfile.Profile()
+        self.udp_profile = None
+        self.snapshots = []     # (path, tracemalloc.Snapshot)
+        self.files = []
+        self._widget = None
+        self._udp = None
+        self._after_id = None
+        self._started_tracemalloc = False
+        self.running = False
+
+    def start(self, widget, udp=None) -> None:
+        # Call on the Tk thread: that's the thread cProfile will follow
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._widget = widget
+        self.tk_profile.enable()    # raises if another profiler is active (3.12+)
+        self.running = True
+
+        # Nobody calls stop() if start() raises, so undo whatever got switched
+        # on (e.g. the first snapshot can't be written) before passing it on
+        try:
+            if SEPARATE_THREAD_PROFILES and udp is not None and hasattr(udp, "profile_receiver"):
+                self._udp = udp
+                self.udp_profile = cProfile.Profile()
+                udp.profile_receiver(self.udp_profile)
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                self._started_tracemalloc = True
+            self._snapshot()
+        except BaseException:
+            self._release()
+            self._finish()
+            raise
+
+    def _snapshot(self):
+        self._after_id = None
+        if not self.running or not tracemalloc.is_tracing():
+            return
+        path = f"{self.prefix}-mem-{len(self.snapshots) + 1:02d}.tracemalloc"
+        snap = tracemalloc.take_snapshot()
+        snap.dump(path)
+        self.snapshots.append((path, snap))
+        self.files.append(path)
+        self._after_id = self._widget.after(int(self.snapshot_interval * 1000), self._snapshot)
+
+    def stop(self) -> list:
+        # Writes everything and returns the file paths
+        if not self.running:
+            return self.files
+        self._release()
+        try:
+            self._snapshot()    # final snapshot
+        finally:
+            self._finish()
+
+        self._write_profile("tk", self.tk_profile)
+        if self.udp_profile is not None:
+            self._write_profile("udp", self.udp_profile)
+        if len(self.snapshots) > 1:
+            self._write_memory_report()
+        self.snapshots = []
+        return self.files
+
+    def _release(self):
+        # Switch off both profiles and the snapshot timer
+        try:
+            self.tk_profile.disable()
+        except Exception:
+            pass
+        if self._udp is not None:
+            # The receiver disables its own profile; only read it once it has
+            switched = self._udp.profile_receiver(None)
+            if not switched.wait(RECEIVER_STOP_TIMEOUT):
+                print("[WARNING] UDP receiver did not stop profiling, skipping its profile.")
+                self.udp_profile = None
+            self._udp = None
+        if self._after_id is not None:
+            try:
+                self._widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _finish(self):
+        self.running = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _write_profile(self, name, profile):
+        path = f"{self.prefix}-{name}.prof"
+        try:
+            stats = pstats.Stats(profile)
+        except TypeError:
+            return      # never saw a call (e.g. no UDP traffic this game)
+        stats.dump_stats(path)
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats("cumulative").print_stats(TOP_LINES)
+        with open(f"{self.prefix}-{name}.txt", "w") as f:
+            f.write(text.getvalue())
+        self.files += [path, f"{self.prefix}-{name}.txt"]
+
+    def _write_memory_report(self):
+        first, last = self.snapshots[0][1], self.snapshots[-1][1]
+        path = f"{self.prefix}-mem.txt"
+        with open(path, "w") as f:
+            traced = sum(stat.size for stat in last.statistics("filename"))
+            f.write(f"{len(self.snapshots)} snapshots, {traced / 1024:.1f} KiB traced at the end\n\n")
+            f.write("Top growth (first -> last snapshot):\n")
+            for stat in last.compare_to(first, "lineno")[:TOP_LINES]:
+                f.write(f"{stat}\n")
+        self.files.append(path)
@@ -0,0 +1,130 @@
+# replay.py
+# Re-run a recorded game through the same decode + scoring path as the live app
+# (WireDecoder.decode -> ScoreEngine.apply), either at the original pacing or
+# as fast as possible, and check the final scores against what was recorded.
+#
+#   python3 replay.py journals/game-20261018-190000.pjl --fast
+#   python3 replay.py events.txt --roster roster.json --expect scores.json
+#
+# A text event file has one event per line: "<seconds> <attacker>:<target>"
+
+import argparse
+import json
+import sys
+import time
+
+import wire
+from journal import read_journal, read_meta, OUTCOMES, IGNORED, OUTCOME_NAMES
+from score_engine import ScoreEngine
+
+REPLAY_ADDR = ("127.0.0.1", 0)
+
+
+def load_journal_events(path):
+    # -> [(seconds from first event, attacker, target, recorded outcome)]
+    # Hits that arrived while no game was running were never scored, so skip them
+    events = []
+    start = None
+    for r in read_journal(path):
+        if r.outcome == IGNORED:
+            continue
+        if start is None:
+            start = r.monotonic_ns
+        events.append(((r.monotonic_ns - start) / 1e9, r.attacker, r.target, r.outcome))
+    return events
+
+
+def load_text_events(path):
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            seconds, message = line.split(None, 1)
+            for attacker, target in wire.decode_text(message.encode("utf-8")):
+                events.append((float(seconds), attacker, target, None))
+    return events
+
+
+def replay(events, roster, base_codes=None, realtime=False, speed=1.0):
+    # Returns (engine, outcome mismatches, elapsed seconds)
+    engine = ScoreEngine.from_roster(roster, base_codes)
+    decoder = wire.WireDecoder()
+    mismatches = []
+
+    start = time.perf_counter()
+    for seconds, attacker, target, recorded in events:
+        if realtime:
+            wait = start + seconds / speed - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+        # Same bytes -> events -> scoring path as ui_app's UDP pump
+        for first, second in decoder.decode(wire.encode_text(attacker, target), REPLAY_ADDR):
+            result = engine.apply(first, second)
+            if recorded is not None and OUTCOMES[result.kind] != recorded:
+                mismatches.append((seconds, first, second, OUTCOME_NAMES.get(recorded), result.kind))
+    return engine, mismatches, time.perf_counter() - start
+
+
+def compare_scores(engine, expected):
+    # expected: [[equipment_id, score, base_hits], ...] -> list of differences
+    actual = {eid: (score, base_hits) for eid, score, base_hits in engine.scores()}
+    diffs = []
+    for eid, score, base_hits in expected:
+        if actual.get(eid) != (score, base_hits):
+            diffs.append({"equipment_id": eid, "expected": [score, base_hits], "actual": actual.get(eid)})
+    return diffs
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Replay a recorded Photon game through the scoring path")
+    p.add_argument("events", help=".pjl journal or text event file")
+    p.add_argument("--roster", help="roster JSON (defaults to the journal's sidecar)")
+    p.add_argument("--expect", help="final scores JSON (defaults to the journal's sidecar)")
+    p.add_argument("--fast", action="store_true", help="ignore recorded timing, replay as fast as possible")
+    p.add_argument("--speed", type=float, default=1.0, help="pacing multiplier when not --fast")
+    p.add_argument("--repeat", type=int, default=1, help="replay N times (benchmarking)")
+    args = p.parse_args(argv)
+
+    is_journal = args.events.endswith(".pjl")
+    meta = read_meta(args.events) if is_journal else {}
+    if args.roster:
+        with open(args.roster) as f:
+            meta["roster"] = json.load(f)
+    if args.expect:
+        with open(args.expect) as f:
+            meta["final_scores"] = json.load(f)
+    if "roster" not in meta:
+        raise SystemExit("no roster: pass --roster or replay a journal with a sidecar")
+
+    events = load_journal_events(args.events) if is_journal else load_text_events(args.events)
+    base_codes = {int(k): v for k, v in meta["base_codes"].items()} if "base_codes" in meta else None
+
+    timings = []
+    for _ in range(max(1, args.repeat)):
+        engine, mismatches, elapsed = replay(events, meta["roster"], base_codes,
+                                             realtime=not args.fast, speed=args.speed)
+        timings.append(elapsed)
+
+    diffs = compare_scores(engine, meta["final_scores"]) if "final_scores" in meta else None
+    best = min(timings)
+    report = {
+        "events": len(events),
+        "elapsed_s": round(best, 6),
+        "events_per_s": round(len(events) / best, 1) if best else None,
+        "outcome_mismatches": len(mismatches),
+        "score_diffs": diffs,
+        "totals": engine.totals,
+    }
+    print(json.dumps(report, indent=2))
+    for m in mismatches[:20]:
+        print(f"[MISMATCH] t={m[0]:.3f} {m[1]}:{m[2]} recorded={m[3]} replayed={m[4]}")
+
+    ok = not mismatches and not diffs
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# roster.py
+from dataclasses import dataclass
+from typing import Optional
+
+from config import CONTROL_CODES, default_teams
+
+
+@dataclass
+class PlayerRow:
+    player_id: int
+    codename: str
+    equipment_id: int
+
+
+def team_base_codes(teams) -> dict:
+    # Base code -> owning team, for ScoreEngine
+    return {t.base_code: t.name for t in teams if t.base_code is not None}
+
+
+class Roster:
+    # Pre-game teams for the entry screen, Tk-free
+    # Player and hardware IDs are indexed (id -> team), so duplicate checks are
+    # a dict lookup no matter how many teams or players there are
+
+    def __init__(self, teams=None):
+        self.configs = {t.name: t for t in (teams if teams is not None else default_teams())}
+        self.teams = {name: [] for name in self.configs}
+        self.player_ids = {}      # player_id -> team
+        self.equipment_ids = {}   # equipment_id -> team
+        # Base codes and control codes can't double as hardware IDs
+        self.reserved = {code: f"the {team} base" for code, team in self.base_codes().items()}
+        self.reserved.update({code: "a game control code" for code in CONTROL_CODES})
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    @property
+    def names(self) -> list:
+        return list(self.configs)
+
+    def check(self, team, player_id, equipment_id) -> Optional[tuple]:
+        # None if the player can join `team`, otherwise (title, message) for the operator
+        if team not in self.teams:
+            return "Unknown Team", f"There is no {team} team."
+        if player_id in self.player_ids:
+            return "Duplicate Player", f"Player ID {player_id} is already assigned to {self.player_ids[player_id]}"
+        if equipment_id in self.equipment_ids:
+            return ("Duplicate Hardware",
+                    f"Hardware ID {equipment_id} is already assigned to {self.equipment_ids[equipment_id]}")
+        if equipment_id in self.reserved:
+            return "Reserved Hardware", f"Hardware ID {equipment_id} is {self.reserved[equipment_id]}"
+        if len(self.teams[team]) >= self.configs[team].max_players:
+            return "Team Full", f"{team} team is full."
+        return None
+
+    def add(self, team, player_id, codename, equipment_id) -> PlayerRow:
+        row = PlayerRow(player_id=player_id, codename=codename, equipment_id=equipment_id)
+        self.teams[team].append(row)
+        self.player_ids[player_id] = team
+        self.equipment_ids[equipment_id] = team
+        return row
+
+    def clear(self) -> None:
+        for players in self.teams.values():
+            players.clear()
+        self.player_ids.clear()
+        self.equipment_ids.clear()
+
+    def base_codes(self) -> dict:
+        return team_base_codes(self.configs.values())
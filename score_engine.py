@@ -0,0 +1,233 @@
+# score_engine.py
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from leaderboard import Leaderboard
+
+# Scoring rules (Sprint 4)
+TAG_POINTS = 10
+FRIENDLY_FIRE_PENALTY = 10
+BASE_POINTS = 100
+
+# Base code -> team that owns the base
+# Green scores by hitting the red base (53), red by hitting the green base (43)
+BASE_CODES = {53: "Red", 43: "Green"}
+
+# HitResult kinds
+TAG = "tag"
+FRIENDLY_FIRE = "friendly_fire"
+BASE = "base"
+BASE_NO_SCORE = "base_no_score"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class PlayerRecord:
+    player_id: int
+    codename: str
+    equipment_id: int
+    team: str
+    score: int = 0
+    base_hits: int = 0
+    tags: int = 0
+    times_tagged: int = 0
+    friendly_fire: int = 0
+
+
+@dataclass
+class GameResult:
+    # Everything worth keeping once a game ends (PlayerDB.save_game_results)
+    started_at: float                 # wall clock, time.time()
+    ended_at: float
+    totals: dict
+    winner: Optional[str]             # None on a tie
+    players: list                     # PlayerRecords
+    events: list = field(default_factory=list)  # (offset_ms, kind, attacker, target, points)
+    # Client-side identity, so a retried save can't store the same game twice
+    game_key: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+@dataclass
+class HitResult:
+    # Compact change set returned by apply_hit / apply_base_hit
+    kind: str
+    attacker: Optional[PlayerRecord]
+    target: Optional[PlayerRecord]
+    changed: tuple = ()      # records whose score changed
+    broadcast: tuple = ()    # equipment codes to send back over UDP
+    message: str = ""        # play-by-play text
+    rank_changes: tuple = () # RankChange per changed record
+
+    @property
+    def scored(self) -> bool:
+        return bool(self.changed)
+
+
+class ScoreEngine:
+    # Tk-free scoring state: players indexed by equipment id, team stored on
+    # the record, so every hit is a couple of dict lookups
+    # Each team also keeps a Leaderboard and a running total updated by deltas
+
+    def __init__(self, teams: dict, base_codes: dict = None):
+        # teams: {"Red": [players], "Green": [players]} where a player has
+        # player_id, codename and equipment_id (PlayerRow from the entry screen)
+        self.base_codes = dict(BASE_CODES if base_codes is None else base_codes)
+        self.teams = {}
+        self.leaderboards = {}
+        self.totals = {}
+        self.by_equipment = {}
+
+        # Event stream for the results table: (offset_ms, kind, attacker, target, points)
+        self.events = []
+        self.started_at = None
+        self._started_mono = None
+
+        for team, players in teams.items():
+            self._add_team(team)
+            for p in players:
+                self.add_player(team, p.player_id, p.codename, p.equipment_id)
+
+    def _add_team(self, team) -> None:
+        if team not in self.teams:
+            self.teams[team] = []
+            self.leaderboards[team] = Leaderboard()
+            self.totals[team] = 0
+
+    def add_player(self, team, player_id, codename, equipment_id) -> PlayerRecord:
+        self._add_team(team)
+        record = PlayerRecord(player_id, codename, equipment_id, team)
+        self.teams[team].append(record)
+        self.leaderboards[team].add(record)
+        self.by_equipment[equipment_id] = record
+        return record
+
+    def _score(self, record, points):
+        # Every score change goes through here so totals and ranks stay in sync
+        record.score += points
+        self.totals[record.team] += points
+        return self.leaderboards[record.team].update(record)
+
+    def start_game(self) -> None:
+        self.started_at = time.time()
+        self._started_mono = time.monotonic()
+
+    def _log(self, kind, attacker, target, points) -> None:
+        if self._started_mono is not None:
+            offset_ms = int((time.monotonic() - self._started_mono) * 1000)
+            self.events.append((offset_ms, kind, attacker, target, points))
+
+    def winner(self) -> Optional[str]:
+        if not self.totals:
+            return None
+        best = max(self.totals.values())
+        leaders = [team for team, total in self.totals.items() if total == best]
+        return leaders[0] if len(leaders) == 1 else None
+
+    def result(self) -> GameResult:
+        # Snapshot of the finished game; safe to hand to another thread
+        players = [PlayerRecord(**vars(p)) for team in self.teams.values() for p in team]
+        return GameResult(
+            started_at=self.started_at or time.time(),
+            ended_at=time.time(),
+            totals=dict(self.totals),
+            winner=self.winner(),
+            players=players,
+            events=list(self.events),
+        )
+
+    def find(self, equipment_id) -> Optional[PlayerRecord]:
+        return self.by_equipment.get(equipment_id)
+
+    def team_of(self, equipment_id) -> Optional[str]:
+        record = self.by_equipment.get(equipment_id)
+        return record.team if record else None
+
+    def team_total(self, team) -> int:
+        return self.totals.get(team, 0)
+
+    def ranked(self, team) -> list:
+        return self.leaderboards[team].ordered()
+
+    def roster(self) -> dict:
+        # JSON-friendly team -> players, enough to rebuild this engine
+        return {
+            team: [{"player_id": p.player_id, "codename": p.codename, "equipment_id": p.equipment_id}
+                   for p in players]
+            for team, players in self.teams.items()
+        }
+
+    def scores(self) -> list:
+        # [[equipment_id, score, base_hits], ...] in roster order
+        return [[p.equipment_id, p.score, p.base_hits]
+                for players in self.teams.values() for p in players]
+
+    @classmethod
+    def from_roster(cls, roster: dict, base_codes: dict = None):
+        engine = cls({}, base_codes)
+        for team, players in roster.items():
+            engine._add_team(team)
+            for p in players:
+                engine.add_player(team, p["player_id"], p["codename"], p["equipment_id"])
+        return engine
+
+    def is_base_code(self, code) -> bool:
+        return code in self.base_codes
+
+    def apply(self, first, second) -> HitResult:
+        # Entry point for a raw "first:second" UDP event
+        if second in self.base_codes:
+            return self.apply_base_hit(first, second)
+        return self.apply_hit(first, second)
+
+    def apply_hit(self, attacker_equipment_id, target_equipment_id) -> HitResult:
+        attacker = self.by_equipment.get(attacker_equipment_id)
+        target = self.by_equipment.get(target_equipment_id)
+
+        if not attacker or not target:
+            self._log(UNKNOWN, attacker_equipment_id, target_equipment_id, 0)
+            return HitResult(UNKNOWN, attacker, target,
+                             message=f"unknown hit event: {attacker_equipment_id} -> {target_equipment_id}")
+
+        if attacker.team == target.team:
+            attacker.friendly_fire += 1
+            self._log(FRIENDLY_FIRE, attacker_equipment_id, target_equipment_id, -FRIENDLY_FIRE_PENALTY)
+            moves = (self._score(attacker, -FRIENDLY_FIRE_PENALTY),
+                     self._score(target, -FRIENDLY_FIRE_PENALTY))
+            return HitResult(FRIENDLY_FIRE, attacker, target,
+                             changed=(attacker, target),
+                             broadcast=(attacker_equipment_id, target_equipment_id),
+                             message=f"{attacker.codename} hit teammate {target.codename} (friendly fire)",
+                             rank_changes=moves)
+
+        attacker.tags += 1
+        target.times_tagged += 1
+        self._log(TAG, attacker_equipment_id, target_equipment_id, TAG_POINTS)
+        moves = (self._score(attacker, TAG_POINTS),)
+        return HitResult(TAG, attacker, target,
+                         changed=(attacker,),
+                         broadcast=(target_equipment_id,),
+                         message=f"{attacker.codename} tagged {target.codename} (+{TAG_POINTS})",
+                         rank_changes=moves)
+
+    def apply_base_hit(self, attacker_equipment_id, base_code) -> HitResult:
+        attacker = self.by_equipment.get(attacker_equipment_id)
+        if not attacker:
+            self._log(UNKNOWN, attacker_equipment_id, base_code, 0)
+            return HitResult(UNKNOWN, None, None,
+                             message=f"unknown base hit by hw:{attacker_equipment_id}")
+
+        base_team = self.base_codes.get(base_code)
+        if base_team is None or base_team == attacker.team:
+            self._log(BASE_NO_SCORE, attacker_equipment_id, base_code, 0)
+            return HitResult(BASE_NO_SCORE, attacker, None,
+                             message=f"{attacker.codename} triggered base code {base_code}, but no score awarded")
+
+        attacker.base_hits += 1
+        self._log(BASE, attacker_equipment_id, base_code, BASE_POINTS)
+        moves = (self._score(attacker, BASE_POINTS),)
+        return HitResult(BASE, attacker, None,
+                         changed=(attacker,),
+                         message=f"{attacker.codename} scored on {base_team.lower()} base (+{BASE_POINTS})",
+                         rank_changes=moves)
@@ -0,0 +1,94 @@
+# scoreboard_render.py
+import time
+
+
+class RenderScheduler:
+    # Coalesces redraw requests: any number of mark_dirty() calls between
+    # frames produce a single render() call, at most `hz` times per second
+
+    def __init__(self, widget, render, hz: int = 20):
+        self.widget = widget
+        self.render = render
+        self.interval = 1.0 / max(1, hz)
+        self.dirty = False
+        self.frames = 0
+        self._last = 0.0
+        self._pending = None
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+        if self._pending is not None:
+            return
+        wait = self._last + self.interval - time.monotonic()
+        self._pending = self.widget.after(max(0, int(wait * 1000)), self._run)
+
+    def flush(self) -> None:
+        # Render right now if anything is waiting (used at game end)
+        self.cancel()
+        if self.dirty:
+            self._run()
+
+    def cancel(self) -> None:
+        if self._pending is not None:
+            try:
+                self.widget.after_cancel(self._pending)
+            except Exception:
+                pass
+            self._pending = None
+
+    def _run(self) -> None:
+        self._pending = None
+        self.dirty = False
+        self._last = time.monotonic()
+        self.frames += 1
+        self.render()
+
+
+class ListboxRows:
+    # Mirror of a Listbox's rows so a redraw only touches rows whose text changed
+
+    def __init__(self, listbox):
+        self.listbox = listbox
+        self.rows = []
+
+    def update(self, texts) -> int:
+        # Returns how many rows were rewritten
+        changed = self.update_range(0, texts)
+
+        extra = len(self.rows) - len(texts)
+        if extra > 0:
+            self.listbox.delete(len(texts), "end")
+            del self.rows[len(texts):]
+            changed += extra
+        return changed
+
+    def update_range(self, start, texts) -> int:
+        # Rewrite rows start..start+len(texts)-1 (e.g. the span a player moved across)
+        changed = 0
+        rows = self.rows
+        for i, text in enumerate(texts, start):
+            if i >= len(rows):
+                self.listbox.insert("end", text)
+                rows.append(text)
+                changed += 1
+            elif rows[i] != text:
+                self.listbox.delete(i)
+                self.listbox.insert(i, text)
+                rows[i] = text
+                changed += 1
+        return changed
+
+
+class LabelText:
+    # Only reconfigures a Label when its text actually changes
+
+    def __init__(self, label):
+        self.label = label
+        self.text = None
+
+    def set(self, text) -> bool:
+        if text == self.text:
+            return False
+        self.label.config(text=text)
+        self.text = text
+        return True
@@ -1,7 +1,9 @@
 # splash.py
 import os
+import time
 import tkinter as tk
-from PIL import Image, ImageTk
+
+from assets import decode_image
 
 # COLOR THEMES:
 BG = "#0a0a0a"
@@ -10,11 +12,18 @@ RED_NEON = "#e83030"
 DIM = "#aaaaaa"
 FONT_MONO = "Courier"
 
+LOGO_SIZE = (720, 340)
+
+
 class SplashScreen(tk.Toplevel):
-    # shows for 3 seconds (sprint 2)
-    def __init__(self, master: tk.Tk, logo_path: str, on_done, ms: int = 3000):
+    # shows for at least `ms` (sprint 2), then closes once ready() is true
+    # logo is a path, or a Future of a PIL image decoded in the background
+    # (ui_app gets it from the AssetStore, resized to LOGO_SIZE)
+    def __init__(self, master: tk.Tk, logo, on_done, ms: int = 3000, ready=None):
         super().__init__(master)
         self._on_done = on_done
+        self._ready = ready
+        self._close_at = time.monotonic() + ms / 1000
 
         self.configure(bg=BG)
         self.overrideredirect(True)
@@ -33,29 +42,23 @@ class SplashScreen(tk.Toplevel):
             self._canvas.create_line(0, i, w, i, fill="#ffffff", stipple="gray12")
         self._canvas.create_rectangle(6, 6, w-6, h-6, outline=GOLD, width=2)
 
-        # load logo
         self.logo_img = None
-        if os.path.exists(logo_path):
-            try:
-                img = Image.open(logo_path).convert("RGBA")
-                img.thumbnail((720, 340))
-                self.logo_img = ImageTk.PhotoImage(img)
-            except Exception:
-                self.logo_img = None
+        self._pending_logo = None
+        self._frame = tk.Frame(self, bg=BG)
+        self._frame.place(relx=0.5, rely=0.5, anchor="center")
+        self._logo_area = tk.Frame(self._frame, bg=BG)
+        self._logo_area.pack()
 
-        frame = tk.Frame(self, bg=BG)
-        frame.place(relx=0.5, rely=0.5, anchor="center")
-
-        if self.logo_img:
-            tk.Label(frame, image=self.logo_img, bg=BG).pack(pady=(0, 14))
+        if hasattr(logo, "done"):
+            self._pending_logo = logo
         else:
-            tk.Label(frame, text="PHOTON", font=(FONT_MONO, 52, "bold"),
-                     fg=GOLD, bg=BG).pack(pady=(0, 6))
-            tk.Label(frame, text="THE ULTIMATE GAME ON PLANET EARTH",
-                     font=(FONT_MONO, 11), fg=RED_NEON, bg=BG).pack()
+            try:
+                self.show_logo(decode_image(logo, LOGO_SIZE) if os.path.exists(logo) else None)
+            except Exception:
+                self.show_logo(None)
 
         # Loading text with animated dots
-        self._dot_label = tk.Label(frame, text="LOADING",
+        self._dot_label = tk.Label(self._frame, text="LOADING",
                                    font=(FONT_MONO, 11), fg=DIM, bg=BG)
         self._dot_label.pack(pady=(10, 0))
         self._dot_count = 0
@@ -64,7 +67,32 @@ class SplashScreen(tk.Toplevel):
         self.lift()
         self.attributes("-topmost", True)
         self.after(200, lambda: self.attributes("-topmost", False))
-        self.after(ms, self._finish)
+        self.after(50, self._poll)
+
+    def show_logo(self, img):
+        # Must run on the Tk thread (PhotoImage); falls back to the text title
+        if img is not None:
+            from PIL import ImageTk
+            self.logo_img = ImageTk.PhotoImage(img)
+            tk.Label(self._logo_area, image=self.logo_img, bg=BG).pack(pady=(0, 14))
+        else:
+            tk.Label(self._logo_area, text="PHOTON", font=(FONT_MONO, 52, "bold"),
+                     fg=GOLD, bg=BG).pack(pady=(0, 6))
+            tk.Label(self._logo_area, text="THE ULTIMATE GAME ON PLANET EARTH",
+                     font=(FONT_MONO, 11), fg=RED_NEON, bg=BG).pack()
+
+    def _poll(self):
+        if self._pending_logo is not None and self._pending_logo.done():
+            future, self._pending_logo = self._pending_logo, None
+            try:
+                self.show_logo(future.result())
+            except Exception:
+                self.show_logo(None)
+
+        if time.monotonic() >= self._close_at and (self._ready is None or self._ready()):
+            self._finish()
+        else:
+            self.after(50, self._poll)
 
     # Animated dots for loading text
     def _blink(self):
@@ -0,0 +1,180 @@
+# tests/test_codename_cache.py
+import threading
+
+from codename_cache import CachedPlayerDB
+from db import player_profile
+from score_engine import ScoreEngine
+from roster import PlayerRow
+
+
+class FakeDB:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.games = {}
+        self.calls = []
+
+    def get_codename(self, player_id):
+        self.calls.append(("get_codename", player_id))
+        return self.data.get(player_id)
+
+    def get_codenames(self, player_ids):
+        self.calls.append(("get_codenames", tuple(player_ids)))
+        return {pid: self.data[pid] for pid in player_ids if pid in self.data}
+
+    def get_all_players(self):
+        return list(self.data.items())
+
+    def add_player(self, player_id, codename):
+        self.data[player_id] = codename
+
+    def queue_player(self, player_id, codename):
+        self.data[player_id] = codename
+
+    def get_player_profile(self, player_id):
+        self.calls.append(("get_player_profile", player_id))
+        if player_id not in self.data:
+            return None
+        return player_profile(player_id, self.data[player_id], games=self.games.get(player_id, 0))
+
+    def save_game_results(self, result):
+        for p in result.players:
+            self.games[p.player_id] = self.games.get(p.player_id, 0) + 1
+        return 1
+
+
+class SlowDB(FakeDB):
+    # Lookups wait in the db until released, so a test can land a write mid-query
+    def __init__(self, data=None):
+        super().__init__(data)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def _wait(self):
+        self.entered.set()
+        assert self.release.wait(5)
+
+    def get_codename(self, player_id):
+        result = super().get_codename(player_id)
+        self._wait()
+        return result
+
+    def get_codenames(self, player_ids):
+        result = super().get_codenames(player_ids)
+        self._wait()
+        return result
+
+    def get_player_profile(self, player_id):
+        result = super().get_player_profile(player_id)
+        self._wait()
+        return result
+
+
+def during_query(db, lookup, write):
+    # Run lookup on another thread and call write while its query is in the db
+    thread = threading.Thread(target=lookup)
+    thread.start()
+    assert db.entered.wait(5)
+    write()
+    db.release.set()
+    thread.join(5)
+    db.entered.clear()
+    db.release.clear()
+
+
+def test_hits_and_misses_are_cached():
+    db = FakeDB({1: "alpha"})
+    cache = CachedPlayerDB(db)
+    assert cache.get_codename(1) == "alpha"
+    assert cache.get_codename(1) == "alpha"
+    assert cache.get_codename(2) is None
+    assert cache.get_codename(2) is None
+    assert db.calls == [("get_codename", 1), ("get_codename", 2)]
+    assert cache.stats()["hits"] == 2
+
+
+def test_writes_refresh_a_cached_miss():
+    cache = CachedPlayerDB(FakeDB())
+    assert cache.get_codename(5) is None
+    cache.queue_player(5, "echo")
+    assert cache.get_codename(5) == "echo"
+
+
+def test_bulk_lookup_only_queries_missing_ids():
+    db = FakeDB({1: "a", 2: "b", 3: "c"})
+    cache = CachedPlayerDB(db)
+    cache.get_codename(1)
+    assert cache.get_codenames([1, 2, 3, 4]) == {1: "a", 2: "b", 3: "c"}
+    assert db.calls[-1] == ("get_codenames", (2, 3, 4))
+
+
+def test_lru_bound_and_ttl():
+    cache = CachedPlayerDB(FakeDB({i: f"p{i}" for i in range(10)}), max_entries=3)
+    for i in range(5):
+        cache.get_codename(i)
+    assert cache.stats()["entries"] == 3
+
+    expired = CachedPlayerDB(FakeDB({1: "a"}), ttl=-1)
+    expired.get_codename(1)
+    expired.get_codename(1)
+    assert expired.stats()["hits"] == 0
+
+
+def test_preload_and_passthrough():
+    db = FakeDB({1: "a", 2: "b"})
+    cache = CachedPlayerDB(db)
+    assert cache.preload() == 2
+    assert cache.get_codename(2) == "b"
+    assert db.calls == []
+    assert cache.data == db.data      # anything else goes to the real db
+
+
+def test_profiles_are_cached_until_a_game_is_saved():
+    db = FakeDB({1: "alpha", 2: "bravo", 3: "charlie"})
+    cache = CachedPlayerDB(db)
+    assert cache.get_player_profile(1)["games"] == 0
+    assert cache.get_player_profile(3)["games"] == 0
+    cache.get_player_profile(1)["games"] = 99      # callers get a copy
+    assert cache.get_player_profile(1)["games"] == 0
+    assert db.calls.count(("get_player_profile", 1)) == 1
+    assert cache.get_codename(1) == "alpha"         # served from the profile lookup
+
+    engine = ScoreEngine({"Red": [PlayerRow(1, "alpha", 11)], "Green": [PlayerRow(2, "bravo", 21)]})
+    cache.save_game_results(engine.result())
+    assert cache.get_player_profile(1)["games"] == 1
+    assert db.calls.count(("get_player_profile", 1)) == 2
+    cache.get_player_profile(3)                     # not in that game: still cached
+    assert db.calls.count(("get_player_profile", 3)) == 1
+
+
+def test_unknown_profile_is_refreshed_by_a_write():
+    cache = CachedPlayerDB(FakeDB())
+    assert cache.get_player_profile(7) is None
+    cache.queue_player(7, "golf")
+    assert cache.get_player_profile(7)["codename"] == "golf"
+
+
+def test_write_during_a_miss_query_is_not_overwritten():
+    db = SlowDB()
+    cache = CachedPlayerDB(db)
+    during_query(db, lambda: cache.get_codename(5), lambda: cache.queue_player(5, "echo"))
+    assert cache.get_codename(5) == "echo"
+    during_query(db, lambda: cache.get_codenames([6]), lambda: cache.add_player(6, "foxtrot"))
+    assert cache.get_codenames([6]) == {6: "foxtrot"}
+    db.data[7] = "golf"
+    during_query(db, lambda: cache.get_codename(7), lambda: cache.invalidate())
+    db.data[7] = "hotel"
+    db.release.set()
+    assert cache.get_codename(7) == "hotel"
+
+
+def test_save_during_a_profile_query_is_not_overwritten():
+    db = SlowDB({1: "alpha", 2: "bravo"})
+    cache = CachedPlayerDB(db)
+    engine = ScoreEngine({"Red": [PlayerRow(1, "alpha", 11)], "Green": [PlayerRow(2, "bravo", 21)]})
+    during_query(db, lambda: cache.get_player_profile(1), lambda: cache.save_game_results(engine.result()))
+    db.release.set()
+    assert cache.get_player_profile(1)["games"] == 1
+    during_query(db, lambda: cache.get_player_profile(9), lambda: cache.add_player(9, "india"))
+    db.release.set()
+    assert cache.get_codename(9) == "india"
+    assert cache.get_player_profile(9)["codename"] == "india"
@@ -0,0 +1,48 @@
+# tests/test_config.py
+import dataclasses
+
+import pytest
+
+from config import AppConfig, TeamConfig
+
+
+def test_defaults_are_red_vs_green():
+    cfg = AppConfig()
+    assert [(t.name, t.base_code, t.max_players) for t in cfg.teams] == [
+        ("Red", 53, 15), ("Green", 43, 15)]
+
+
+def test_team_dicts_become_team_configs():
+    # arenas.json gives teams as plain dicts
+    cfg = dataclasses.replace(AppConfig(), teams=[{"name": "Blue", "base_code": 63, "max_players": 40}])
+    assert cfg.teams == [TeamConfig("Blue", base_code=63, max_players=40)]
+
+
+def test_default_teams_are_not_shared_between_configs():
+    a, b = AppConfig(), AppConfig()
+    a.teams[0].max_players = 99
+    assert b.teams[0].max_players == 15
+
+
+@pytest.mark.parametrize("teams", [
+    [],
+    [{"name": "Red"}, {"name": "Red"}],
+    [{"name": ""}],
+    [{"name": "x" * 21}],
+    [{"name": "Red", "base_code": 53}, {"name": "Blue", "base_code": 53}],
+    [{"name": "Red", "base_code": 202}],
+    [{"name": "Red", "base_code": 221}],
+])
+def test_invalid_teams_are_rejected(teams):
+    with pytest.raises(ValueError):
+        AppConfig(teams=teams)
+
+
+def test_unknown_team_keys_are_rejected():
+    with pytest.raises(ValueError, match="colour"):
+        AppConfig(teams=[{"name": "Red", "colour": "#f00"}])
+
+
+def test_teams_without_a_base_are_allowed():
+    cfg = AppConfig(teams=[{"name": "Red"}, {"name": "Green"}])
+    assert [t.base_code for t in cfg.teams] == [None, None]
@@ -0,0 +1,136 @@
+# tests/test_db.py
+# save_game_results against a recording cursor (no PostgreSQL needed)
+import db
+from roster import PlayerRow
+from score_engine import ScoreEngine
+
+
+class RecordingCursor:
+    # Pretends game_key is UNIQUE: a second insert of the same key returns no row
+    def __init__(self, saved):
+        self.saved = saved          # game_key -> id
+        self.statements = []
+        self.copies = []
+        self._row = None
+
+    def execute(self, sql, args=None):
+        self.statements.append(" ".join(sql.split())[:40])
+        if "INSERT INTO games" in sql:
+            key = args[3]
+            if key in self.saved:
+                self._row = None
+            else:
+                self.saved[key] = len(self.saved) + 1
+                self._row = (self.saved[key],)
+        elif "SELECT id FROM games" in sql:
+            self._row = (self.saved[args[0]],)
+
+    def fetchone(self):
+        return self._row
+
+    def copy_expert(self, sql, buf):
+        self.copies.append((sql, buf.getvalue()))
+
+
+def make_db(monkeypatch, cursor):
+    monkeypatch.setattr(db, "execute_values", lambda *args, **kwargs: None)
+    monkeypatch.setattr(db, "CONNECTION_ERRORS", ())
+    player_db = db.PlayerDB.__new__(db.PlayerDB)    # skip the pool
+    player_db._run = lambda work: work(cursor)
+    return player_db
+
+
+def finished_game():
+    engine = ScoreEngine({"Red": [PlayerRow(1, "alpha", 11)], "Green": [PlayerRow(2, "bravo", 21)]})
+    engine.start_game()
+    engine.apply(11, 21)
+    engine.apply(99999999999, 21)       # unknown, oversized
+    engine.apply(10 ** 30, 21)          # unknown, beyond BIGINT
+    return engine.result()
+
+
+def test_event_ids_are_clamped_to_bigint(monkeypatch):
+    cursor = RecordingCursor({})
+    game_id = make_db(monkeypatch, cursor).save_game_results(finished_game())
+    assert game_id == 1
+    events = [sql_buf for sql_buf in cursor.copies if "game_events" in sql_buf[0]][0][1]
+    rows = [line.split(",") for line in events.splitlines()]
+    assert [int(r[4]) for r in rows] == [11, 99999999999, db.BIGINT_MAX]
+    assert cursor.statements[-1] == "COMMIT"
+
+
+def test_saving_the_same_game_twice_stores_it_once(monkeypatch):
+    saved = {}
+    result = finished_game()
+    first = RecordingCursor(saved)
+    assert make_db(monkeypatch, first).save_game_results(result) == 1
+    retry = RecordingCursor(saved)
+    assert make_db(monkeypatch, retry).save_game_results(result) == 1
+    assert retry.copies == []               # nothing written the second time
+    assert retry.statements[-1] == "COMMIT"
+    assert len(saved) == 1
+
+
+def test_callers_wait_for_a_connection_instead_of_exhausting_the_pool(monkeypatch):
+    import threading
+    import time
+
+    class PoolError(Exception):
+        pass
+
+    class Conn:
+        autocommit = False
+
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    class Pool:
+        # psycopg2's pools raise instead of waiting when empty
+        def __init__(self, size):
+            self.free = size
+            self.lock = threading.Lock()
+
+        def getconn(self):
+            with self.lock:
+                if not self.free:
+                    raise PoolError("connection pool exhausted")
+                self.free -= 1
+                return Conn()
+
+        def putconn(self, conn, close=False):
+            with self.lock:
+                self.free += 1
+
+    class Cfg:
+        db_pool_max = 2
+        db_retry_attempts = 1
+        db_retry_backoff = 0.0
+
+    monkeypatch.setattr(db, "CONNECTION_ERRORS", ())
+    monkeypatch.setattr(db, "QueryCanceledError", type("QueryCanceled", (Exception,), {}))
+    player_db = db.PlayerDB.__new__(db.PlayerDB)
+    player_db.cfg = Cfg()
+    player_db.pool = Pool(Cfg.db_pool_max)
+    player_db._slots = threading.BoundedSemaphore(Cfg.db_pool_max)
+
+    errors = []
+
+    def query():
+        try:
+            player_db._run(lambda cur: time.sleep(0.01))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert player_db.pool.free == Cfg.db_pool_max
@@ -0,0 +1,78 @@
+# tests/test_game_clock.py
+from game_clock import GameClock
+
+
+class FakeTk:
+    # Fake monotonic clock + after(); run() fires callbacks in time order,
+    # each `lag` seconds late to mimic a busy Tk thread
+    def __init__(self, lag=0.0):
+        self.now = 100.0
+        self.lag = lag
+        self.timers = []
+        self.cancelled = set()
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.timers.append((self.now + ms / 1000.0, len(self.timers), fn))
+        return len(self.timers) - 1
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def run(self, limit=1000):
+        while self.timers and limit:
+            self.timers.sort()
+            due, after_id, fn = self.timers.pop(0)
+            if after_id in self.cancelled:
+                continue
+            self.now = max(self.now, due) + self.lag
+            fn()
+            limit -= 1
+
+
+def run_clock(seconds, lag=0.0):
+    tk = FakeTk(lag)
+    ticks, done = [], []
+    clock = GameClock(tk, seconds, ticks.append, lambda: done.append(tk.now), clock=tk.clock)
+    clock.start()
+    tk.run()
+    return clock, ticks, done
+
+
+def test_ticks_once_per_second_then_finishes_on_time():
+    clock, ticks, done = run_clock(5)
+    assert ticks == [5, 4, 3, 2, 1]
+    assert done == [105.0]
+    assert not clock.running
+    assert clock.stats()["ticks"] == 5
+
+
+def test_late_callbacks_do_not_push_back_the_deadline():
+    clock, ticks, done = run_clock(30, lag=0.08)
+    assert ticks == list(range(30, 0, -1))
+    # only the last callback's own lateness, not 30 of them added up
+    assert done[0] - 130.0 < 0.1
+    assert clock.stats()["jitter_max_ms"] <= 80.0 + 1
+
+
+def test_start_at_continues_from_another_clocks_deadline():
+    tk = FakeTk()
+    first = GameClock(tk, 3, lambda s: None, lambda: None, clock=tk.clock)
+    first.start()
+    tk.now += 0.5                   # the callback that starts the next clock ran late
+    second = GameClock(tk, 10, lambda s: None, lambda: None, clock=tk.clock)
+    second.start(at=first.deadline)
+    assert second.deadline == first.deadline + 10
+
+
+def test_cancel_stops_ticking():
+    tk = FakeTk()
+    ticks = []
+    clock = GameClock(tk, 5, ticks.append, lambda: None, clock=tk.clock)
+    clock.start()
+    clock.cancel()
+    tk.run()
+    assert ticks == [5]
+    assert clock.remaining() == 5
@@ -0,0 +1,88 @@
+# tests/test_journal.py
+import struct
+
+import pytest
+
+import journal
+from journal import Journal, read_journal, read_meta, clamp_id, FILE_HEADER
+
+ADDR = ("10.0.0.5", 7500)
+
+
+def test_records_and_meta_round_trip(tmp_path):
+    path = str(tmp_path / "game.pjl")
+    j = Journal(path, fsync_interval=0.05)
+    j.record(ADDR, 11, 21, 1, monotonic_ns=1000)
+    j.record(None, 11, 43, 3, monotonic_ns=2000)
+    j.write_meta(roster={"Red": []}, totals={"Red": 10})
+    j.close()
+
+    records = list(read_journal(path))
+    assert [(r.monotonic_ns, r.ip, r.port, r.attacker, r.target, r.outcome) for r in records] == [
+        (1000, "10.0.0.5", 7500, 11, 21, 1),
+        (2000, "0.0.0.0", 0, 11, 43, 3),
+    ]
+    assert read_meta(path) == {"roster": {"Red": []}, "totals": {"Red": 10}}
+
+
+def test_oversized_ids_are_kept_or_clamped(tmp_path):
+    path = str(tmp_path / "game.pjl")
+    j = Journal(path, fsync_interval=0.05)
+    j.record(ADDR, 99999999999, 0xFFFFFFFF, 5)      # fits i64 as is
+    j.record(ADDR, 10 ** 30, -10 ** 30, 5)         # clamped
+    j.record(ADDR, 1, 2, 1)
+    j.close()
+
+    records = list(read_journal(path))
+    assert [(r.attacker, r.target) for r in records] == [
+        (99999999999, 0xFFFFFFFF),
+        (journal.ID_MAX, journal.ID_MIN),
+        (1, 2),
+    ]
+    assert clamp_id(5) == 5
+
+
+def test_unpackable_record_is_dropped_not_fatal(tmp_path):
+    path = str(tmp_path / "game.pjl")
+    j = Journal(path, fsync_interval=0.05)
+    j.record(ADDR, 1, 2, 999)        # outcome doesn't fit a byte
+    j.record(ADDR, 3, 4, 1)
+    j.close()
+    assert j.dropped == 1
+    assert [(r.attacker, r.target) for r in read_journal(path)] == [(3, 4)]
+
+
+def test_close_is_idempotent(tmp_path):
+    j = Journal(str(tmp_path / "game.pjl"))
+    j.close()
+    j.close()
+
+
+def test_torn_last_record_is_skipped(tmp_path):
+    path = str(tmp_path / "game.pjl")
+    j = Journal(path)
+    j.record(ADDR, 1, 2, 1)
+    j.record(ADDR, 3, 4, 1)
+    j.close()
+    with open(path, "r+b") as f:
+        f.truncate(FILE_HEADER.size + journal.RECORD.size + 5)
+    assert [(r.attacker, r.target) for r in read_journal(path)] == [(1, 2)]
+
+
+def test_reads_version_1_journals(tmp_path):
+    path = tmp_path / "old.pjl"
+    v1 = struct.Struct("<q4sHiiBx")
+    path.write_bytes(FILE_HEADER.pack(b"PJL1", v1.size) + v1.pack(5, b"\x01\x02\x03\x04", 9, 7, 8, 1))
+    [r] = read_journal(str(path))
+    assert (r.ip, r.port, r.attacker, r.target) == ("1.2.3.4", 9, 7, 8)
+
+
+def test_rejects_empty_and_foreign_files(tmp_path):
+    empty = tmp_path / "empty.pjl"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        list(read_journal(str(empty)))
+    other = tmp_path / "other.pjl"
+    other.write_bytes(FILE_HEADER.pack(b"NOPE", 8))
+    with pytest.raises(ValueError):
+        list(read_journal(str(other)))
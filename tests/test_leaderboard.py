@@ -0,0 +1,51 @@
+# tests/test_leaderboard.py
+from leaderboard import Leaderboard
+from score_engine import PlayerRecord
+
+
+def record(pid, score=0):
+    return PlayerRecord(pid, f"p{pid}", pid, "Red", score=score)
+
+
+def test_orders_by_score_then_join_order():
+    a, b, c = record(1), record(2, 5), record(3)
+    board = Leaderboard([a, b, c])
+    assert board.ordered() == [b, a, c]
+
+
+def test_update_reports_rank_moves():
+    a, b, c = record(1), record(2), record(3)
+    board = Leaderboard([a, b, c])
+    c.score = 10
+    change = board.update(c)
+    assert (change.old_rank, change.new_rank) == (2, 0)
+    assert change.moved
+    assert board.ordered() == [c, a, b]
+    assert board.rank_of(a) == 1
+
+    unchanged = board.update(a)
+    assert not unchanged.moved
+
+
+def test_ties_keep_join_order_after_updates():
+    a, b = record(1), record(2)
+    board = Leaderboard([a, b])
+    b.score = 10
+    board.update(b)
+    a.score = 10
+    board.update(a)
+    assert board.ordered() == [a, b]
+    assert board.span(0, 0) == [a]
+
+
+def test_matches_a_full_sort_under_random_updates():
+    import random
+    rng = random.Random(7)
+    records = [record(i) for i in range(50)]
+    board = Leaderboard(records)
+    for _ in range(500):
+        r = rng.choice(records)
+        r.score += rng.choice((-10, 10, 100))
+        board.update(r)
+    expected = sorted(records, key=lambda r: (-r.score, r.player_id))
+    assert board.ordered() == expected
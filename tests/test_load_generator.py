@@ -0,0 +1,35 @@
+# tests/test_load_generator.py
+import random
+
+import pytest
+
+from load_generator import EventMaker, check_teams, parse_args, GREEN_BASE, RED_BASE
+
+
+@pytest.mark.parametrize("argv", [
+    ["--red", "0"],
+    ["--green", "-1"],
+    ["--red", "20", "--red-start", "100", "--green-start", "110"],
+    ["--red-start", "52"],              # 52..53 hits the red base
+    ["--green-start", "220"],           # 220..221 hits a control code
+])
+def test_bad_teams_are_rejected(argv):
+    with pytest.raises(SystemExit):
+        check_teams(parse_args(argv))
+
+
+def test_generated_hits_stay_inside_the_teams():
+    args = parse_args(["--red", "3", "--green", "4", "--friendly-fire", "0.2", "--base-hits", "0.1"])
+    check_teams(args)
+    maker = EventMaker(args, random.Random(1))
+    red, green = set(maker.red), set(maker.green)
+    for _ in range(2000):
+        attacker, target, expected = maker.next()
+        assert attacker in red | green
+        if target in (RED_BASE, GREEN_BASE):
+            assert (target == GREEN_BASE) == (attacker in red)
+            assert expected == ()
+        elif (attacker in red) == (target in red):
+            assert expected == (attacker, target)      # friendly fire
+        else:
+            assert expected == (target,)
@@ -0,0 +1,60 @@
+# tests/test_metrics.py
+import json
+
+from metrics import Histogram, Metrics, _bucket, _bucket_upper, BUCKETS
+
+
+def test_bucket_upper_bound_contains_its_values():
+    for us in list(range(200)) + [10 ** k for k in range(3, 12)]:
+        index = _bucket(us)
+        assert 0 <= index < BUCKETS
+        assert us <= _bucket_upper(index)
+        if index:
+            assert us > _bucket_upper(index - 1)
+
+
+def test_percentiles_within_bucket_resolution():
+    h = Histogram()
+    for ms in range(1, 1001):
+        h.record(ms * 1_000_000)
+    assert h.count == 1000
+    for p, exact in ((0.50, 500), (0.95, 950), (0.99, 990)):
+        assert exact <= h.percentile(p) <= exact * 1.13
+    assert h.percentile(1.0) == 1000.0       # capped at the real max
+    assert h.summary()["max"] == 1000.0
+
+
+def test_empty_histogram():
+    assert Histogram().percentile(0.5) == 0.0
+    assert Histogram().summary()["count"] == 0
+
+
+def test_counters_gauges_sources_and_reset():
+    m = Metrics(enabled=True)
+    m.observe("parse", 2_000_000)
+    m.count("hits", 3)
+    m.count("hits")
+    m.gauge("inbox", 5)
+    m.gauge("inbox", 2)
+    m.add_source("sender", lambda: {"sent": 7})
+    m.add_source("broken", lambda: 1 / 0)
+
+    snap = m.snapshot()
+    assert snap["stages_ms"]["parse"]["count"] == 1
+    assert snap["counters"] == {"hits": 4}
+    assert snap["gauges"]["inbox"] == {"last": 2, "max": 5}
+    assert snap["sources"]["sender"] == {"sent": 7}
+    assert "error" in snap["sources"]["broken"]
+    assert "parse" in m.format()
+
+    m.reset()
+    assert m.snapshot()["stages_ms"] == {} and m.snapshot()["counters"] == {}
+    assert "sender" in m.snapshot()["sources"]      # sources survive a reset
+
+
+def test_dump_writes_json(tmp_path):
+    m = Metrics(enabled=True)
+    m.observe("parse", 1000)
+    path = m.dump(str(tmp_path / "metrics"), prefix="game")
+    with open(path) as f:
+        assert json.load(f)["stages_ms"]["parse"]["count"] == 1
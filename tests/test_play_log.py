@@ -0,0 +1,55 @@
+# tests/test_play_log.py
+from play_log import PlayLog
+
+
+class FakeText:
+    # Just enough of tk.Text: whole lines, "end" inserts and "N.0" deletes
+    def __init__(self):
+        self.lines = []
+        self.inserts = 0
+
+    def config(self, **kwargs):
+        pass
+
+    def insert(self, index, chunk):
+        self.inserts += 1
+        self.lines.extend(chunk.splitlines())
+
+    def delete(self, start, end):
+        del self.lines[int(start.split(".")[0]) - 1:int(end.split(".")[0]) - 1]
+
+    def see(self, index):
+        pass
+
+
+def test_flush_draws_pending_lines_in_one_insert():
+    text = FakeText()
+    log = PlayLog(text, visible=10, capacity=100)
+    for i in range(3):
+        log.add(f"event {i}")
+    assert log.flush() == 3
+    assert text.inserts == 1
+    assert text.lines == ["> event 0", "> event 1", "> event 2"]
+    assert log.flush() == 0
+
+
+def test_widget_is_trimmed_to_visible_lines():
+    text = FakeText()
+    log = PlayLog(text, visible=3, capacity=100)
+    for i in range(5):
+        log.add(f"event {i}")
+        log.flush()
+    assert text.lines == ["> event 2", "> event 3", "> event 4"]
+    assert log.shown == 3
+
+
+def test_history_is_a_bounded_ring_and_drops_are_counted():
+    text = FakeText()
+    log = PlayLog(text, visible=2, capacity=4)
+    for i in range(6):
+        log.add(f"event {i}")
+    assert log.lines() == ["event 2", "event 3", "event 4", "event 5"]
+    assert len(log) == 4
+    assert log.dropped == 4       # only the last `visible` pending lines get drawn
+    log.flush()
+    assert text.lines == ["> event 4", "> event 5"]
@@ -0,0 +1,67 @@
+# tests/test_profiling.py
+import cProfile
+import sys
+import threading
+import tracemalloc
+
+import pytest
+
+import profiling
+from profiling import GameProfiler
+
+
+class FakeWidget:
+    def __init__(self):
+        self.pending = set()
+
+    def after(self, ms, callback):
+        self.pending.add(callback)
+        return callback
+
+    def after_cancel(self, after_id):
+        self.pending.discard(after_id)
+
+
+class FakeUDP:
+    def __init__(self):
+        self.profile = None
+
+    def profile_receiver(self, profile):
+        self.profile = profile
+        switched = threading.Event()
+        switched.set()
+        return switched
+
+
+def test_failed_first_snapshot_switches_everything_back_off(tmp_path, monkeypatch):
+    def full_disk(self, path):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(tracemalloc.Snapshot, "dump", full_disk)
+    monkeypatch.setattr(profiling, "SEPARATE_THREAD_PROFILES", True)
+    profiler = GameProfiler(str(tmp_path))
+    udp = FakeUDP()
+    with pytest.raises(OSError):
+        profiler.start(FakeWidget(), udp)
+
+    assert not profiler.running
+    assert not tracemalloc.is_tracing()
+    assert udp.profile is None
+    if sys.version_info < (3, 12):
+        assert sys.getprofile() is None
+    probe = cProfile.Profile()     # 3.12+ refuses this while another profile is on
+    probe.enable()
+    probe.disable()
+    assert profiler.stop() == []
+
+
+def test_profiled_game_writes_its_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "SEPARATE_THREAD_PROFILES", True)
+    profiler = GameProfiler(str(tmp_path), snapshot_interval=0.01)
+    widget = FakeWidget()
+    profiler.start(widget, FakeUDP())
+    sorted(range(1000))
+    files = profiler.stop()
+    assert not tracemalloc.is_tracing()
+    assert any(f.endswith("-tk.prof") for f in files)
+    assert any(f.endswith("-mem.txt") for f in files)
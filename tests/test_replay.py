@@ -0,0 +1,75 @@
+# tests/test_replay.py
+# parse -> score -> journal -> replay, the same path ui_app and replay.py use
+import wire
+from journal import Journal, OUTCOMES, IGNORED, read_journal
+from replay import load_journal_events, replay, compare_scores, main
+from roster import PlayerRow
+from score_engine import ScoreEngine
+
+ADDR = ("10.0.0.5", 7500)
+
+
+def record_game(path):
+    # A short live game: hits decoded from raw datagrams, scored and journaled
+    engine = ScoreEngine({
+        "Red": [PlayerRow(1, "alpha", 11), PlayerRow(2, "bravo", 12)],
+        "Green": [PlayerRow(3, "charlie", 21)],
+    })
+    j = Journal(path, fsync_interval=0.05)
+    j.write_meta(roster=engine.roster(),
+                 base_codes={str(k): v for k, v in engine.base_codes.items()})
+    decoder = wire.WireDecoder(accept_binary=True)
+
+    j.record(ADDR, 11, 21, IGNORED)     # before the game starts: not scored
+    engine.start_game()
+    datagrams = [
+        wire.encode_text(11, 21),
+        wire.encode_text(21, 11),
+        wire.encode_text(11, 12),                   # friendly fire
+        wire.encode_text(21, 53),                   # green on the red base
+        wire.encode_text(12, 53),                   # red on its own base
+        b"99999999999:1",                           # oversized, unknown
+        b"garbage",
+        wire.encode_events([(11, 21), (12, 21), (0xFFFFFFFF, 43)], sequence=0),
+    ]
+    for ns, data in enumerate(datagrams, 1):
+        for first, second in decoder.decode(data, ADDR):
+            result = engine.apply(first, second)
+            j.record(ADDR, first, second, OUTCOMES[result.kind], monotonic_ns=ns * 1_000_000)
+    j.write_meta(final_scores=engine.scores(), totals=engine.totals)
+    j.close()
+    return engine
+
+
+def test_replay_reproduces_the_recorded_game(tmp_path):
+    path = str(tmp_path / "game.pjl")
+    live = record_game(path)
+
+    assert len(list(read_journal(path))) == 10
+    events = load_journal_events(path)
+    assert len(events) == 9                 # the IGNORED hit is skipped
+    assert events[0][0] == 0.0
+
+    engine, mismatches, _ = replay(events, live.roster(), {53: "Red", 43: "Green"})
+    assert mismatches == []
+    assert engine.totals == live.totals
+    assert compare_scores(engine, live.scores()) == []
+
+
+def test_replay_cli_checks_the_sidecar(tmp_path, capsys):
+    path = str(tmp_path / "game.pjl")
+    record_game(path)
+    assert main([path, "--fast"]) == 0
+    assert '"outcome_mismatches": 0' in capsys.readouterr().out
+
+
+def test_replay_cli_flags_changed_scores(tmp_path, capsys):
+    import json
+    path = str(tmp_path / "game.pjl")
+    record_game(path)
+    with open(path + ".json") as f:
+        meta = json.load(f)
+    meta["final_scores"][0][1] += 1
+    with open(path + ".json", "w") as f:
+        json.dump(meta, f)
+    assert main([path, "--fast"]) == 1
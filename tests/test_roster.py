@@ -0,0 +1,65 @@
+# tests/test_roster.py
+from config import TeamConfig
+from roster import Roster, team_base_codes
+
+
+def make_roster():
+    return Roster([TeamConfig("Red", base_code=53, max_players=2),
+                   TeamConfig("Blue", base_code=63),
+                   TeamConfig("Green", base_code=None)])
+
+
+def test_default_roster_is_red_vs_green():
+    roster = Roster()
+    assert roster.names == ["Red", "Green"]
+    assert roster.base_codes() == {53: "Red", 43: "Green"}
+
+
+def test_duplicate_ids_are_rejected_across_teams():
+    roster = make_roster()
+    assert roster.check("Red", 1, 11) is None
+    roster.add("Red", 1, "alpha", 11)
+    assert roster.check("Blue", 1, 12)[0] == "Duplicate Player"
+    assert roster.check("Blue", 2, 11)[0] == "Duplicate Hardware"
+    assert "Red" in roster.check("Blue", 2, 11)[1]
+
+
+def test_base_and_control_codes_are_reserved():
+    roster = make_roster()
+    assert roster.check("Blue", 2, 63) == ("Reserved Hardware", "Hardware ID 63 is the Blue base")
+    assert roster.check("Blue", 2, 221)[0] == "Reserved Hardware"
+    assert roster.check("Blue", 2, 43) is None        # 43 isn't a base here
+
+
+def test_per_team_limits_and_unknown_teams():
+    roster = make_roster()
+    roster.add("Red", 1, "a", 11)
+    roster.add("Red", 2, "b", 12)
+    assert roster.check("Red", 3, 13) == ("Team Full", "Red team is full.")
+    assert roster.check("Blue", 3, 13) is None
+    assert roster.check("Pink", 3, 13)[0] == "Unknown Team"
+
+
+def test_clear_resets_teams_and_indexes():
+    roster = make_roster()
+    roster.add("Blue", 1, "a", 11)
+    assert len(roster) == 1
+    roster.clear()
+    assert len(roster) == 0
+    assert roster.teams == {"Red": [], "Blue": [], "Green": []}
+    assert roster.check("Blue", 1, 11) is None
+
+
+def test_hundreds_of_players():
+    roster = Roster([TeamConfig(f"team{t}", base_code=60 + t, max_players=100) for t in range(6)])
+    for i in range(600):
+        team = f"team{i % 6}"
+        assert roster.check(team, 5000 + i, 1000 + i) is None
+        roster.add(team, 5000 + i, f"p{i}", 1000 + i)
+    assert len(roster) == 600
+    assert all(len(players) == 100 for players in roster.teams.values())
+    assert roster.check("team0", 9999, 9999)[0] == "Team Full"
+
+
+def test_team_base_codes_skips_teams_without_a_base():
+    assert team_base_codes(make_roster().configs.values()) == {53: "Red", 63: "Blue"}
@@ -0,0 +1,79 @@
+# tests/test_score_engine.py
+from score_engine import (ScoreEngine, TAG, FRIENDLY_FIRE, BASE, BASE_NO_SCORE, UNKNOWN,
+                          TAG_POINTS, FRIENDLY_FIRE_PENALTY, BASE_POINTS)
+from roster import PlayerRow
+
+
+def make_engine():
+    return ScoreEngine({
+        "Red": [PlayerRow(1, "alpha", 11), PlayerRow(2, "bravo", 12)],
+        "Green": [PlayerRow(3, "charlie", 21)],
+    })
+
+
+def test_tag_scores_attacker_and_broadcasts_target():
+    engine = make_engine()
+    result = engine.apply(11, 21)
+    assert result.kind == TAG
+    assert result.broadcast == (21,)
+    assert engine.find(11).score == TAG_POINTS
+    assert engine.find(21).times_tagged == 1
+    assert engine.team_total("Red") == TAG_POINTS
+
+
+def test_friendly_fire_penalises_both_players():
+    engine = make_engine()
+    result = engine.apply(11, 12)
+    assert result.kind == FRIENDLY_FIRE
+    assert result.broadcast == (11, 12)
+    assert engine.find(11).score == engine.find(12).score == -FRIENDLY_FIRE_PENALTY
+    assert engine.team_total("Red") == -2 * FRIENDLY_FIRE_PENALTY
+
+
+def test_base_hits_only_score_on_the_other_teams_base():
+    engine = make_engine()
+    assert engine.apply(11, 43).kind == BASE          # red on the green base
+    assert engine.apply(11, 53).kind == BASE_NO_SCORE  # red on its own base
+    assert engine.find(11).score == BASE_POINTS
+    assert engine.find(11).base_hits == 1
+
+
+def test_unknown_equipment_changes_nothing():
+    engine = make_engine()
+    result = engine.apply(99, 21)
+    assert result.kind == UNKNOWN
+    assert not result.scored
+    assert engine.totals == {"Red": 0, "Green": 0}
+
+
+def test_custom_base_codes_and_extra_teams():
+    engine = ScoreEngine({"Red": [PlayerRow(1, "a", 1)], "Blue": [PlayerRow(2, "b", 2)],
+                          "Green": []},
+                         base_codes={53: "Red", 63: "Blue", 43: "Green"})
+    assert engine.apply(1, 63).kind == BASE
+    assert engine.apply(2, 43).kind == BASE
+    assert engine.apply(2, 99).kind == UNKNOWN      # 99 is neither a base nor a player
+    assert engine.totals == {"Red": BASE_POINTS, "Blue": BASE_POINTS, "Green": 0}
+
+
+def test_winner_is_none_on_a_tie():
+    engine = make_engine()
+    assert engine.winner() is None
+    engine.apply(11, 21)
+    assert engine.winner() == "Red"
+
+
+def test_roster_round_trip_and_result_snapshot():
+    engine = make_engine()
+    engine.start_game()
+    engine.apply(11, 21)
+    rebuilt = ScoreEngine.from_roster(engine.roster())
+    assert rebuilt.roster() == engine.roster()
+
+    result = engine.result()
+    assert result.totals == {"Red": TAG_POINTS, "Green": 0}
+    assert [e[1] for e in result.events] == [TAG]
+    assert result.game_key and result.game_key != engine.result().game_key
+    # the snapshot is a copy: later hits don't change it
+    engine.apply(11, 21)
+    assert sum(p.score for p in result.players) == TAG_POINTS
@@ -0,0 +1,74 @@
+# tests/test_udp_comm.py
+import socket
+import time
+
+import pytest
+
+from config import AppConfig
+from udp_comm import UDPComm
+
+
+class RefusingProfile:
+    # What cProfile does on 3.12+ when another profile is already enabled
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+    def disable(self):
+        pass
+
+
+class CountingProfile:
+    def __init__(self):
+        self.enabled = 0
+        self.disabled = 0
+
+    def enable(self):
+        self.enabled += 1
+
+    def disable(self):
+        self.disabled += 1
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def udp():
+    port = free_port()
+    comm = UDPComm(AppConfig(udp_receive_port=port, udp_send_port=free_port()))
+    comm.start_receiver()
+    comm.port = port
+    yield comm
+    comm.close()
+
+
+def receive(udp, payload, timeout=2.0):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx:
+        tx.sendto(payload, ("127.0.0.1", udp.port))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        messages = udp.drain_messages()
+        if messages:
+            return [data for data, addr in messages]
+        time.sleep(0.01)
+    return []
+
+
+def test_receiver_survives_a_profile_that_will_not_enable(udp, capsys):
+    assert udp.profile_receiver(RefusingProfile()).wait(2)
+    assert receive(udp, b"1:2") == [b"1:2"]
+    assert udp._thread.is_alive()
+    assert "Could not profile" in capsys.readouterr().out
+
+
+def test_profile_switch_is_confirmed_even_when_idle(udp):
+    profile = CountingProfile()
+    assert udp.profile_receiver(profile).wait(2)
+    assert profile.enabled == 1
+    # no traffic: the receiver still lets go of the profile before we read it
+    assert udp.profile_receiver(None).wait(2)
+    assert profile.disabled == 1
+    assert receive(udp, b"3:4") == [b"3:4"]
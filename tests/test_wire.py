@@ -0,0 +1,70 @@
+# tests/test_wire.py
+import wire
+from wire import SequenceTracker, WireDecoder
+
+ADDR = ("10.0.0.5", 7500)
+
+
+def test_text_round_trip_and_malformed():
+    assert wire.decode_text(wire.encode_text(12, 43)) == [(12, 43)]
+    assert wire.decode_text(b" 7 : 9 ") == [(7, 9)]
+    assert wire.decode_text(b"7") == []
+    assert wire.decode_text(b"a:b") == []
+
+
+def test_binary_round_trip():
+    events = [(1, 2), (3, 4), (0xFFFFFFFF, 43)]
+    header, decoded = wire.decode_binary(wire.encode_events(events, sequence=9, timestamp_us=1))
+    assert header[2] == 3 and header[3] == 9
+    assert decoded == events
+
+
+def test_binary_with_wrong_length_is_rejected():
+    data = wire.encode_events([(1, 2)], sequence=0)
+    assert wire.decode_binary(data[:-1]) == (None, [])
+
+
+def test_decoder_only_accepts_binary_when_enabled():
+    data = wire.encode_events([(1, 2)], sequence=0)
+    text_only = WireDecoder()
+    assert text_only.decode(data, ADDR) == []
+    assert text_only.stats()["malformed"] == 1
+    assert WireDecoder(accept_binary=True).decode(data, ADDR) == [(1, 2)]
+
+
+def observe_all(tracker, sequences, addr=ADDR):
+    for seq in sequences:
+        tracker.observe(addr, seq)
+    return tracker.stats()
+
+
+def test_gap_counts_as_lost_until_the_packet_turns_up():
+    stats = observe_all(SequenceTracker(), [0, 1, 4])
+    assert stats["lost"] == 2
+    stats = observe_all(SequenceTracker(), [0, 1, 4, 2])
+    assert (stats["lost"], stats["reordered"], stats["duplicates"]) == (1, 1, 0)
+
+
+def test_duplicates_leave_loss_alone():
+    # 2 is lost for good; the repeated 1 and 3 must not "find" it
+    stats = observe_all(SequenceTracker(), [0, 1, 1, 3, 3, 1])
+    assert (stats["lost"], stats["reordered"], stats["duplicates"]) == (1, 0, 3)
+
+
+def test_late_packet_counted_once():
+    stats = observe_all(SequenceTracker(), [0, 2, 1, 1])
+    assert (stats["lost"], stats["reordered"], stats["duplicates"]) == (0, 1, 1)
+
+
+def test_sequence_wraps_around():
+    stats = observe_all(SequenceTracker(), [0xFFFFFFFE, 0xFFFFFFFF, 0, 1])
+    assert stats["lost"] == 0 and stats["duplicates"] == 0
+
+
+def test_senders_are_tracked_separately():
+    tracker = SequenceTracker()
+    tracker.observe(("a", 1), 0)
+    tracker.observe(("b", 1), 5)
+    tracker.observe(("a", 1), 1)
+    assert tracker.stats()["lost"] == 0
+    assert tracker.stats()["senders"] == 2
@@ -1,25 +1,49 @@
 # udp_comm.py
+import queue
+import select
 import socket
 import threading
-from typing import Callable
+import time
 from config import AppConfig
+from metrics import DISABLED
+from udp_sender import UDPSender
+
+# Linux lets us do a non-blocking read without flipping the socket mode
+_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0)
+
+# Receiver wakes at least this often with no traffic (s), so it can pick up
+# profiling changes and stop requests
+RECEIVER_IDLE_WAKE = 0.25
+
 
 class UDPComm:
     
-    def __init__(self, cfg: AppConfig):
+    def __init__(self, cfg: AppConfig, metrics=DISABLED):
         self.cfg = cfg
         
         # Sender socket
         self.tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.tx.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self.tx.settimeout(cfg.udp_send_timeout)
+        
+        # Sends happen on the sender thread, callers only enqueue
+        self.sender = UDPSender(self._sendto, repeats=cfg.udp_code_repeats,
+                                batch=cfg.udp_send_batch, max_backlog=cfg.udp_send_backlog)
         
         # Receiver socket: bind to any interface so it can receive from any IP
         self.rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.rx.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.rx.bind(("0.0.0.0", cfg.udp_receive_port))
         
+        # Receiver thread puts batches of (data, addr) here, UI drains them
+        self.inbox = queue.SimpleQueue()   # (perf_counter_ns received, [(data, addr), ...])
+        self.metrics = metrics
+        
         self._stop = threading.Event()
         self._thread = None
+        # (cProfile.Profile or None, Event) the receiver thread should switch to
+        # (profiling.py); the event is set once it has
+        self._profile_request = (None, threading.Event())
     
     @property
     def target_ip(self) -> str:
@@ -33,32 +57,105 @@ class UDPComm:
     
     def send_equipment_id(self, equipment_id: int) -> None:
         # Broadcast equipment id after player addition
+        # Queued for the sender thread, so this never blocks the UI
+        self.sender.send(equipment_id)
+    
+    def send_stats(self) -> dict:
+        return self.sender.stats()
+    
+    def _sendto(self, equipment_id: int) -> None:
         # Transmission format is a single integer
         payload = str(equipment_id).encode("utf-8")
         self.tx.sendto(payload, (self.cfg.udp_target_ip, self.cfg.udp_send_port))
         
-    def start_receiver(self, on_message: Callable[[str, tuple], None]) -> None:
-        # Tests by calling on_message(payload_str, addr)
+    def start_receiver(self) -> None:
+        # Receiver thread blocks for the first datagram, then drains
+        # everything else already waiting and queues it as one batch
         if self._thread and self._thread.is_alive():
             return
         
         self._stop.clear()
         
         def loop():
+            max_batch = self.cfg.udp_max_batch
+            active = None
+            current = None      # profile request last applied
             while not self._stop.is_set():
+                if self._profile_request is not current:
+                    current = self._profile_request
+                    active = self._switch_profile(active, current)
                 try:
-                    data, addr = self.rx.recvfrom(2048)
-                    msg = data.decode("utf-8", errors="replace").strip()
-                    on_message(msg, addr)
-                except OSError:
+                    # One select per batch; idle wakeups fall through to the checks above
+                    if not select.select([self.rx], [], [], RECEIVER_IDLE_WAKE)[0]:
+                        continue
+                    batch = [self.rx.recvfrom(2048)]
+                except (OSError, ValueError):
                     break
+                while _DONTWAIT and len(batch) < max_batch:
+                    try:
+                        batch.append(self.rx.recvfrom(2048, _DONTWAIT))
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        self._stop.set()
+                        break
+                self.inbox.put((time.perf_counter_ns(), batch))
+            self._switch_profile(active, (None, self._profile_request[1]))
         self._thread = threading.Thread(target=loop, daemon=True)
         self._thread.start()
     
+    def _switch_profile(self, active, request):
+        # Receiver thread only. Profiling must never take the receiver down, so
+        # a profile that won't enable (another profiler already active) is dropped
+        target, switched = request
+        if active is not None:
+            try:
+                active.disable()
+            except Exception:
+                pass
+        if target is not None:
+            try:
+                target.enable()
+            except Exception as e:
+                print(f"[WARNING] Could not profile the UDP receiver.\n{e}")
+                target = None
+        switched.set()
+        return target
+
+    def profile_receiver(self, profile) -> threading.Event:
+        # Run the receiver thread under `profile` (None to stop); cProfile only
+        # sees the thread that enabled it, so the switch happens on that thread
+        # between batches (within RECEIVER_IDLE_WAKE when idle). Wait on the
+        # returned event before reading the profile's stats.
+        switched = threading.Event()
+        self._profile_request = (profile, switched)
+        if self._thread is None or not self._thread.is_alive():
+            switched.set()
+        return switched
+
+    def drain_messages(self, limit: int = 0) -> list:
+        # Called from the Tk thread: returns every queued (data, addr) pair
+        # Stops after roughly `limit` datagrams when limit > 0
+        messages = []
+        metrics = self.metrics
+        while not limit or len(messages) < limit:
+            try:
+                received_ns, batch = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            messages.extend(batch)
+            if metrics.enabled:
+                # Receiver thread -> Tk thread hand-off, including after() delay
+                metrics.since("udp_queue", received_ns)
+        if metrics.enabled:
+            metrics.gauge("udp_inbox_batches", self.inbox.qsize())
+        return messages
+    
     def close(self):
         self._stop.set()
+        self.sender.close()
         try:
             self.rx.close()
         finally:
             self.tx.close()
-            
\ No newline at end of file
+            
@@ -0,0 +1,83 @@
+# udp_sender.py
+import queue
+import threading
+from typing import Callable
+
+_STOP = object()
+
+
+class UDPSender:
+    # Outbound queue serviced by its own thread so the Tk thread never waits on sendto
+    # Control codes listed in `repeats` (e.g. 221) are sent that many times and
+    # duplicates queued in the same wakeup are coalesced into one burst
+
+    def __init__(self, send: Callable[[int], None], repeats: dict = None,
+                 batch: int = 32, max_backlog: int = 1024):
+        self._send = send
+        self.repeats = dict(repeats or {})
+        self.batch = batch
+        self.max_backlog = max_backlog
+
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def send(self, code: int) -> bool:
+        # Never blocks; returns False if the backlog is full and the code was dropped
+        if self._queue.qsize() >= self.max_backlog:
+            self.dropped += 1
+            return False
+        self.queued += 1
+        self._queue.put(code)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "backlog": self.backlog,
+        }
+
+    def _loop(self):
+        while True:
+            codes = [self._queue.get()]
+            while len(codes) < self.batch:
+                try:
+                    codes.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            seen = set()
+            for code in codes:
+                if code is _STOP:
+                    stop = True
+                    continue
+                if code in self.repeats:
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                for _ in range(self.repeats.get(code, 1)):
+                    try:
+                        self._send(code)
+                        self.sent += 1
+                    except OSError:
+                        self.failed += 1
+            if stop:
+                return
+
+    def close(self, timeout: float = 1.0) -> None:
+        # Lets already queued codes go out (e.g. the final 221s) before stopping
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
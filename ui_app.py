@@ -1,27 +1,79 @@
 import os
+import time
 import tkinter as tk
 from tkinter import ttk
 
-from splash import SplashScreen
+from splash import SplashScreen, LOGO_SIZE
 from entry_screen import PlayerEntryScreen
-from play_action_screen import PlayActionScreen
+from play_action_screen import PlayActionScreen, BASE_ICON
+from startup import Startup
+from assets import AssetStore
+from music import MusicPlayer
+from metrics import Metrics
 
 from config import AppConfig
-from db import PlayerDB
+from db import PlayerDB, player_profile
+from codename_cache import CachedPlayerDB
+from db_worker import DBWorker
 from udp_comm import UDPComm
+from wire import WireDecoder
+from journal import IGNORED, Journal, new_journal_path
 
 
 class MockDB:
     def __init__(self):
         self.data = {}
+        self.games = []
 
     def get_codename(self, player_id: int):
         return self.data.get(player_id)
 
+    def get_all_players(self):
+        return list(self.data.items())
+
+    def get_codenames(self, player_ids):
+        return {pid: self.data[pid] for pid in player_ids if pid in self.data}
+
     def add_player(self, player_id: int, codename: str):
         self.data[player_id] = codename
         print(f"[MOCK DB] added {player_id} -> {codename}")
 
+    def queue_player(self, player_id: int, codename: str):
+        self.add_player(player_id, codename)
+
+    def get_player_profile(self, player_id: int):
+        if player_id not in self.data:
+            return None
+        return player_profile(player_id, self.data[player_id], *self.career(player_id))
+
+    def get_leaderboard(self, metric="tags", limit=10):
+        profiles = [self.get_player_profile(pid) for pid in self.data]
+        profiles = [p for p in profiles if p["games"]]
+        profiles.sort(key=lambda p: p[metric], reverse=True)
+        return profiles[:limit]
+
+    def career(self, player_id):
+        # games, wins, points, tags, times_tagged, base_hits, friendly_fire
+        totals = [0] * 7
+        for game in self.games:
+            for p in game.players:
+                if p.player_id == player_id:
+                    row = (1, int(p.team == game.winner), p.score, p.tags,
+                           p.times_tagged, p.base_hits, p.friendly_fire)
+                    totals = [a + b for a, b in zip(totals, row)]
+        return totals
+
+    def save_game_results(self, result):
+        for game_id, game in enumerate(self.games, 1):
+            if game.game_key == result.game_key:
+                return game_id
+        self.games.append(result)
+        print(f"[MOCK DB] saved game {len(self.games)}: {result.totals}, {len(result.events)} events")
+        return len(self.games)
+
+    def flush_pending(self):
+        return 0
+
     def close(self):
         pass
 
@@ -37,17 +89,29 @@ class MockUDP:
     def send_equipment_id(self, equipment_id: int):
         print(f"[MOCK UDP] sent equipment id {equipment_id} to {self.target_ip}:7500")
 
-    def start_receiver(self, on_message):
+    def start_receiver(self):
         print("[MOCK UDP] receiver started")
 
+    def drain_messages(self, limit=0):
+        return []
+
     def close(self):
         pass
 
 
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(APP_DIR, "assets")
 LOGO_PATH = os.path.join(ASSETS_DIR, "logo.png")
 if not os.path.exists(LOGO_PATH):
     LOGO_PATH = os.path.join(ASSETS_DIR, "logo.jpg")
+LOGO_NAME = os.path.basename(LOGO_PATH)
+
+
+def make_udp(cfg, metrics):
+    if cfg.udp_backend == "asyncio":
+        from async_udp_comm import AsyncUDPComm   # asyncio is only imported when used
+        return AsyncUDPComm(cfg, metrics)
+    return UDPComm(cfg, metrics)
 
 
 def center_window(win, w=1100, h=650):
@@ -57,19 +121,10 @@ def center_window(win, w=1100, h=650):
     win.geometry(f"{w}x{h}+{x}+{y}")
 
 
-def main():
-    root = tk.Tk()
-    root.title("Photon - Sprint 4")
-
-    style = ttk.Style()
-    try:
-        style.theme_use("clam")
-    except Exception:
-        pass
-
-    root.withdraw()
-    cfg = AppConfig()
+# Startup tasks: each runs on a startup thread while the splash is showing and
+# falls back (MockDB, MockUDP, no music) instead of raising
 
+def connect_db(cfg):
     try:
         db = PlayerDB(cfg)
         print("[INFO] Connected to real PostgreSQL database.")
@@ -77,17 +132,88 @@ def main():
         print(f"[WARNING] Could not connect to PostgreSQL. Using MockDB instead.\n{e}")
         db = MockDB()
 
+    db = CachedPlayerDB(db, max_entries=cfg.codename_cache_size, ttl=cfg.codename_cache_ttl)
+    if cfg.codename_preload:
+        try:
+            print(f"[INFO] Preloaded {db.preload()} codenames.")
+        except Exception as e:
+            print(f"[WARNING] Could not preload codenames.\n{e}")
+    return db
+
+
+def open_udp(cfg, metrics):
     try:
-        udp = UDPComm(cfg)
-        print("[INFO] UDP initialized.")
+        udp = make_udp(cfg, metrics)
+        print(f"[INFO] UDP initialized ({cfg.udp_backend}).")
     except Exception as e:
         print(f"[WARNING] Could not initialize UDP. Using MockUDP instead.\n{e}")
         udp = MockUDP()
+    return udp
+
+
+def load_assets(assets):
+    # Decodes every image once and lists the music folder; returns the splash logo
+    assets.load(LOGO_NAME, BASE_ICON)
+    return assets.image(LOGO_NAME, LOGO_SIZE)
+
+
+def main(cfg=None, db=None, assets=None, title="Photon - Sprint 4"):
+    # cfg/db/assets can be injected (arenas.py runs one of these per arena with
+    # a shared database and asset cache); anything not given is created here
+    root = tk.Tk()
+    root.title(title)
+
+    style = ttk.Style()
+    try:
+        style.theme_use("clam")
+    except Exception:
+        pass
+
+    root.withdraw()
+    cfg = cfg if cfg is not None else AppConfig()
+    owns_db = db is None
+
+    # Everything slow happens here, in parallel, while the splash is up
+    startup = Startup()
+    if owns_db:
+        startup.add("db", connect_db, cfg)
+    metrics = Metrics(enabled=cfg.metrics_enabled)
+    startup.add("udp", open_udp, cfg, metrics)
+    if assets is None:
+        assets = AssetStore(ASSETS_DIR)
+    music = MusicPlayer(root, assets)
+    startup.add("mixer", music.init)
+    logo = startup.add("assets", load_assets, assets)
+
+    def after_splash():
+        print(f"[INFO] Startup: {startup.report()}")
+        root.deiconify()
+        run_app(root, cfg, startup.result("db") if owns_db else db, startup.result("udp"),
+                assets, music, metrics, owns_db)
+
+    root._splash = SplashScreen(root, logo, on_done=after_splash,
+                                ms=cfg.splash_min_ms, ready=startup.done)
+    root.mainloop()
+
+
+def run_app(root, cfg, db, udp, assets, music, metrics, owns_db=True):
+    # Builds the screens and timers around services that are already connected
+    # A shared db (owns_db=False) is flushed on exit but left open for the others
+    # Every query after this point runs on the worker, never on the Tk thread
+    db_worker = DBWorker(root, workers=max(1, cfg.db_pool_max - 1))
 
     container = ttk.Frame(root)
     container.pack(fill="both", expand=True)
 
+    # Play action screen currently receiving hits (None on the entry screen)
+    # Hits with no game screen up go to an "idle" journal as IGNORED, opened
+    # on the first such hit and closed when the next game starts (False if it
+    # couldn't be opened, so we don't retry every pump)
+    current = {"screen": None, "idle_journal": None}
+
     def clear_container():
+        stop_profiling()    # game abandoned before end_game
+        current["screen"] = None
         for widget in container.winfo_children():
             widget.destroy()
 
@@ -99,48 +225,165 @@ def main():
             container,
             db=db,
             udp=udp,
-            on_start_game=show_play_action
+            on_start_game=show_play_action,
+            db_worker=db_worker,
+            teams=cfg.teams
         )
         screen.pack(fill="both", expand=True)
 
-    def show_play_action(red_players, green_players):
+    # Game profiling: every game when cfg.profile_games, otherwise F4 arms the next one
+    profiling = {"armed": cfg.profile_games, "active": None}
+
+    def toggle_profiling(event=None):
+        profiling["armed"] = not profiling["armed"]
+        print(f"[INFO] Profiling {'armed for the next game' if profiling['armed'] else 'off'}.")
+
+    def start_profiling():
+        if not profiling["armed"]:
+            return
+        from profiling import GameProfiler
+        profiler = GameProfiler(os.path.join(APP_DIR, cfg.profile_dir), cfg.profile_snapshot_interval)
+        try:
+            profiler.start(root, udp)
+        except Exception as e:
+            print(f"[WARNING] Could not start profiling.\n{e}")
+            return
+        profiling["active"] = profiler
+        profiling["armed"] = cfg.profile_games
+        print(f"[INFO] Profiling this game to {profiler.prefix}-*")
+
+    def stop_profiling():
+        profiler, profiling["active"] = profiling["active"], None
+        if profiler is None:
+            return
+        try:
+            files = profiler.stop()
+            print(f"[INFO] Wrote {len(files)} profile files to {profiler.prefix}-*")
+        except Exception as e:
+            print(f"[WARNING] Could not write game profile.\n{e}")
+
+    root.bind("<F4>", toggle_profiling)
+
+    def save_results(result):
+        stop_profiling()
+        if metrics.enabled:
+            try:
+                print(f"[INFO] Game metrics written to {metrics.dump(os.path.join(APP_DIR, cfg.metrics_dir))}")
+            except OSError as e:
+                print(f"[WARNING] Could not write game metrics.\n{e}")
+        db_worker.submit(db.save_game_results, result,
+                         on_done=lambda game_id: print(f"[INFO] Saved game {game_id}."),
+                         on_error=lambda e: print(f"[WARNING] Could not save game results.\n{e}"))
+
+    def close_idle_journal():
+        journal, current["idle_journal"] = current["idle_journal"], None
+        if journal:
+            journal.close()
+
+    def journal_idle_hits(events):
+        journal = current["idle_journal"]
+        if not cfg.journal_enabled or journal is False:
+            return
+        if journal is None:
+            try:
+                journal = Journal(new_journal_path(os.path.join(APP_DIR, cfg.journal_dir), "idle"),
+                                  fsync_interval=cfg.journal_fsync_interval)
+            except OSError as e:
+                print(f"[WARNING] Could not open idle journal, hits outside a game will not be recorded.\n{e}")
+                current["idle_journal"] = False
+                return
+            current["idle_journal"] = journal
+            print(f"[INFO] Journaling hits received outside a game to {journal.path}")
+        for first, second, addr in events:
+            journal.record(addr, first, second, IGNORED)
+
+    def show_play_action(teams):
         clear_container()
+        close_idle_journal()
+        metrics.reset()   # one game per snapshot
         center_window(root, 1100, 650)
 
+        journal = None
+        if cfg.journal_enabled:
+            try:
+                journal = Journal(new_journal_path(os.path.join(APP_DIR, cfg.journal_dir)),
+                                  fsync_interval=cfg.journal_fsync_interval)
+                print(f"[INFO] Journaling hits to {journal.path}")
+            except OSError as e:
+                print(f"[WARNING] Could not open game journal, hits will not be recorded.\n{e}")
+
         screen = PlayActionScreen(
             container,
-            red_players=red_players,
-            green_players=green_players,
+            teams=teams,
             udp=udp,
-            on_back=show_entry
+            on_back=show_entry,
+            render_hz=cfg.render_hz,
+            play_log_lines=cfg.play_log_lines,
+            play_log_capacity=cfg.play_log_capacity,
+            journal=journal,
+            on_game_end=save_results,
+            assets=assets,
+            music=music,
+            metrics=metrics,
+            team_configs=cfg.teams
         )
         screen.pack(fill="both", expand=True)
+        start_profiling()   # countdown through end_game
         screen.start_countdown()
 
-        def handle_udp_message(msg, addr):
-            print(f"[UDP RECEIVED] {msg} from {addr}")
-
-            parts = msg.split(":")
-            if len(parts) != 2:
-                return
-
-            try:
-                first = int(parts[0].strip())
-                second = int(parts[1].strip())
-            except ValueError:
-                return
-
-            if second in (43, 53):
-                root.after(0, lambda: screen.record_base_hit(first, second))
-            else:
-                root.after(0, lambda: screen.record_hit(first, second))
-
-        if hasattr(udp, "start_receiver"):
-            udp.start_receiver(handle_udp_message)
+        current["screen"] = screen
+
+    # Text "attacker:target" always; binary frames when cfg.wire_format == "binary"
+    decoder = WireDecoder(accept_binary=cfg.wire_format == "binary")
+
+    pump_due = [0]
+
+    def pump_udp():
+        # One Tk callback per pump interval, no matter how many hits arrived
+        m = metrics
+        if m.enabled:
+            t = time.perf_counter_ns()
+            if pump_due[0]:
+                # How late Tk ran this pump (a busy UI thread shows up here)
+                m.observe("pump_late", max(0, t - pump_due[0]))
+
+        messages = udp.drain_messages(cfg.udp_max_batch * 4)
+        if messages:
+            if m.enabled:
+                t = m.since("drain", t)
+            events = []
+            for data, addr in messages:
+                for first, second in decoder.decode(data, addr):
+                    events.append((first, second, addr))
+            if m.enabled:
+                m.since("parse", t)
+                m.gauge("pump_datagrams", len(messages))
+                m.count("datagrams", len(messages))
+                m.count("events", len(events))
+            if cfg.udp_debug:
+                for first, second, addr in events:
+                    print(f"[UDP RECEIVED] {first}:{second} from {addr}")
+
+            screen = current["screen"]
+            if events and screen is not None and screen.winfo_exists():
+                screen.apply_events(events)
+            elif events:
+                journal_idle_hits(events)
+
+        if m.enabled:
+            pump_due[0] = time.perf_counter_ns() + cfg.udp_pump_ms * 1_000_000
+        root.after(cfg.udp_pump_ms, pump_udp)
 
     def on_close():
+        print(f"[INFO] UDP receive stats: {decoder.stats()}")
+        db_worker.shutdown(wait=False)
+        music.close()
+        close_idle_journal()
         try:
-            db.close()
+            if owns_db:
+                db.close()
+            else:
+                db.flush_pending()
         except Exception:
             pass
         try:
@@ -151,13 +394,29 @@ def main():
 
     root.protocol("WM_DELETE_WINDOW", on_close)
 
-    def after_splash():
-        root.deiconify()
-        show_entry()
+    # Counters owned by other components, shown in the overlay and snapshots
+    metrics.add_source("decoder", decoder.stats)
+    if hasattr(udp, "send_stats"):
+        metrics.add_source("udp_send", udp.send_stats)
+    if hasattr(db, "stats"):
+        metrics.add_source("codename_cache", db.stats)
+    metrics.add_source("db", lambda: {"in_flight": db_worker.in_flight})
 
-    root._splash = SplashScreen(root, LOGO_PATH, on_done=after_splash, ms=3000)
-    root.mainloop()
+    def flush_roster():
+        # Safety net for players queued on the entry screen but not yet started
+        db_worker.submit(db.flush_pending,
+                         on_error=lambda e: print(f"[WARNING] Could not save new players, will retry.\n{e}"))
+        root.after(cfg.db_flush_ms, flush_roster)
+
+    root.after(cfg.db_flush_ms, flush_roster)
+
+    udp.start_receiver()
+    if hasattr(udp, "attach"):
+        udp.attach(root)
+    pump_udp()
+
+    show_entry()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
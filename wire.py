@@ -0,0 +1,143 @@
+# wire.py
+import struct
+import time
+
+# Text format (what the equipment / traffic generator sends): b"attacker:target"
+#
+# Binary format (optional, AppConfig.wire_format = "binary"), network byte order:
+#   header: magic u8 | version u8 | count u16 | sequence u32 | timestamp_us u64
+#   then `count` events: attacker u32 | target u32
+# The magic byte is not an ASCII digit, so both formats can share one port.
+
+MAGIC = 0xB7
+VERSION = 1
+HEADER = struct.Struct("!BBHIQ")
+EVENT = struct.Struct("!II")
+
+# Keep binary datagrams under a typical 1500 byte MTU
+MAX_EVENTS_PER_DATAGRAM = (1400 - HEADER.size) // EVENT.size
+
+
+def encode_text(attacker: int, target: int) -> bytes:
+    return f"{attacker}:{target}".encode("utf-8")
+
+
+def encode_events(events, sequence: int, timestamp_us: int = None) -> bytes:
+    # events: list of (attacker, target), at most MAX_EVENTS_PER_DATAGRAM
+    if timestamp_us is None:
+        timestamp_us = time.time_ns() // 1000
+    parts = [HEADER.pack(MAGIC, VERSION, len(events), sequence & 0xFFFFFFFF, timestamp_us)]
+    parts.extend(EVENT.pack(a, t) for a, t in events)
+    return b"".join(parts)
+
+
+def is_binary(data: bytes) -> bool:
+    return bool(data) and data[0] == MAGIC
+
+
+def decode_text(data: bytes) -> list:
+    # b"a:b" -> [(a, b)], or [] if malformed
+    parts = data.decode("utf-8", errors="replace").split(":")
+    if len(parts) != 2:
+        return []
+    try:
+        return [(int(parts[0].strip()), int(parts[1].strip()))]
+    except ValueError:
+        return []
+
+
+def decode_binary(data: bytes):
+    # Returns (header tuple, [(attacker, target), ...]) or (None, []) if malformed
+    if len(data) < HEADER.size:
+        return None, []
+    header = HEADER.unpack_from(data)
+    magic, version, count = header[0], header[1], header[2]
+    if magic != MAGIC or version != VERSION or len(data) != HEADER.size + count * EVENT.size:
+        return None, []
+    return header, list(EVENT.iter_unpack(memoryview(data)[HEADER.size:]))
+
+
+class SequenceTracker:
+    # Per-sender loss / reorder / duplicate accounting for binary datagrams
+    # Sequence numbers skipped over are remembered (the last `window` per
+    # sender): one arriving later was reordered, not lost; anything else older
+    # than expected is a duplicate and leaves the loss count alone
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.expected = {}    # addr -> next sequence number we expect
+        self.missing = {}     # addr -> set of skipped sequence numbers
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicates = 0
+
+    def observe(self, addr, sequence: int) -> None:
+        self.received += 1
+        expected = self.expected.get(addr)
+        if expected is None or sequence == expected:
+            self.expected[addr] = (sequence + 1) & 0xFFFFFFFF
+            return
+
+        gap = (sequence - expected) & 0xFFFFFFFF
+        if gap < 0x80000000:
+            # jumped ahead: the gap was lost (until it shows up late)
+            self.lost += gap
+            missing = self.missing.setdefault(addr, set())
+            missing.update((sequence - i) & 0xFFFFFFFF for i in range(1, min(gap, self.window) + 1))
+            if len(missing) > self.window:
+                # forget the oldest; those stay counted as lost
+                missing.difference_update(
+                    [s for s in missing if (sequence - s) & 0xFFFFFFFF > self.window])
+            self.expected[addr] = (sequence + 1) & 0xFFFFFFFF
+            return
+
+        missing = self.missing.get(addr)
+        if missing and sequence in missing:
+            # a late packet we had counted as lost
+            missing.discard(sequence)
+            self.reordered += 1
+            self.lost -= 1
+        else:
+            self.duplicates += 1
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "senders": len(self.expected),
+        }
+
+
+class WireDecoder:
+    # Turns raw datagrams into (attacker, target) events
+    # Text is always accepted; binary frames only when the deployment enables them
+
+    def __init__(self, accept_binary: bool = False):
+        self.accept_binary = accept_binary
+        self.sequences = SequenceTracker()
+        self.malformed = 0
+
+    def decode(self, data: bytes, addr) -> list:
+        if is_binary(data):
+            if not self.accept_binary:
+                self.malformed += 1
+                return []
+            header, events = decode_binary(data)
+            if header is None:
+                self.malformed += 1
+                return []
+            self.sequences.observe(addr, header[3])
+            return events
+
+        events = decode_text(data)
+        if not events:
+            self.malformed += 1
+        return events
+
+    def stats(self) -> dict:
+        stats = self.sequences.stats()
+        stats["malformed"] = self.malformed
+        return stats